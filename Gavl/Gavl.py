@@ -1,14 +1,30 @@
 import random
+import heapq
+import functools
+import time
 from inspect import signature
 from .tools.population import Population
 from .tools.individual import Individual
 from .tools.generate_chromosome import generate_chromosome
-from .tools.termination_criteria import check_termination_criteria
-from .tools.keep_diversity import keep_diversity
+from .tools.termination_criteria import check_termination_criteria, valid_termination_criteria, termination_criteria_args, update_termination_criteria_args, reset_termination_criteria_args
+from .tools.keep_diversity import keep_diversity, keep_diversity_counts
 from .tools.selection import roulette_selection
 from .tools.pairing import pairing
-from .tools.crossover import mating
-from .tools.mutation import mutation
+from .tools.crossover import mating, mating_bitset, mating_counts
+from .tools.mutation import mutation, mutation_bitset, mutation_counts
+from .tools.fitness_cache import FitnessCache
+from .tools.evaluator import get_evaluator
+from .tools.batch_fitness import build_gene_index, evaluate_batch
+from .tools.encoding import GeneEncoder
+from .tools.initialization import generate_valid_chromosomes
+from .tools.multistart import run_independent
+from .tools.checkpoint import save_checkpoint, load_checkpoint
+from .tools.snapshot import GenerationSnapshot, fitness_statistics
+from .tools.instrumentation import RunStats, CountingCheck, NULL_GENERATION_STATS
+from .tools.constraints import Constraint, ConstraintSet, ConstrainedCheck, RepairingGenerator, always_valid
+from .tools.aux_functions.canonical import canonical_chromosome
+from .tools.aux_functions.parameters import num_required_parameters, accepts_parameter
+from .tools.aux_functions.rng import numpy_rng
 
 
 class Gavl(Population):
@@ -28,20 +44,58 @@ class Gavl(Population):
         self.mutation = mutation  # 突變函數
         self.possible_genes = None  # 可能的基因值
         self.repeated_genes_allowed = 0  # 是否允許基因重複
-        self.check_valid_individual = lambda chromosome: True  # 默認所有個體都有效
+        self.check_valid_individual = always_valid  # 默認所有個體都有效（模組級的函數，可以被序列化）
         self.minimize = 1  # 是否最小化目標函數
         self.elitism_rate = 0.05  # 精英比率
         self.mutation_rate = 0.3  # 突變率
         self.mutation_type = 'both'  # 突變類型
         self.max_num_gen_changed_mutation = None  # 突變時改變的最大基因數
         self.termination_criteria = {'max_num_generation_reached': 100}  # 終止條件
-        self._termination_criteria_args = {'termination_criteria': 'max_num_generation_reached', 'generation_goal': 100, 'generation_count': 0}  # 終止條件參數
+        self._termination_criteria_args = termination_criteria_args(self.termination_criteria, self.minimize)  # 終止條件參數（目標和進度）
         self._check_termination_criteria_function = check_termination_criteria  # 檢查終止條件的函數
         self.keep_diversity = -1  # 保持多樣性的策略
         self._keep_diversity_function = keep_diversity  # 保持多樣性的函數
         self.best_fitness_per_generation = []  # 每一代的最佳適應度
+        self.skipped_evaluations_per_generation = []  # 每一代因染色體沒有改變而跳過的適應度計算次數
         self.show_progress = 1  # 是否顯示進度
         self._generation_count = 0  # 當前已運行的代數
+        self.fitness_cache_size = 0  # 適應度快取大小（0 = 不使用快取）
+        self._fitness_cache = None  # 適應度快取（見 FitnessCache）
+        self.evaluator = 'serial'  # 適應度計算的後端（'serial'、'thread' 或 'process'）
+        self.evaluator_workers = None  # 池中的工作者數量（None = CPU 的數量）
+        self.evaluator_chunk_size = None  # 每個區塊的染色體數量（None = 自動計算）
+        self._evaluator = None  # 持久的評估器（在第一次使用時創建）
+        self.batch_fitness = None  # 批量適應度函數（一次評估所有待評估的染色體）
+        self.batch_fitness_format = 'list'  # 批量適應度函數接收染色體的格式（'list' 或 'index_matrix'）
+        self._gene_index = None  # 基因 -> 索引的字典（用於 'index_matrix' 格式）
+        self.gene_encoding = 'object'  # 算子內部使用的基因編碼（'object' 或 'index'）
+        self._encoder = None  # 整數編碼器（僅在使用 'index' 編碼的優化過程中存在）
+        self.chromosome_representation = 'list'  # 默認算子內部使用的染色體表示（'list'、'bitset' 或 'counts'）
+        self.crossover_max_attempts = 2000  # 每對個體的最大交叉嘗試次數
+        self.crossover_stats_per_generation = []  # 每一代的交叉計數器（嘗試次數、無效個體的次數和返回原始染色體的次數）
+        self.large_alphabet = 0  # 是否使用大字母表模式（突變時以拒絕抽樣選擇新基因）
+        self.initialization_max_attempts = None  # 生成初始族群時最多生成的候選染色體數量（None = 族群大小的 1000 倍）
+        self.initialization_max_time = None  # 生成初始族群時最多使用的時間（秒，None = 沒有限制）
+        self.initialization_parallel_validation = 0  # 是否使用評估器並行檢查初始族群的有效性
+        self.initialization_stats = None  # 初始族群生成的統計（生成的候選數量、接受的數量、接受率和時間）
+        self.constraints = None  # 聲明式約束的列表（見 tools/constraints.py，None = 沒有約束）
+        self._constraint_set = None  # 優化過程中使用的約束組（使用整數編碼時基因已被替換為索引）
+        self.repaired_per_generation = []  # 每一代被修復的個體數量
+        self.diversity_stats_per_generation = []  # 每次應用保持多樣性協議的統計（代數、被替換的重複個體數量和新生成的個體數量）
+        self.checkpoint_path = None  # 檢查點文件的路徑（None = 不寫入檢查點）
+        self.checkpoint_interval = 10  # 兩次寫入檢查點之間的代數
+        self.multistart_results = []  # optimize_many 的每次運行的結果（種子、狀態、最佳染色體、最佳適應度和每一代的最佳適應度）
+        self.seed = None  # 隨機數生成器的種子（整數或 random.Random 實例，None = 使用全局的 random 模組）
+        self._rng = None  # 算子使用的隨機數生成器（只在優化過程中存在，random 模組或 random.Random 實例）
+        self._np_rng = None  # 算子使用的 NumPy 隨機數生成器（只在優化過程中存在，種子取自 _rng）
+        self.on_generation = None  # 每一代結束時調用的函數（接收一代的快照）
+        self.on_improvement = None  # 最佳適應度改進時調用的函數（接收一代的快照）
+        self.fitness_evaluations = 0  # 當前優化過程中進行的適應度計算次數（不包括快取命中）
+        self._run_start_time = None  # 當前優化過程開始的時間（time.perf_counter()，用於時間預算）
+        self.instrumentation = 0  # 是否測量每一代每個階段的時間和計數器
+        self.trace_memory = 0  # 是否以 tracemalloc 測量每一代的峰值記憶體（只有當 instrumentation = 1 時）
+        self.run_stats = None  # 上一次優化過程的儀表統計（見 tools/instrumentation.py，None = 沒有啟用儀表）
+        self._generation_stats = NULL_GENERATION_STATS  # 當前一代的統計（沒有啟用儀表時是空對象）
 
     def set_hyperparameter(self, id_hyperparameter, value):
         """ 設定超參數的方法。
@@ -50,9 +104,9 @@ class Gavl(Population):
         :param value: 超參數的值。
         """
         # 定義超參數檢查條件和錯誤訊息
-        hyperparameter_conditions = {'size_population': ([lambda x: type(x) == int, lambda x: x > 0, lambda x: getattr(self, 'elitism_rate', None) == 0 or getattr(self, 'elitism_rate', None) * x >= 1], "族群大小必須是大於 0 的整數。同時需要設定一個非零的精英比率，或者精英比率乘以族群大小大於等於 1。"), 'min_length_chromosome': ([lambda x: type(x) == int, lambda x: x >= 0, lambda x: True if getattr(self, 'max_length_chromosome', None) is None else x <= getattr(self, 'max_length_chromosome', None)], "染色體的最小長度必須是大於或等於 0 的整數，並且應小於或等於最大長度。"), 'max_length_chromosome': ([lambda x: type(x) == int, lambda x: x >= 1, lambda x: True if getattr(self, 'min_length_chromosome', None) is None else x >= getattr(self, 'min_length_chromosome', None), lambda x: True if getattr(self, 'max_num_gen_changed_mutation', None) is None else x > getattr(self, 'max_num_gen_changed_mutation', None), lambda x: True if getattr(self, 'possible_genes', None) is None or getattr(self, 'repeated_genes_allowed', None) == 1 else x < len(getattr(self, 'possible_genes', None))], "染色體的最大長度必須是大於或等於 1 的整數，並且應大於或等於最小長度。如果已設定突變的最大基因變化數，則最大長度應大於此值。如果不允許基因重複，則可能的基因數應大於最大長度。"), 'fitness': ([lambda x: callable(x), lambda x: len(signature(x).parameters) == 1], "適應度函數應該是一個函數，其唯一參數是個體的染色體，返回適應度值。"), 'generate_new_chromosome': ([lambda x: callable(x), lambda x: len(signature(x).parameters) == 4], "生成新染色體的函數應該是一個接受四個參數的函數：最小染色體長度、最大染色體長度、可能的基因列表和是否允許基因重複。"), 'selection': ([lambda x: callable(x), lambda x: len(signature(x).parameters) == 3], "選擇函數應該是一個接受三個參數的函數：族群列表、最小化標誌和選擇個體的數量，返回選擇的個體ID列表。"), 'pairing': ([lambda x: callable(x), lambda x: len(signature(x).parameters) == 1], "配對函數應該是一個接受一個參數的函數：選擇的個體ID列表，返回配對的個體ID對列表。"), 'crossover': ([lambda x: callable(x), lambda x: len(signature(x).parameters) == 5], "交叉函數應該是一個接受五個參數的函數：配對的個體列表、染色體的最小和最大長度、是否允許基因重複和檢查個體有效性的函數，返回新交叉個體的染色體列表。"), 'mutation': ([lambda x: callable(x), lambda x: len(signature(x).parameters) == 8], "突變函數應該是一個接受八個參數的函數：將要交叉的個體的染色體列表、突變類型、最大變化基因數、染色體的最小和最大長度、是否允許基因重複、檢查個體有效性的函數和可能的基因列表，返回新突變個體的染色體列表。"), 'possible_genes': ([lambda x: type(x) == list, lambda x: True if getattr(self, 'max_length_chromosome', None) is None or getattr(self, 'repeated_genes_allowed', None) == 1 else len(x) >= getattr(self, 'max_length_chromosome', None)], "可能的基因列表應該是一個列表，包含所有可能的基因值。如果不允許基因重複，則列表長度應大於最大染色體長度。"), 'repeated_genes_allowed': ([lambda x: type(x) == int or type(x) == bool, lambda x: x == 0 or x == 1 or type(x) == bool], "是否允許基因重複的屬性應該是 0 或 1，0 表示不允許重複，1 表示允許重複。"), 'check_valid_individual': ([lambda x: callable(x), lambda x: len(signature(x).parameters) == 1], "檢查個體有效性的函數應該是一個函數，其唯一參數是個體的染色體，返回一個布爾值表示個體是否有效。"), 'minimize': ([lambda x: type(x) == int or type(x) == bool, lambda x: x == 0 or x == 1 or type(x) == bool], "最小化目標的屬性應該是 0 或 1，0 表示最大化目標，1 表示最小化目標。"), 'elitism_rate': ([lambda x: type(x) == float or type(x) == int, lambda x: 0 <= x <= 1, lambda x: True if getattr(self, 'size_population', None) is None else x == 0 or getattr(self, 'size_population', None) * x >= 1], "精英比率應該是一個介於 0 和 1 之間的數字。同時需要設定一個非零的精英比率，或者精英比率乘以族群大小大於等於 1。"), 'mutation_rate': ([lambda x: type(x) == float or type(x) == int, lambda x: 0 <= x <= 1], "突變率應該是一個介於 0 和 1 之間的數字。"), 'mutation_type': ([lambda x: type(x) == str, lambda x: x in ['mut_gene', 'addsub_gene', 'both']], "突變類型應該是 'mut_gene', 'addsub_gene', 或 'both' 中的一個。"), 'max_num_gen_changed_mutation': ([lambda x: type(x) == int, lambda x: True if getattr(self, 'max_length_chromosome', None) is None else x < getattr(self, 'max_length_chromosome', None)], "每次突變最大變化的基因數應該是小於最大染色體長度的整數。"), 'termination_criteria': ([lambda x: type(x) == dict, lambda x: len(x) == 1, lambda x: list(x.keys())[0] in ['goal_fitness_reached', 'max_num_generation_reached'], lambda x: type(list(x.values())[0]) == int or type(list(x.values())[0]) == float], "終止條件應該是一個字典，包含 'max_num_generation_reached' 或 'goal_fitness_reached' 中的一個，其值應該是整數或浮點數。"), 'keep_diversity': ([lambda x: type(x) == int, lambda x: x != 0, lambda x: x >= -1], "保持多樣性的屬性應該是一個整數，可以取 -1（表示不使用多樣性保持技術）或大於等於 1 的值（表示每多少代應用一次多樣性保持技術）。"), 'show_progress': ([lambda x: type(x) == int or type(x) == bool, lambda x: x == 0 or x == 1 or type(x) == bool], "是否顯示進度的屬性應該是 0 或 1，0 表示不顯示，1 表示顯示進度。")}
+        hyperparameter_conditions = {'size_population': ([lambda x: type(x) == int, lambda x: x > 0, lambda x: getattr(self, 'elitism_rate', None) == 0 or getattr(self, 'elitism_rate', None) * x >= 1], "族群大小必須是大於 0 的整數。同時需要設定一個非零的精英比率，或者精英比率乘以族群大小大於等於 1。"), 'min_length_chromosome': ([lambda x: type(x) == int, lambda x: x >= 0, lambda x: True if getattr(self, 'max_length_chromosome', None) is None else x <= getattr(self, 'max_length_chromosome', None)], "染色體的最小長度必須是大於或等於 0 的整數，並且應小於或等於最大長度。"), 'max_length_chromosome': ([lambda x: type(x) == int, lambda x: x >= 1, lambda x: True if getattr(self, 'min_length_chromosome', None) is None else x >= getattr(self, 'min_length_chromosome', None), lambda x: True if getattr(self, 'max_num_gen_changed_mutation', None) is None else x > getattr(self, 'max_num_gen_changed_mutation', None), lambda x: True if getattr(self, 'possible_genes', None) is None or getattr(self, 'repeated_genes_allowed', None) == 1 else x < len(getattr(self, 'possible_genes', None))], "染色體的最大長度必須是大於或等於 1 的整數，並且應大於或等於最小長度。如果已設定突變的最大基因變化數，則最大長度應大於此值。如果不允許基因重複，則可能的基因數應大於最大長度。"), 'fitness': ([lambda x: callable(x), lambda x: len(signature(x).parameters) == 1], "適應度函數應該是一個函數，其唯一參數是個體的染色體，返回適應度值。"), 'generate_new_chromosome': ([lambda x: callable(x), lambda x: num_required_parameters(x) == 4], "生成新染色體的函數應該是一個接受四個參數的函數：最小染色體長度、最大染色體長度、可能的基因列表和是否允許基因重複。"), 'selection': ([lambda x: callable(x), lambda x: num_required_parameters(x) == 3], "選擇函數應該是一個接受三個參數的函數：族群列表、最小化標誌和選擇個體的數量，返回選擇的個體ID列表。"), 'pairing': ([lambda x: callable(x), lambda x: num_required_parameters(x) == 1], "配對函數應該是一個接受一個參數的函數：選擇的個體ID列表，返回配對的個體ID對列表。"), 'crossover': ([lambda x: callable(x), lambda x: num_required_parameters(x) == 5], "交叉函數應該是一個接受五個參數的函數：配對的個體列表、染色體的最小和最大長度、是否允許基因重複和檢查個體有效性的函數，返回新交叉個體的染色體列表。"), 'mutation': ([lambda x: callable(x), lambda x: num_required_parameters(x) == 8], "突變函數應該是一個接受八個參數的函數：將要交叉的個體的染色體列表、突變類型、最大變化基因數、染色體的最小和最大長度、是否允許基因重複、檢查個體有效性的函數和可能的基因列表，返回新突變個體的染色體列表。"), 'possible_genes': ([lambda x: type(x) == list, lambda x: True if getattr(self, 'max_length_chromosome', None) is None or getattr(self, 'repeated_genes_allowed', None) == 1 else len(x) >= getattr(self, 'max_length_chromosome', None)], "可能的基因列表應該是一個列表，包含所有可能的基因值。如果不允許基因重複，則列表長度應大於最大染色體長度。"), 'repeated_genes_allowed': ([lambda x: type(x) == int or type(x) == bool, lambda x: x == 0 or x == 1 or type(x) == bool], "是否允許基因重複的屬性應該是 0 或 1，0 表示不允許重複，1 表示允許重複。"), 'check_valid_individual': ([lambda x: callable(x), lambda x: len(signature(x).parameters) == 1], "檢查個體有效性的函數應該是一個函數，其唯一參數是個體的染色體，返回一個布爾值表示個體是否有效。"), 'minimize': ([lambda x: type(x) == int or type(x) == bool, lambda x: x == 0 or x == 1 or type(x) == bool], "最小化目標的屬性應該是 0 或 1，0 表示最大化目標，1 表示最小化目標。"), 'elitism_rate': ([lambda x: type(x) == float or type(x) == int, lambda x: 0 <= x <= 1, lambda x: True if getattr(self, 'size_population', None) is None else x == 0 or getattr(self, 'size_population', None) * x >= 1], "精英比率應該是一個介於 0 和 1 之間的數字。同時需要設定一個非零的精英比率，或者精英比率乘以族群大小大於等於 1。"), 'mutation_rate': ([lambda x: type(x) == float or type(x) == int, lambda x: 0 <= x <= 1], "突變率應該是一個介於 0 和 1 之間的數字。"), 'mutation_type': ([lambda x: type(x) == str, lambda x: x in ['mut_gene', 'addsub_gene', 'both']], "突變類型應該是 'mut_gene', 'addsub_gene', 或 'both' 中的一個。"), 'max_num_gen_changed_mutation': ([lambda x: type(x) == int, lambda x: True if getattr(self, 'max_length_chromosome', None) is None else x < getattr(self, 'max_length_chromosome', None)], "每次突變最大變化的基因數應該是小於最大染色體長度的整數。"), 'termination_criteria': ([lambda x: type(x) == dict, lambda x: valid_termination_criteria(x)], "終止條件應該是一個字典，包含 'max_num_generation_reached'（正整數）、'goal_fitness_reached'（數字）、'no_improvement_generations'（正整數）、'max_time'（大於 0 的秒數）和 'max_evaluations'（正整數）中的一個或多個，以及可選的 'mode'（'any' 或 'all'）。"), 'keep_diversity': ([lambda x: type(x) == int, lambda x: x != 0, lambda x: x >= -1], "保持多樣性的屬性應該是一個整數，可以取 -1（表示不使用多樣性保持技術）或大於等於 1 的值（表示每多少代應用一次多樣性保持技術）。"), 'show_progress': ([lambda x: type(x) == int or type(x) == bool, lambda x: x == 0 or x == 1 or type(x) == bool], "是否顯示進度的屬性應該是 0 或 1，0 表示不顯示，1 表示顯示進度。"), 'fitness_cache_size': ([lambda x: type(x) == int, lambda x: x >= 0], "適應度快取的大小應該是大於或等於 0 的整數。0 表示不使用快取。"), 'evaluator': ([lambda x: x in ['serial', 'thread', 'process']], "評估器應該是 'serial'（串行）、'thread'（線程池）或 'process'（進程池）中的一個。"), 'evaluator_workers': ([lambda x: x is None or type(x) == int, lambda x: x is None or x >= 1], "評估器的工作者數量應該是大於或等於 1 的整數（或 None 表示使用 CPU 的數量）。"), 'evaluator_chunk_size': ([lambda x: x is None or type(x) == int, lambda x: x is None or x >= 1], "每個區塊的染色體數量應該是大於或等於 1 的整數（或 None 表示自動計算）。"), 'batch_fitness': ([lambda x: callable(x), lambda x: 1 <= len(signature(x).parameters) <= 2], "批量適應度函數應該是一個函數，它接收所有待評估的染色體（格式 'list' 時為一個參數：染色體列表；格式 'index_matrix' 時為兩個參數：索引矩陣和長度數組），返回每個染色體的適應度值數組。"), 'batch_fitness_format': ([lambda x: x in ['list', 'index_matrix']], "批量適應度的格式應該是 'list' 或 'index_matrix'。"), 'gene_encoding': ([lambda x: x in ['object', 'index']], "基因編碼應該是 'object'（直接使用基因對象）或 'index'（使用基因在 possible_genes 中的整數索引）。"), 'chromosome_representation': ([lambda x: x in ['list', 'bitset', 'counts']], "染色體的表示應該是 'list'（基因列表）、'bitset'（位集，只能用於不允許重複基因的情況）或 'counts'（計數向量，只能用於允許重複基因的情況）。"), 'crossover_max_attempts': ([lambda x: type(x) == int, lambda x: x >= 1], "交叉的最大嘗試次數應該是大於或等於 1 的整數。"), 'large_alphabet': ([lambda x: type(x) == int or type(x) == bool, lambda x: x == 0 or x == 1 or type(x) == bool], "大字母表模式的屬性應該是 0 或 1，0 表示不使用，1 表示使用。"), 'initialization_max_attempts': ([lambda x: x is None or type(x) == int, lambda x: x is None or x >= 1], "初始化的最大嘗試次數應該是大於或等於 1 的整數（或 None 表示族群大小的 1000 倍）。"), 'initialization_max_time': ([lambda x: x is None or type(x) == int or type(x) == float, lambda x: x is None or x > 0], "初始化的最大時間應該是大於 0 的數字（秒），或 None 表示沒有限制。"), 'initialization_parallel_validation': ([lambda x: type(x) == int or type(x) == bool, lambda x: x == 0 or x == 1 or type(x) == bool], "並行檢查初始族群有效性的屬性應該是 0 或 1。"), 'constraints': ([lambda x: x is None or (type(x) == list and all(isinstance(c, Constraint) for c in x))], "約束必須是 None 或約束對象（見 Gavl/tools/constraints.py 中的 Constraint 類）的列表。"), 'checkpoint_path': ([lambda x: x is None or type(x) == str], "檢查點文件的路徑必須是字串或 None。"), 'checkpoint_interval': ([lambda x: type(x) == int, lambda x: x > 0], "檢查點的間隔必須是大於 0 的整數。"), 'seed': ([lambda x: x is None or type(x) == int or isinstance(x, random.Random)], "種子必須是整數、random.Random 實例或 None。"), 'on_generation': ([lambda x: x is None or callable(x), lambda x: x is None or num_required_parameters(x) == 1], "on_generation 必須是 None 或接收一個參數（一代的快照，見 Gavl/tools/snapshot.py）的函數。"), 'on_improvement': ([lambda x: x is None or callable(x), lambda x: x is None or num_required_parameters(x) == 1], "on_improvement 必須是 None 或接收一個參數（一代的快照，見 Gavl/tools/snapshot.py）的函數。"), 'instrumentation': ([lambda x: x in [0, 1]], "是否測量每一代每個階段的時間和計數器必須是整數 0 或 1。"), 'trace_memory': ([lambda x: x in [0, 1]], "是否以 tracemalloc 測量峰值記憶體必須是整數 0 或 1。")}
         if id_hyperparameter not in list(hyperparameter_conditions.keys()):
-            raise ValueError("設定超參數的方法 set_hyperparameter() 的參數 id_hyperparameter 必須是以下列表中的一個:\n* 'size_population': 代表族群大小的整數。\n* 'min_length_chromosome': 代表染色體最小長度的整數。\n* 'max_length_chromosome': 代表染色體最大長度的整數。\n* 'fitness': 評估適應度的函數。其唯一參數是個體的染色體（fitness(chromosome)）並返回適應度的值。\n* 'generate_new_chromosome': 創建新染色體的函數。它接受四個參數（按此順序）最小染色體長度、最大染色體長度、可能的基因列表和是否允許基因重複。這個函數必須返回一個基因列表。\n* 'selection': 執行選擇方法的函數。它必須是一個接受三個參數的函數並返回選中的個體的列表。它接收（按此順序）一個包含族群的列表（族群的個體類的對象列表）、屬性 self.minimize（1 -> 最小化；0 -> 最大化）和要選中的個體的數量。它必須返回一個包含選中個體ID的列表（individual._id）。默認的選擇方法是輪盤選擇。\n* 'pairing': 執行配對方法的函數。它必須是一個接受一個參數的函數並返回配對的個體的列表。它接收一個包含選中個體ID的列表（見選擇方法），並返回一個包含配對的個體ID對的列表。默認的配對方法是隨機配對。\n* 'crossover': 執行交叉方法的函數。它必須是一個接受五個參數的函數並返回新交叉個體的染色體的列表。它必須接收（按此順序）一個列表（[(Individual_a, Individual_b) , ...]）包含配對的個體（個體類的對象），染色體的最小允許長度、最大長度、一個布爾值指示是否允許基因重複（1 = 允許重複的基因）和一個函數 check_valid_individual(chromosome) 它接收一個個體的染色體並返回一個布爾值指示該個體是否有效（True）或無效（False）。它必須返回一個包含新創建個體的染色體的列表。\n* 'mutation': 執行突變方法的函數。它必須是一個接受八個參數的函數並返回新突變個體的染色體的列表。它必須接收（按此順序）一個列表包含將要交叉的個體的染色體（注意，這個函數接收的是染色體，即基因的列表，不是個體類的對象），一個字符串代表突變類型（如果突變方法改變，這是無用的），一個整數代表允許在一次突變中改變的最大基因數（它是屬性 .max_num_gen_changed_mutation），染色體的最小允許長度、最大長度、一個布爾值指示是否允許基因重複（1 = 允許重複的基因），一個函數 check_valid_individual(chromosome) 它接收一個個體的染色體並返回一個布爾值指示該個體是否有效（True）或無效（False）和一個列表包含所有允許的基因值（它是屬性 .possible_genes）。它必須返回一個包含新突變個體的染色體的列表。\n* 'possible_genes': 所有可能的基因值的列表。\n* 'repeated_genes_allowed': 一個整數表示一個個體是否可以有重複的基因（repeated_genes_allowed = 1）或不可以（repeated_genes_allowed = 0）。默認為 0。\n* 'check_valid_individual': 一個函數其唯一參數是個體的染色體（即 check_valid_individual(chromosome)）並返回一個布爾值（True 如果它是一個有效的解決方案，False 否則）。注意建議不改變這個方法，並在適應度函數中給無效的個體一個懲罰。注意染色體是一個基因的列表。\n* 'minimize': 一個整數表示是否將適應度最小化（minimize = 1）或最大化（minimize = 0）。默認 minimize = 1。\n* 'elitism_rate': 一個介於 0 和 1 之間的數字表示精英率。默認 elitism_rate = 0.05。\n* 'mutation_rate': 一個介於 0 和 1 之間的數字表示突變率。默認 mutation_rate = 0.3。\n* 'mutation_type': 一個字符串表示突變類型。它只能取 'mut_gene', 'addsub_gene' 或 'both' 的值。默認 mutation_type = 'both'。\n* 'max_num_gen_changed_mutation': 一個整數表示每次突變最大變化的基因數。默認它是 int(max_length_chromosome/3 + 1)。\n* 'termination_criteria': 屬性 'termination_criteria' 必須是一個字典表示終止條件，包含值 '{'max_num_generation_reached': 代數}' 或 '{'goal_fitness_reached': 目標適應度}'。\n* 'keep_diversity': 一個整數表示每多少代應用一次多樣性保持技術。它的默認值是 -1，這意味著不會應用多樣性保持技術。\n* 'show_progress': 一個整數表示是否願意顯示進度。它可以取 0（不顯示進度）或 1（顯示進度）。它的默認值是 1。"
+            raise ValueError("設定超參數的方法 set_hyperparameter() 的參數 id_hyperparameter 必須是以下列表中的一個:\n* 'size_population': 代表族群大小的整數。\n* 'min_length_chromosome': 代表染色體最小長度的整數。\n* 'max_length_chromosome': 代表染色體最大長度的整數。\n* 'fitness': 評估適應度的函數。其唯一參數是個體的染色體（fitness(chromosome)）並返回適應度的值。\n* 'generate_new_chromosome': 創建新染色體的函數。它接受四個參數（按此順序）最小染色體長度、最大染色體長度、可能的基因列表和是否允許基因重複。這個函數必須返回一個基因列表。\n* 'selection': 執行選擇方法的函數。它必須是一個接受三個參數的函數並返回選中的個體的列表。它接收（按此順序）一個包含族群的列表（族群的個體類的對象列表）、屬性 self.minimize（1 -> 最小化；0 -> 最大化）和要選中的個體的數量。它必須返回一個包含選中個體ID的列表（individual._id）。默認的選擇方法是輪盤選擇。\n* 'pairing': 執行配對方法的函數。它必須是一個接受一個參數的函數並返回配對的個體的列表。它接收一個包含選中個體ID的列表（見選擇方法），並返回一個包含配對的個體ID對的列表。默認的配對方法是隨機配對。\n* 'crossover': 執行交叉方法的函數。它必須是一個接受五個參數的函數並返回新交叉個體的染色體的列表。它必須接收（按此順序）一個列表（[(Individual_a, Individual_b) , ...]）包含配對的個體（個體類的對象），染色體的最小允許長度、最大長度、一個布爾值指示是否允許基因重複（1 = 允許重複的基因）和一個函數 check_valid_individual(chromosome) 它接收一個個體的染色體並返回一個布爾值指示該個體是否有效（True）或無效（False）。它必須返回一個包含新創建個體的染色體的列表。\n* 'mutation': 執行突變方法的函數。它必須是一個接受八個參數的函數並返回新突變個體的染色體的列表。它必須接收（按此順序）一個列表包含將要交叉的個體的染色體（注意，這個函數接收的是染色體，即基因的列表，不是個體類的對象），一個字符串代表突變類型（如果突變方法改變，這是無用的），一個整數代表允許在一次突變中改變的最大基因數（它是屬性 .max_num_gen_changed_mutation），染色體的最小允許長度、最大長度、一個布爾值指示是否允許基因重複（1 = 允許重複的基因），一個函數 check_valid_individual(chromosome) 它接收一個個體的染色體並返回一個布爾值指示該個體是否有效（True）或無效（False）和一個列表包含所有允許的基因值（它是屬性 .possible_genes）。它必須返回一個包含新突變個體的染色體的列表。\n* 'possible_genes': 所有可能的基因值的列表。\n* 'repeated_genes_allowed': 一個整數表示一個個體是否可以有重複的基因（repeated_genes_allowed = 1）或不可以（repeated_genes_allowed = 0）。默認為 0。\n* 'check_valid_individual': 一個函數其唯一參數是個體的染色體（即 check_valid_individual(chromosome)）並返回一個布爾值（True 如果它是一個有效的解決方案，False 否則）。注意建議不改變這個方法，並在適應度函數中給無效的個體一個懲罰。注意染色體是一個基因的列表。\n* 'minimize': 一個整數表示是否將適應度最小化（minimize = 1）或最大化（minimize = 0）。默認 minimize = 1。\n* 'elitism_rate': 一個介於 0 和 1 之間的數字表示精英率。默認 elitism_rate = 0.05。\n* 'mutation_rate': 一個介於 0 和 1 之間的數字表示突變率。默認 mutation_rate = 0.3。\n* 'mutation_type': 一個字符串表示突變類型。它只能取 'mut_gene', 'addsub_gene' 或 'both' 的值。默認 mutation_type = 'both'。\n* 'max_num_gen_changed_mutation': 一個整數表示每次突變最大變化的基因數。默認它是 int(max_length_chromosome/3 + 1)。\n* 'termination_criteria': 屬性 'termination_criteria' 必須是一個字典表示終止條件，包含以下一個或多個值：'max_num_generation_reached'（最大代數）、'goal_fitness_reached'（目標適應度）、'no_improvement_generations'（最佳適應度連續多少代沒有改進時停止）、'max_time'（時間預算，秒）和 'max_evaluations'（適應度計算次數的預算）。可選的 'mode' 表示當任何一個條件（'any'，默認）或所有條件（'all'）滿足時停止。例如 {'max_num_generation_reached': 1000, 'no_improvement_generations': 50}。\n* 'keep_diversity': 一個整數表示每多少代應用一次多樣性保持技術。它的默認值是 -1，這意味著不會應用多樣性保持技術。\n* 'show_progress': 一個整數表示是否願意顯示進度。它可以取 0（不顯示進度）或 1（顯示進度）。它的默認值是 1。\n* 'fitness_cache_size': 一個整數表示適應度快取可儲存的最大染色體數量（以染色體的規範形式為鍵，當快取已滿時淘汰最近最少使用的項目）。它的默認值是 0，這意味著不使用快取。\n* 'evaluator': 一個字符串表示計算族群適應度的後端。它可以取 'serial'（逐個計算）、'thread'（線程池）或 'process'（進程池，適應度函數必須是可序列化的）。池在各代之間重複使用，並在優化結束時關閉。它的默認值是 'serial'。\n* 'evaluator_workers': 一個整數表示線程池或進程池中的工作者數量。它的默認值是 None，這意味著使用 CPU 的數量。\n* 'evaluator_chunk_size': 一個整數表示每次發送到池中的染色體數量（區塊大小）。它的默認值是 None，這意味著自動計算（每個工作者大約四個區塊）。\n* 'batch_fitness': 一次評估所有待評估染色體的函數，取代逐個調用 'fitness'。如果 'batch_fitness_format' 是 'list'，它接收染色體列表（batch_fitness(chromosomes)）；如果是 'index_matrix'，它接收以 -1 填充的基因索引矩陣（NumPy 數組，索引對應 possible_genes）和長度數組（batch_fitness(index_matrix, lengths)）。它必須返回每個染色體的適應度值（列表或 NumPy 數組）。默認為 None。\n* 'batch_fitness_format': 一個字符串表示批量適應度函數接收染色體的格式，'list' 或 'index_matrix'。默認為 'list'。\n* 'gene_encoding': 一個字符串表示算子內部使用的基因編碼。'object' 表示所有算子直接處理基因對象；'index' 表示在調用 optimize() 時將 possible_genes 映射為整數索引，所有算子處理整數列表，只在調用用戶的 fitness 和 check_valid_individual 函數或返回結果時才解碼為基因（自定義的算子將收到整數索引）。使用 'index' 時（以及 'chromosome_representation' 是 'bitset' 或 'counts' 時），possible_genes 不能有重複的基因，否則在調用 optimize() 時引發 ValueError。默認為 'object'。\n* 'chromosome_representation': 一個字符串表示默認的交叉和突變算子內部使用的染色體表示。'list' 表示基因列表；'bitset' 表示位集（只能用於 repeated_genes_allowed = 0），集合差、並集、大小檢查和補集抽樣都是位運算；'counts' 表示每個基因的計數向量（NumPy 數組，只能用於 repeated_genes_allowed = 1），交叉是向量的加減法，重複個體的檢測是數組的比較。使用 'bitset' 或 'counts' 時，基因自動被編碼為整數索引（見 'gene_encoding'），用戶仍然看到基因列表。默認為 'list'。\n* 'crossover_max_attempts': 一個整數表示每對個體的最大交叉嘗試次數，超過後返回原始染色體。只有當交叉函數接受關鍵字參數 max_attempts 時才會傳遞。它的默認值是 2000。\n* 'large_alphabet': 一個整數表示是否使用大字母表模式（1）或不使用（0）。在這個模式下，當不允許基因重複時，默認的突變函數不構造不在染色體中的可能基因列表，而是以拒絕抽樣選擇新基因，所以突變的成本與染色體長度成正比，而不是與可能的基因數量成正比。只有當突變函數接受關鍵字參數 large_alphabet 時才會傳遞。它的默認值是 0。\n* 'initialization_max_attempts': 一個整數表示生成初始族群時最多生成的候選染色體數量。如果超過，則引發 RuntimeError 而不是無限循環。它的默認值是 None，這意味著族群大小的 1000 倍。\n* 'initialization_max_time': 一個數字表示生成初始族群時最多使用的時間（秒）。如果超過，則引發 RuntimeError。它的默認值是 None，這意味著沒有時間限制。\n* 'initialization_parallel_validation': 一個整數表示是否使用評估器（見 'evaluator'）並行檢查初始族群的候選染色體的有效性（1）或不（0）。使用 'process' 評估器時，check_valid_individual 必須是可序列化的（不能是 lambda）。它的默認值是 0。\n* 'constraints': 聲明式約束的列表（WeightedCapacity、ForbiddenPairs、RequiredGenes、MaxCount...），違反約束的個體會被修復而不是被丟棄。None 表示沒有約束。\n* 'checkpoint_path': 檢查點文件的路徑（字串），優化過程每 'checkpoint_interval' 代將其狀態寫入該文件，以便以 optimize(resume_from=path) 繼續。None 表示不寫入檢查點。\n* 'checkpoint_interval': 代表兩次寫入檢查點之間的代數的整數。\n* 'seed': 這個實例的隨機數生成器的種子（整數）或 random.Random 實例。設定後，所有的算子（生成、選擇、配對、交叉、突變和保持多樣性）都使用這個實例自己的 random.Random 和從它獲取種子的 NumPy Generator，所以相同的種子給出相同的運行，並且在不同線程中的實例互不干擾。None 表示使用全局的 random 模組。\n* 'on_generation': 每一代結束時調用的函數，它接收這一代的快照（GenerationSnapshot：代數、最佳個體、最佳/平均/最差適應度和標準差、是否改進和時間）。如果它返回 True，則優化在這一代之後停止。None 表示不調用。\n* 'on_improvement': 最佳適應度改進時調用的函數，它接收這一代的快照（見 'on_generation'）。如果它返回 True，則優化在這一代之後停止。None 表示不調用。\n* 'instrumentation': 代表是否測量每一代每個階段的時間和計數器（1）或不（0）的整數。統計保存在屬性 run_stats 中。\n* 'trace_memory': 代表是否以 tracemalloc 測量每一代的峰值記憶體（1）或不（0）的整數（只有當 'instrumentation' = 1 時）。"
                              "")
         else:
             try:
@@ -63,30 +117,147 @@ class Gavl(Population):
                     setattr(self, id_hyperparameter, value)  # 設定屬性
                     if id_hyperparameter == 'max_length_chromosome' and getattr(self, 'max_num_gen_changed_mutation', None) is None:  # 如果正在設定的超參數是 'max_length_chromosome' 並且沒有定義超參數 'max_num_gen_changed_mutation'，則將其設定為 'max_length_chromosome'
                         setattr(self, 'max_num_gen_changed_mutation', int(value / 3 + 1))  # 設定屬性
-                    elif id_hyperparameter == 'termination_criteria':  # 更新檢查終止條件的函數的參數
-                        if list(value.keys())[0] == 'goal_fitness_reached':
-                            self._termination_criteria_args = {'termination_criteria': 'goal_fitness_reached', 'goal_fitness': list(value.values())[0], 'generation_fitness': 0, 'minimize': self.minimize}
-                        elif list(value.keys())[0] == 'max_num_generation_reached':
-                            self._termination_criteria_args = {'termination_criteria': 'max_num_generation_reached', 'generation_goal': list(value.values())[0], 'generation_count': 0}
-                        else:  # 重新檢查
-                            ValueError("終止條件參數只能包含 'goal_fitness_reached' 或 'max_num_generation_reached' 其中之一。")
-                    elif id_hyperparameter == 'minimize' and self._termination_criteria_args['termination_criteria'] == 'goal_fitness_reached':
+                    elif id_hyperparameter == 'termination_criteria':  # 更新檢查終止條件的函數的參數（無效的字典引發 ValueError）
+                        self._termination_criteria_args = termination_criteria_args(value, self.minimize)
+                    elif id_hyperparameter == 'minimize':
+                        self._Population__invalidate_order()  # 排序的方向已改變
                         self._termination_criteria_args['minimize'] = value
+                    elif id_hyperparameter in ['evaluator', 'evaluator_workers', 'evaluator_chunk_size']:
+                        self.__close_evaluator()  # 下次使用時以新的配置重新創建評估器
+                    elif id_hyperparameter == 'chromosome_representation':  # 選擇對應表示的默認交叉和突變算子（自定義的算子不會被替換）
+                        default_operators = {'list': (mating, mutation, keep_diversity), 'bitset': (mating_bitset, mutation_bitset, keep_diversity), 'counts': (mating_counts, mutation_counts, keep_diversity_counts)}
+                        if self.crossover in [operators[0] for operators in default_operators.values()]:
+                            self.crossover = default_operators[value][0]
+                        if self.mutation in [operators[1] for operators in default_operators.values()]:
+                            self.mutation = default_operators[value][1]
+                        self._keep_diversity_function = default_operators[value][2]
             except ValueError:
                 raise ValueError(conditions[1])  # 發生錯誤
             except Exception as e:
                 print(str)
                 raise (type(e))(str(e) + '\n' + conditions[1])  # 發生錯誤
 
-    def optimize(self):
+    def optimize(self, resume_from=None):
         """ 開始最優化（啟動遺傳演算法）。在呼叫此方法之前，必須定義 Gavl.size_population, Gavl.min_length_chromosome, Gavl.max_length_chromosome, Gavl.fitness 和 Gavl.possible_genes。
+        如果定義了 'checkpoint_path'，每 'checkpoint_interval' 代將運行的狀態寫入檢查點文件（見 tools/checkpoint.py）。如果定義了 'on_generation' 或 'on_improvement'，則在每一代結束時以這一代的快照調用它們（見 optimize_iter）。
 
+        :param resume_from: (str or None) 檢查點文件的路徑。如果不是 None，則從檢查點繼續優化（使用相同的配置和函數時，結果與沒有中斷的運行完全相同）。默認為 None。
         :return:
             (Individual) 最佳個體。
         """
+        for _ in self.__evolve(resume_from, self.on_generation is not None or self.on_improvement is not None):
+            pass
+        return self.best_individual()
+
+    def optimize_iter(self, resume_from=None):
+        """ 與 optimize 相同，但它是一個生成器：每一代結束時產生這一代的快照（見 tools/snapshot.py 中的 GenerationSnapshot：代數、最佳個體、適應度統計、是否改進和時間）。
+        快照只使用已經計算的適應度值（不重新計算適應度，也不排序族群）。在產生每個快照時運行被暫停（見 __pause_run）：評估器的池被關閉，族群被解碼回基因，所以在兩代之間實例與優化結束後的狀態相同。如果在優化結束之前停止迭代（例如 break，即使生成器仍然被引用），優化在當前一代之後停止，並且族群仍然可用（見 best_individual）。
+        注意使用 'thread' 或 'process' 評估器時，池在每一代重新創建；如果不需要快照，使用 optimize 更快。
+
+        :param resume_from: (str or None) 檢查點文件的路徑（見 optimize）。默認為 None。
+        :return:
+            * :generator: 每一代的快照（GenerationSnapshot）的生成器。
+        """
+        return self.__evolve(resume_from, True, pause=True)
+
+    def __evolve(self, resume_from, make_snapshots, pause=False):
+        """ 運行優化過程的生成器（見 optimize 和 optimize_iter）：每一代結束時寫入檢查點（如果需要），調用回調函數，並產生這一代的快照。
+
+        :param resume_from: (str or None) 檢查點文件的路徑。None 表示創建新的族群。
+        :param make_snapshots: (bool) 是否計算每一代的快照。如果是 False，則產生 None（不調用回調函數）。
+        :param pause: (bool) 是否在產生每個快照時暫停運行（見 __pause_run），使調用者在兩代之間看到已結束的運行。默認為 False。
+        :return:
+            * :generator: 每一代的快照（或 None）的生成器。
+        """
+        start_time = time.perf_counter()
+        self._start_run(resume_from)
+        run_state = None  # 暫停的運行的狀態（None = 運行沒有暫停）
+        try:
+            best_fitness = self.best_individual().fitness_value  # 目前為止的最佳適應度（用於檢測改進）
+            while not self._check_termination_criteria_function(self._termination_criteria_args):
+                self._run_generation()
+                if self.checkpoint_path is not None and self._generation_count % self.checkpoint_interval == 0:
+                    save_checkpoint(self.checkpoint_path, self.__checkpoint_state())
+                if not make_snapshots:
+                    yield None
+                    continue
+                snapshot = self.__snapshot(best_fitness, start_time)
+                if snapshot.improved:
+                    best_fitness = snapshot.best_fitness
+                stop = self.on_generation is not None and self.on_generation(snapshot) is True
+                if snapshot.improved and self.on_improvement is not None:
+                    stop = self.on_improvement(snapshot) is True or stop
+                if pause:
+                    run_state = self.__pause_run()
+                yield snapshot
+                if pause:
+                    self.__resume_run(run_state)
+                    run_state = None
+                if stop:  # 回調函數要求停止
+                    break
+            self._Population__calculate_fitness_and_sort()  # 計算適應度並排序
+        finally:
+            if run_state is None:  # 暫停的運行已經結束（並且實例可能已開始另一次運行）
+                self._finish_run()
+
+    def __pause_run(self):
+        """ 暫停運行（見 optimize_iter）：關閉評估器的池，停止測量，並將運行的狀態（隨機數生成器、約束和編碼器）從實例中取出，族群被解碼回基因。暫停的實例與 _finish_run 之後的狀態相同，所以如果迭代在這裡停止，不需要再結束運行。
+
+        :return:
+            * (tuple) 運行的狀態（見 __resume_run）。
+        """
+        run_state = (self._rng, self._np_rng, self._constraint_set, self._encoder)
+        self._finish_run()
+        return run_state
+
+    def __resume_run(self, run_state):
+        """ 繼續 __pause_run 暫停的運行：恢復運行的狀態並將族群重新編碼為整數索引。已知的適應度值被保留（除非調用者修改了染色體，見 Individual.evaluated_chromosome_unchanged）。
+
+        :param run_state: (tuple) __pause_run 返回的運行的狀態。
+        """
+        self._rng, self._np_rng, self._constraint_set, self._encoder = run_state
+        if self._encoder is not None:
+            for ind in self.population:
+                ind.set_new_chromosome(self._encoder.encode(ind.chromosome))
+        if self.run_stats is not None:
+            self.run_stats.start()
+
+    def __snapshot(self, best_fitness, start_time):
+        """ 返回當前一代的快照（見 tools/snapshot.py）。即使使用整數編碼，最佳個體的染色體也是基因列表。
+
+        :param best_fitness: (float) 之前所有代的最佳適應度。
+        :param start_time: (float) 優化開始的時間（time.perf_counter()）。
+        :return:
+            * (GenerationSnapshot) 這一代的快照。
+        """
+        best_individual = self.best_individual()
+        mean_fitness, std_fitness, worst_fitness = fitness_statistics(self.population, self.minimize)
+        improved = best_individual.fitness_value < best_fitness if self.minimize else best_individual.fitness_value > best_fitness
+        best_chromosome = best_individual.chromosome if self._encoder is None else self._encoder.decode(best_individual.chromosome)
+        return GenerationSnapshot(self._generation_count, best_chromosome, best_individual.fitness_value, mean_fitness, std_fitness, worst_fitness, improved, time.perf_counter() - start_time)
+
+    def optimize_many(self, n_runs, workers=None, seed=None):
+        """ 以不同的種子運行 n_runs 次獨立的最優化（在進程池中並行），並返回所有運行中的最佳個體（見 tools/multistart.py）。每次運行使用這個實例的新副本，所以這個實例的族群不會被修改。
+        如果終止條件是 'goal_fitness_reached'，當一次運行達到目標時，其餘的運行被取消。每次運行的結果保存在屬性 multistart_results 中。
+
+        :param n_runs: (int) 運行的次數。
+        :param workers: (int or None) 池中的進程數量。None 表示 CPU 的數量；1 表示在當前進程中依次運行。默認為 None。
+        :param seed: (int or None) 用於生成每次運行的種子的種子（相同的種子給出相同的結果）。None 表示從 random 模組獲取種子。默認為 None。
+        :return:
+            (Individual) 所有運行中的最佳個體。
+        """
+        best_individual, self.multistart_results = run_independent(self, n_runs, workers=workers, seed=seed)
+        return best_individual
+
+    def _start_run(self, resume_from=None, rng=None):
+        """ 開始一次優化過程：檢查所需的屬性，重設統計，準備隨機數生成器、編碼器、約束和快取，並創建初始族群（或從檢查點恢復族群）。這個方法與 _run_generation 和 _finish_run 一起使用（見 optimize 和 tools/islands.py）。
+
+        :param resume_from: (str or None) 檢查點文件的路徑。None 表示創建新的族群。默認為 None。
+        :param rng: (random.Random or None) 這次運行使用的隨機數生成器（例如島嶼模型中每個島嶼的生成器），它優先於 'seed'。None 表示根據 'seed' 創建。默認為 None。
+        """
         # 首先檢查所需屬性是否已定義。
-        if self.fitness is None:
-            raise AttributeError("在呼叫此方法之前，必須定義適應度方法。可以通過調用方法 Gavl.set_hyperparameter('fitness', value) 來定義，其中 value 是一個函數，其唯一參數是個體的染色體（fitness(chromosome)）並返回適應度值。")
+        if self.fitness is None and self.batch_fitness is None:
+            raise AttributeError("在呼叫此方法之前，必須定義適應度方法（或批量適應度方法 'batch_fitness'）。可以通過調用方法 Gavl.set_hyperparameter('fitness', value) 來定義，其中 value 是一個函數，其唯一參數是個體的染色體（fitness(chromosome)）並返回適應度值。")
         elif self.size_population is None:
             raise AttributeError("在呼叫此方法之前，必須定義屬性 'size_population'。它必須是一個大於 0 的整數，可以通過調用方法 Gavl.set_hyperparameter('size_population', value) 來設定。")
         elif self.min_length_chromosome is None:
@@ -95,30 +266,207 @@ class Gavl(Population):
             raise AttributeError("在呼叫此方法之前，必須定義屬性 'max_length_chromosome'。它必須是一個大於 0 的整數，可以通過調用方法 Gavl.set_hyperparameter('max_length_chromosome', value) 來設定。")
         elif self.possible_genes is None:
             raise AttributeError("在呼叫此方法之前，必須定義屬性 'possible_genes'。它必須是一個包含所有可能的基因值的列表。")
+        self._generation_count = 0  # 開始代數計數器
+        self._run_start_time = time.perf_counter()
+        self.fitness_evaluations = 0  # 清空適應度計算次數
+        reset_termination_criteria_args(self._termination_criteria_args)  # 每次優化重新開始終止條件的進度
+        self.best_fitness_per_generation = []  # 清空最佳適應度列表
+        self.skipped_evaluations_per_generation = []  # 清空跳過的適應度計算次數列表
+        self.crossover_stats_per_generation = []  # 清空交叉計數器列表
+        self.repaired_per_generation = []  # 清空被修復的個體數量列表
+        self.diversity_stats_per_generation = []  # 清空保持多樣性的統計列表
+        if rng is not None:
+            self._rng = rng
+        elif isinstance(self.seed, random.Random):
+            self._rng = self.seed
         else:
-            # 開始演算法
-            self._generation_count = 0  # 開始代數計數器
-            self.best_fitness_per_generation = []  # 清空最佳適應度列表
-            # 創建族群
-            self._Population__generate_population()
-            self._Population__calculate_fitness_and_sort()
-            if self._check_termination_criteria_function(self._termination_criteria_args):
-                return self.best_individual()
-            while not self._check_termination_criteria_function(self._termination_criteria_args):
-                self._generation_count += 1  # 代數計數器增加
-                if self.show_progress:
-                    print('Generation: {}'.format(self._generation_count))
-                new_population = self._Population__get_next_generation()  # 計算下一代。
-                self._Population__kill_and_reset_whole_population(new_population)  # 設定下一代。
-                if self._generation_count % self.keep_diversity == 0 and self.keep_diversity > 0:
-                    self._Population__calculate_fitness_and_sort()  # 計算適應度並排序
-                    # 保持多樣性協議：
-                    new_diverse_population = self._keep_diversity_function(self.population, self.generate_new_chromosome, self.min_length_chromosome, self.max_length_chromosome, self.possible_genes, self.repeated_genes_allowed, self.check_valid_individual)
-                    self._Population__kill_and_reset_whole_population(new_diverse_population)  # 設定下一代。
-                self.__update_termination_criteria_args()  # 更新終止條件參數
-                self.best_fitness_per_generation.append(self.best_individual().fitness_value)  # 獲取每一代的最佳適應度值
+            self._rng = random if self.seed is None else random.Random(self.seed)  # 相同的種子給出相同的運行
+        self._np_rng = numpy_rng(self._rng)  # 用於向量化算子的批量抽樣
+        if self.chromosome_representation == 'bitset' and self.repeated_genes_allowed:
+            raise ValueError("位集表示（'chromosome_representation' = 'bitset'）只能用於不允許重複基因的情況（'repeated_genes_allowed' = 0）。")
+        if self.chromosome_representation == 'counts' and not self.repeated_genes_allowed:
+            raise ValueError("計數向量表示（'chromosome_representation' = 'counts'）只能用於允許重複基因的情況（'repeated_genes_allowed' = 1）。")
+        self._encoder = GeneEncoder(self.possible_genes) if self.gene_encoding == 'index' or self.chromosome_representation != 'list' else None  # 將基因映射為整數索引（只做一次）
+        self._Population__invalidate_order()
+        for ind in self.population:  # 已存在的個體的適應度可能已過時（例如適應度函數已改變）
+            ind.kill_and_reset(ind.chromosome if self._encoder is None else self._encoder.encode(ind.chromosome))
+        if self.constraints:  # 約束的基因也被替換為索引（只做一次）
+            self._constraint_set = ConstraintSet(self.constraints) if self._encoder is None else ConstraintSet(self.constraints).encode(self._encoder.encode_gene)
+        self._fitness_cache = FitnessCache(self.fitness_cache_size, self.repeated_genes_allowed) if self.fitness_cache_size > 0 else None  # 每次優化使用新的快取
+        if self.batch_fitness is not None:
+            if len(signature(self.batch_fitness).parameters) != {'list': 1, 'index_matrix': 2}[self.batch_fitness_format]:
+                raise ValueError("批量適應度函數的參數數量與 'batch_fitness_format' 不符：格式 'list' 需要一個參數（染色體列表），格式 'index_matrix' 需要兩個參數（索引矩陣和長度數組）。")
+            self._gene_index = build_gene_index(self.possible_genes) if self.batch_fitness_format == 'index_matrix' and self._encoder is None else None  # 使用整數編碼時，染色體已經是索引
+        self.run_stats = RunStats(self.trace_memory) if self.instrumentation else None  # 每次優化使用新的統計
+        try:
+            if self.run_stats is not None:
+                self.run_stats.start()
+            if resume_from is not None:
+                self.__restore_checkpoint(load_checkpoint(resume_from))
+            else:
+                # 創建族群
+                initialization_start = time.perf_counter()
+                self._Population__generate_population()
+                self._Population__calculate_fitness_and_sort()
+                self.__update_termination_criteria_args()  # 初始族群的進度（例如初始族群已達到目標適應度）
+                if self.run_stats is not None:
+                    self.run_stats.initialization_time = time.perf_counter() - initialization_start
+                    self.run_stats.initialization_peak_memory = self.run_stats.peak()
+        except BaseException:
+            self._finish_run()
+            raise
+
+    def _run_generation(self):
+        """ 運行遺傳演算法的一代：計算下一代，應用保持多樣性協議（如果需要），並更新統計和終止條件參數。必須在 _start_run 之後調用。
+        """
+        self._generation_count += 1  # 代數計數器增加
+        if self.show_progress:
+            print('Generation: {}'.format(self._generation_count))
+        if self.run_stats is not None:
+            self._generation_stats = self.run_stats.begin_generation(self._generation_count)
+        generation_stats = self._generation_stats
+        evaluations_before = self.fitness_evaluations
+        cache_hits_before = self._fitness_cache.hits if self._fitness_cache is not None else 0
+        new_population = self._Population__get_next_generation()  # 計算下一代。
+        skipped_evaluations = self._Population__kill_and_reset_whole_population(new_population)  # 設定下一代（沒有改變的個體保留其適應度）。
+        generation_stats.lap('reset')
+        self._Population__calculate_fitness_population()  # 計算下一代的適應度
+        generation_stats.lap('fitness')
+        if self._generation_count % self.keep_diversity == 0 and self.keep_diversity > 0:
+            self._Population__calculate_fitness_and_sort()  # 計算適應度並排序
+            # 保持多樣性協議：
+            diversity_stats = {'generation': self._generation_count}
+            diversity_kwargs = {'diversity_stats': diversity_stats} if accepts_parameter(self._keep_diversity_function, 'diversity_stats') else {}  # 只有當函數接受時才傳遞的可選參數
+            diversity_kwargs.update(self.__rng_kwargs(self._keep_diversity_function))
+            if 'rng' in diversity_kwargs and self._constraint_set is None:
+                generate_new_chromosome = self.generate_new_chromosome  # 函數自己傳遞 rng（默認的生成函數以批次生成）
+            else:
+                generate_new_chromosome = self.__run_generator()
+            if accepts_parameter(self._keep_diversity_function, 'max_attempts'):  # 與初始化相同的預算，超過後保留舊染色體
+                diversity_kwargs['max_attempts'] = self.initialization_max_attempts if self.initialization_max_attempts is not None else 1000 * self.size_population
+            if accepts_parameter(self._keep_diversity_function, 'max_time'):
+                diversity_kwargs['max_time'] = self.initialization_max_time
+            new_diverse_population = self._keep_diversity_function(self.population, generate_new_chromosome, self.min_length_chromosome, self.max_length_chromosome, self.__run_possible_genes(), self.repeated_genes_allowed, self.__run_check_valid_individual(), **diversity_kwargs)
+            self.diversity_stats_per_generation.append(diversity_stats)
+            skipped_evaluations += self._Population__kill_and_reset_whole_population(new_diverse_population)  # 設定下一代。
+            generation_stats.lap('keep_diversity')
+            self._Population__calculate_fitness_population()  # 計算新生成的個體的適應度
+            generation_stats.lap('fitness')
+        self.skipped_evaluations_per_generation.append(skipped_evaluations)
+        self.__update_termination_criteria_args()  # 更新終止條件參數
+        self.best_fitness_per_generation.append(self.best_individual().fitness_value)  # 獲取每一代的最佳適應度值
+        if self.run_stats is not None:
+            generation_stats.lap('statistics')
+            generation_stats.count('fitness_evaluations', self.fitness_evaluations - evaluations_before)
+            generation_stats.count('skipped_evaluations', skipped_evaluations)
+            if self._fitness_cache is not None:
+                generation_stats.count('cache_hits', self._fitness_cache.hits - cache_hits_before)
+            self.run_stats.end_generation(generation_stats)
+            self._generation_stats = NULL_GENERATION_STATS
+
+    def _finish_run(self):
+        """ 結束優化過程：關閉評估器的池並將族群解碼回基因（如果使用整數編碼）。即使優化過程出錯也必須調用。
+        """
+        self.__close_evaluator()  # 關閉評估器的池
+        self._constraint_set = None
+        self._rng = None  # random 模組不能被序列化（例如 optimize_many 和島嶼模型複製或傳送實例時）
+        self._generation_stats = NULL_GENERATION_STATS
+        if self.run_stats is not None:
+            self.run_stats.stop()
+        self._np_rng = None
+        if self._encoder is not None:  # 將族群解碼回基因
+            for ind in self.population:
+                ind.set_new_chromosome(self._encoder.decode(ind.chromosome))
+            self._encoder = None
+
+    def __checkpoint_state(self):
+        """ 返回運行的狀態（用於寫入檢查點）：族群的染色體（基因列表）和適應度值、計數器、統計、終止條件參數、適應度快取和隨機數生成器的狀態。
+
+        :return:
+            * (dict) 運行的狀態。
+        """
+        decode = (lambda chromosome: chromosome) if self._encoder is None else self._encoder.decode
+        return {'population': [(decode(ind.chromosome), ind.fitness_value) for ind in self.population],
+                'generation_count': self._generation_count,
+                'best_fitness_per_generation': self.best_fitness_per_generation,
+                'skipped_evaluations_per_generation': self.skipped_evaluations_per_generation,
+                'crossover_stats_per_generation': self.crossover_stats_per_generation,
+                'repaired_per_generation': self.repaired_per_generation,
+                'diversity_stats_per_generation': self.diversity_stats_per_generation,
+                'initialization_stats': self.initialization_stats,
+                'termination_criteria_args': self._termination_criteria_args,
+                'fitness_evaluations': self.fitness_evaluations,
+                'fitness_cache': self._fitness_cache,
+                'random_state': self._rng.getstate(),
+                'numpy_random_state': self._np_rng.bit_generator.state}
+
+    def __restore_checkpoint(self, state):
+        """ 從檢查點的狀態（見 __checkpoint_state）恢復運行。族群的順序和適應度值被保留，所以不需要重新計算適應度。
+
+        :param state: (dict) 運行的狀態。
+        """
+        if len(state['population']) != self.size_population:
+            raise ValueError('檢查點的族群有 {} 個個體，但族群大小（\'size_population\'）是 {}。'.format(len(state['population']), self.size_population))
+        population = []
+        for chromosome, fitness_value in state['population']:
+            individual = Individual(chromosome if self._encoder is None else self._encoder.encode(chromosome))
+            if fitness_value is not None:
+                individual.set_fitness_value(fitness_value)
+            population.append(individual)
+        self._Population__set_population(population)
+        self._generation_count = state['generation_count']
+        self.best_fitness_per_generation = state['best_fitness_per_generation']
+        self.skipped_evaluations_per_generation = state['skipped_evaluations_per_generation']
+        self.crossover_stats_per_generation = state['crossover_stats_per_generation']
+        self.repaired_per_generation = state['repaired_per_generation']
+        self.diversity_stats_per_generation = state['diversity_stats_per_generation']
+        self.initialization_stats = state['initialization_stats']
+        self.fitness_evaluations = state.get('fitness_evaluations', 0)
+        for key in ['generation_count', 'generation_fitness', 'stagnant_generations', 'best_fitness', 'elapsed_time', 'evaluations']:  # 只恢復終止條件的進度（目標可以改變，例如增加最大代數）
+            if key in state['termination_criteria_args'] and key in self._termination_criteria_args:
+                self._termination_criteria_args[key] = state['termination_criteria_args'][key]
+        self._run_start_time = time.perf_counter() - state['termination_criteria_args'].get('elapsed_time', 0)  # 時間預算包括中斷之前使用的時間
+        if self._fitness_cache is not None and state['fitness_cache'] is not None:
+            self._fitness_cache = state['fitness_cache']
+        self._rng.setstate(state['random_state'])
+        if 'numpy_random_state' in state:
+            self._np_rng.bit_generator.state = state['numpy_random_state']
+
+    def _emigrants(self, number_of_emigrants):
+        """ 返回最好的 number_of_emigrants 個個體的染色體，用於島嶼模型的遷移（見 tools/islands.py）。即使使用整數編碼，染色體也是基因列表。必須在 _start_run 之後調用。
+
+        :param number_of_emigrants: (int) 遷出的個體數量。
+        :return:
+            * (list of lists) 遷出的染色體列表（從最好到最差）。
+        """
+        self._Population__calculate_fitness_population()  # 計算適應度
+        emigrants = [individual.chromosome.copy() for individual in self.__elite(number_of_emigrants)]
+        return emigrants if self._encoder is None else [self._encoder.decode(chromosome) for chromosome in emigrants]
+
+    def _immigrate(self, chromosomes):
+        """ 用遷入的染色體（基因列表）替換族群中最差的個體，用於島嶼模型的遷移（見 tools/islands.py）。在這個島嶼中無效的染色體（長度、重複的基因、check_valid_individual 或約束）被忽略，並且最好的個體永遠不會被替換。必須在 _start_run 之後調用。
+
+        :param chromosomes: (list of lists) 遷入的染色體列表。
+        :return:
+            * (int) 被替換的個體數量。
+        """
+        check_valid_individual = self.__run_check_valid_individual()
+        immigrants = []
+        for chromosome in chromosomes:
+            if self._encoder is not None:
+                try:
+                    chromosome = self._encoder.encode(chromosome)
+                except ValueError:  # 基因不在這個島嶼的可能基因列表中
+                    continue
+            if self.min_length_chromosome <= len(chromosome) <= self.max_length_chromosome and (self.repeated_genes_allowed or len(canonical_chromosome(chromosome, 0)) == len(chromosome)) and check_valid_individual(chromosome):
+                immigrants.append(chromosome)
+        immigrants = immigrants[:len(self.population) - 1]  # 保留最好的個體
+        if immigrants:
             self._Population__calculate_fitness_and_sort()  # 計算適應度並排序
-            return self.best_individual()
+            for individual, chromosome in zip(reversed(self.population), immigrants):
+                individual.kill_and_reset(list(chromosome))
+            self._Population__invalidate_order()
+        return len(immigrants)
 
     def _Population__get_next_generation(self):
         """ 用於計算下一代的方法。
@@ -126,8 +474,11 @@ class Gavl(Population):
         :return:
             * :new_generation: (染色體列表) 下一代的染色體列表。
         """
-        # 首先，按適應度對族群進行排序：
-        self._Population__calculate_fitness_and_sort()  # 計算適應度並排序
+        generation_stats = self._generation_stats  # 每個階段的計時（沒有啟用儀表時是空對象）
+        # 首先，計算適應度（不需要排序整個族群，只需要精英個體）：
+        self._Population__calculate_fitness_population()  # 計算適應度
+        self._Population__calculate_normalized_fitness()  # 計算標準化適應度
+        generation_stats.lap('fitness')
         # 下一代個體列表：
         new_generation = []
         # 獲取新族群的分組大小：
@@ -137,13 +488,27 @@ class Gavl(Population):
             size_elitism += 1  # 精英個體數增加一個
             size_crossover -= 1  # 交叉個體數減少一個
         # 精英：
-        elite = [individual.chromosome for individual in self.population[:size_elitism]]
-        new_generation.extend(elite)  # 添加精英個體 ---> 注意，在調用此函數之前，族群已按適應度排序。
+        elite = [individual.chromosome for individual in self.__elite(size_elitism)]
+        new_generation.extend(elite)  # 添加精英個體
+        generation_stats.lap('elitism')
         # 交叉：
-        selected_individuals = self.selection(self.population, self.minimize, size_crossover)  # 1. 輪盤選擇
-        paired_ids = self.pairing(selected_individuals)  # 2. 進行配對
+        selected_individuals = self.selection(self.population, self.minimize, size_crossover, **self.__rng_kwargs(self.selection))  # 1. 輪盤選擇
+        generation_stats.lap('selection')
+        paired_ids = self.pairing(selected_individuals, **self.__rng_kwargs(self.pairing))  # 2. 進行配對
+        generation_stats.lap('pairing')
         list_of_paired_ind = [(self.get_individual_by_id(id_a).chromosome, self.get_individual_by_id(id_b).chromosome) for id_a, id_b in paired_ids]  # 配對個體的染色體列表
-        new_crossed_ind = self.crossover(list_of_paired_ind, self.min_length_chromosome, self.max_length_chromosome, self.repeated_genes_allowed, self.check_valid_individual)  # 3. 獲得已交叉的新染色體
+        generation_stats.lap('lookup')
+        check_valid_individual = self.__run_function('check_valid_individual')
+        crossover_stats = {'attempts': 0, 'invalid': 0, 'no_op': 0}  # 這一代的交叉計數器
+        crossover_kwargs = self.__rng_kwargs(self.crossover)  # 只有當交叉函數接受時才傳遞的可選參數
+        if accepts_parameter(self.crossover, 'max_attempts'):
+            crossover_kwargs['max_attempts'] = self.crossover_max_attempts
+        if accepts_parameter(self.crossover, 'crossover_stats'):
+            crossover_kwargs['crossover_stats'] = crossover_stats
+        new_crossed_ind = self.crossover(list_of_paired_ind, self.min_length_chromosome, self.max_length_chromosome, self.repeated_genes_allowed, check_valid_individual, **crossover_kwargs)  # 3. 獲得已交叉的新染色體
+        self.crossover_stats_per_generation.append(crossover_stats)
+        generation_stats.count('crossover_attempts', crossover_stats['attempts'])
+        generation_stats.count('crossover_invalid', crossover_stats['invalid'])
         for new_individual in new_crossed_ind:  # 4. 添加已交叉的個體
             if type(new_individual) == Individual:
                 new_generation.append(new_individual.chromosome)
@@ -151,40 +516,186 @@ class Gavl(Population):
                 new_generation.append(new_individual)
             else:  # 如果交叉方法被錯誤地重新定義
                 raise ValueError('交叉方法必須返回新交叉個體的染色體列表。')
+        generation_stats.lap('crossover')
+        num_repaired = 0  # 這一代被修復的個體數量
+        if self._constraint_set is not None:  # 修復違反約束的子代（如果無法修復，則使用父代）
+            parents = [chromosome for pair in list_of_paired_ind for chromosome in pair]
+            if len(parents) != len(new_generation) - size_elitism:  # 自定義的交叉方法返回了不同數量的個體
+                parents = [self._rng.choice(self.population).chromosome for _ in range(len(new_generation) - size_elitism)]
+            new_generation[size_elitism:], num_repaired = self.__repair_chromosomes(new_generation[size_elitism:], parents)
+            generation_stats.lap('repair')
         # 突變：
         size_mutation = int(len(self.population) * self.mutation_rate)  # 突變個體數
         if size_mutation >= len(new_generation) - size_elitism:
             size_mutation = int(len(new_generation) - size_elitism) - 1
-        indices_mutation = random.sample(range(size_elitism, len(new_generation)), size_mutation)  # 獲取將要突變的個體的索引
+        indices_mutation = self._rng.sample(range(size_elitism, len(new_generation)), size_mutation)  # 獲取將要突變的個體的索引
         chromosomes_to_mutate = [new_generation[i] for i in indices_mutation]  # 獲取將要突變的染色體
-        mutated_individuals = self.mutation(chromosomes_to_mutate, self.mutation_type, self.max_num_gen_changed_mutation, self.min_length_chromosome, self.max_length_chromosome, self.repeated_genes_allowed, self.check_valid_individual, self.possible_genes)
-        for i in indices_mutation:  # 將新突變的個體添加到族群中
+        mutation_kwargs = self.__rng_kwargs(self.mutation)  # 只有當突變函數接受時才傳遞的可選參數
+        if accepts_parameter(self.mutation, 'large_alphabet'):
+            mutation_kwargs['large_alphabet'] = self.large_alphabet
+        mutation_check = check_valid_individual if self.run_stats is None else CountingCheck(check_valid_individual)  # 計算突變的嘗試次數（每次嘗試檢查一次有效性）
+        mutated_individuals = self.mutation(chromosomes_to_mutate, self.mutation_type, self.max_num_gen_changed_mutation, self.min_length_chromosome, self.max_length_chromosome, self.repeated_genes_allowed, mutation_check, self.__run_possible_genes(), **mutation_kwargs)
+        mutated_chromosomes = []
+        for _ in indices_mutation:
             m_ind = mutated_individuals.pop()
             if type(m_ind) == Individual:
-                new_generation[i] = m_ind.chromosome
+                mutated_chromosomes.append(m_ind.chromosome)
             elif type(m_ind) == list:
-                new_generation[i] = m_ind
+                mutated_chromosomes.append(m_ind)
             else:  # 如果突變方法被錯誤地重新定義
                 raise ValueError('突變方法必須返回新突變個體的染色體列表。')
+        if self.run_stats is not None:
+            generation_stats.count('mutations', len(indices_mutation))
+            generation_stats.count('mutation_attempts', mutation_check.calls)
+            generation_stats.count('mutation_invalid', mutation_check.invalid)
+        generation_stats.lap('mutation')
+        if self._constraint_set is not None:  # 修復違反約束的突變個體（如果無法修復，則保留突變前的染色體）
+            mutated_chromosomes, num_repaired_mutation = self.__repair_chromosomes(mutated_chromosomes, [new_generation[i] for i in indices_mutation])
+            num_repaired += num_repaired_mutation
+            self.repaired_per_generation.append(num_repaired)
+            generation_stats.count('repaired', num_repaired)
+            generation_stats.lap('repair')
+        for i, m_chromosome in zip(indices_mutation, mutated_chromosomes):  # 將新突變的個體添加到族群中
+            new_generation[i] = m_chromosome
         return new_generation
 
+    def __elite(self, size_elitism):
+        """ 返回最好的 size_elitism 個個體（從最好到最差）。如果族群已排序，直接取前面的個體；否則使用部分選擇（heapq），成本是 O(N·log k) 而不是排序整個族群的 O(N·log N)。
+        注意在調用此方法之前，必須計算族群的適應度。
+
+        :param size_elitism: (int) 精英個體數。
+        :return:
+            * (list of Individuals) 精英個體列表。
+        """
+        if self._sorted:
+            return self.population[:size_elitism]
+        if self.minimize:
+            return heapq.nsmallest(size_elitism, self.population, key=lambda x: x.fitness_value)
+        return heapq.nlargest(size_elitism, self.population, key=lambda x: x.fitness_value)
+
+    def __repair_chromosomes(self, chromosomes, fallback_chromosomes):
+        """ 修復違反約束的染色體（見 ConstraintSet.repair）。如果無法修復，或修復後的染色體不滿足 check_valid_individual，則使用對應的備用染色體。
+
+        :param chromosomes: (list of lists) 算子返回的染色體。
+        :param fallback_chromosomes: (list of lists) 對應的備用染色體（滿足所有約束，例如交叉前的父代）。
+        :return:
+            * :repaired_chromosomes: (list of lists) 滿足所有約束的染色體列表。
+            * :num_repaired: (int) 被修復的染色體數量。
+        """
+        check_valid_individual = self.__run_function('check_valid_individual')
+        repaired_chromosomes = []
+        num_repaired = 0
+        for chromosome, fallback_chromosome in zip(chromosomes, fallback_chromosomes):
+            if self._constraint_set.is_satisfied(chromosome):
+                repaired_chromosomes.append(chromosome)
+                continue
+            repaired_chromosome = self._constraint_set.repair(chromosome, self.__run_possible_genes(), self.min_length_chromosome, self.max_length_chromosome, self.repeated_genes_allowed, rng=self._rng)
+            if repaired_chromosome is not None and check_valid_individual(repaired_chromosome):
+                repaired_chromosomes.append(repaired_chromosome)
+                num_repaired += 1
+            else:
+                repaired_chromosomes.append(fallback_chromosome)
+        return repaired_chromosomes, num_repaired
+
+    def __repair_chromosome(self, chromosome):
+        """ 修復違反約束的染色體。如果無法修復，則返回原始的染色體（它將被有效性檢查拒絕）。
+
+        :param chromosome: (list) 染色體。
+        :return:
+            * (list) 修復後的染色體或原始的染色體。
+        """
+        repaired_chromosome = self._constraint_set.repair(chromosome, self.__run_possible_genes(), self.min_length_chromosome, self.max_length_chromosome, self.repeated_genes_allowed, rng=self._rng)
+        return chromosome if repaired_chromosome is None else repaired_chromosome
+
+    def __rng_kwargs(self, function):
+        """ 返回傳遞給算子的隨機數生成器（只傳遞算子接受的關鍵字參數 rng 和 np_rng，所以用戶定義的算子不需要改變）。
+
+        :param function: (function) 算子。
+        :return:
+            * (dict) 可選的關鍵字參數。
+        """
+        rng_kwargs = {}
+        if accepts_parameter(function, 'rng'):
+            rng_kwargs['rng'] = self._rng
+        if accepts_parameter(function, 'np_rng'):
+            rng_kwargs['np_rng'] = self._np_rng
+        return rng_kwargs
+
+    def __run_generator(self):
+        """ 返回保持多樣性協議使用的生成新染色體的函數：如果它接受關鍵字參數 rng，則使用這個實例的隨機數生成器；如果有約束，則生成的染色體被修復而不是被丟棄。
+
+        :return:
+            * (function) 接收四個參數的生成新染色體的函數。
+        """
+        if self._constraint_set is not None:
+            return RepairingGenerator(self.generate_new_chromosome, self._constraint_set, self._rng)
+        if accepts_parameter(self.generate_new_chromosome, 'rng'):
+            return functools.partial(self.generate_new_chromosome, rng=self._rng)
+        return self.generate_new_chromosome
+
     def _Population__calculate_fitness_population(self):
         """ 計算族群中所有個體的適應度並設置這個屬性給每個個體。
         """
+        if any(ind.fitness_value is None for ind in self.population):
+            self._Population__invalidate_order()  # 新的適應度值可能改變族群的順序
         # 首先檢查所需屬性是否已定義。
-        if self.fitness is None:
-            raise AttributeError("在調用此方法之前，必須定義適應度方法。可以通過調用方法 Gavl.set_hyperparameter('fitness', value) 來定義，其中 value 是一個函數，其唯一參數是個體的染色體（fitness(chromosome)）並返回適應度值。")
+        if self.fitness is None and self.batch_fitness is None:
+            raise AttributeError("在調用此方法之前，必須定義適應度方法（或批量適應度方法 'batch_fitness'）。可以通過調用方法 Gavl.set_hyperparameter('fitness', value) 來定義，其中 value 是一個函數，其唯一參數是個體的染色體（fitness(chromosome)）並返回適應度值。")
         elif not len(self.population):
             raise AttributeError('族群尚未生成。')
+        elif self.batch_fitness is None and self.evaluator == 'serial' and self._fitness_cache is None:
+            fitness = self.__run_function('fitness')
+            for ind in self.population:
+                if ind.fitness_value is None:  # 只計算染色體已改變的個體
+                    ind.calculate_fitness(fitness)
+                    self.fitness_evaluations += 1
         else:
+            groups = []  # 待計算的個體組（同一組的個體擁有相同的染色體）
+            keys = []  # 每組的規範鍵（不使用快取時為 None）
+            group_by_key = {}  # 規範鍵 -> 組的索引
             for ind in self.population:
-                ind.calculate_fitness(self.fitness)
+                if ind.fitness_value is not None:  # 只計算染色體已改變的個體
+                    continue
+                if self._fitness_cache is None:
+                    groups.append([ind])
+                    keys.append(None)
+                    continue
+                key = self._fitness_cache.key(ind.chromosome)  # 染色體的規範鍵（與基因順序無關）
+                if key in group_by_key:  # 相同的染色體已經在等待計算
+                    groups[group_by_key[key]].append(ind)
+                    self._fitness_cache.hits += 1  # 節省一次適應度計算
+                    continue
+                found, value = self._fitness_cache.get(key)
+                if found:
+                    ind.set_fitness_value(value)  # 節省一次適應度計算
+                else:
+                    group_by_key[key] = len(groups)
+                    groups.append([ind])
+                    keys.append(key)
+            try:
+                chromosomes = [group[0].chromosome for group in groups]
+                if self.batch_fitness is not None:
+                    if self.batch_fitness_format == 'index_matrix' and self._gene_index is None and self._encoder is None:
+                        self._gene_index = build_gene_index(self.possible_genes)
+                    elif self.batch_fitness_format == 'list' and self._encoder is not None:
+                        chromosomes = [self._encoder.decode(chromosome) for chromosome in chromosomes]  # 用戶函數接收基因
+                    values = evaluate_batch(self.batch_fitness, chromosomes, self.batch_fitness_format, self._gene_index if self._encoder is None else None)  # 一次計算所有染色體的適應度
+                else:
+                    values = self.__get_evaluator().map(self.__run_function('fitness'), chromosomes)  # 計算適應度（可能並行）
+                self.fitness_evaluations += len(chromosomes)
+                for group, key, value in zip(groups, keys, values):  # 將結果寫回對應的個體
+                    for ind in group:
+                        ind.set_fitness_value(value)
+                    if key is not None:
+                        self._fitness_cache.put(key, value)
+            except Exception as e:
+                raise Exception(str(e) + '\n計算個體適應度時出錯')
 
     def _Population__generate_population(self):
         """ 生成新的族群並將其添加到 population 屬性中。
         """
-        if self.fitness is None:
-            raise AttributeError("在調用此方法之前，必須定義適應度方法。可以通過調用方法 Gavl.set_hyperparameter('fitness', value) 來定義，其中 value 是一個函數，其唯一參數是個體的染色體（fitness(chromosome)）並返回適應度值。")
+        if self.fitness is None and self.batch_fitness is None:
+            raise AttributeError("在調用此方法之前，必須定義適應度方法（或批量適應度方法 'batch_fitness'）。可以通過調用方法 Gavl.set_hyperparameter('fitness', value) 來定義，其中 value 是一個函數，其唯一參數是個體的染色體（fitness(chromosome)）並返回適應度值。")
         elif self.size_population is None:
             raise AttributeError("在調用此方法之前，必須定義屬性 'size_population'。它必須是一個大於 0 的整數，可以通過調用方法 Gavl.set_hyperparameter('size_population', value) 來設定。")
         elif self.min_length_chromosome is None:
@@ -194,34 +705,85 @@ class Gavl(Population):
         elif self.possible_genes is None:
             raise AttributeError("在調用此方法之前，必須定義屬性 'possible_genes'。它必須是一個包含所有可能的基因值的列表。")
         else:
-            while len(self.population) < self.size_population:
-                # 創建新個體：
-                new_ind = self.generate_new_chromosome(self.min_length_chromosome, self.max_length_chromosome, self.possible_genes, self.repeated_genes_allowed)
-                if self.check_valid_individual(new_ind):  # 如果檢查個體有效性的函數過於嚴格，可能會導致這一步需要很長時間
-                    self.add_individual(new_ind)
+            missing_individuals = self.size_population - len(self.population)
+            if missing_individuals <= 0:
+                return
+            max_attempts = self.initialization_max_attempts if self.initialization_max_attempts is not None else 1000 * self.size_population
+            map_function = self.__get_evaluator().map if self.initialization_parallel_validation else map
+            # 以批次創建新個體（如果檢查個體有效性的函數過於嚴格，在超過預算時引發錯誤）：
+            repair_function = None if self._constraint_set is None else self.__repair_chromosome  # 違反約束的候選染色體在檢查有效性之前被修復
+            new_chromosomes, self.initialization_stats = generate_valid_chromosomes(missing_individuals, self.generate_new_chromosome, self.min_length_chromosome, self.max_length_chromosome, self.__run_possible_genes(), self.repeated_genes_allowed, self.__run_check_valid_individual(), map_function=map_function, max_attempts=max_attempts, max_time=self.initialization_max_time, repair_function=repair_function, rng=self._rng, np_rng=self._np_rng)
+            for new_ind in new_chromosomes:
+                super().add_individual(new_ind)  # 已經檢查過有效性和族群大小
 
     def _Population__sort_population(self):
-        """ 對族群按適應度進行排序。
+        """ 對族群按適應度進行排序。如果族群已經排序（並且之後沒有改變），則不再排序。
         """
         if not len(self.population):
             raise AttributeError('族群尚未生成。')
         else:
             if any([ind.fitness_value is None for ind in self.population]):
                 self._Population__calculate_fitness_population()  # 如果還沒有計算，先計算個體的適應度
+            if self._sorted:
+                return
             if self.minimize:  # 如果目標是最小化
                 self.population.sort(key=lambda x: x.fitness_value, reverse=False)  # 從最佳適應度到最差適應度排序
             else:
                 self.population.sort(key=lambda x: x.fitness_value, reverse=True)  # 從最差適應度到最佳適應度排序
+            self._sorted = True
+            self._best_individual = self.population[0]
+
+    def __run_possible_genes(self):
+        """ 返回算子使用的可能基因：如果使用整數編碼，則為索引列表；否則為 possible_genes。
+
+        :return:
+            * (list) 算子使用的可能基因。
+        """
+        return self.possible_genes if self._encoder is None else self._encoder.indices
+
+    def __run_function(self, id_function):
+        """ 返回算子使用的用戶函數（'fitness' 或 'check_valid_individual'）：如果使用整數編碼，則包裝為先解碼染色體再調用的函數。
+
+        :param id_function: (str) 屬性的名稱。
+        :return:
+            * (function) 接收算子所使用的染色體的函數。
+        """
+        function = getattr(self, id_function)
+        if self._encoder is None or function is None:
+            return function
+        return self._encoder.decoded(function)
+
+    def __run_check_valid_individual(self):
+        """ 返回檢查有效性的函數（見 __run_function）：如果有約束，則同時檢查約束和 check_valid_individual。
+
+        :return:
+            * (function) 接收算子所使用的染色體的函數。
+        """
+        check_valid_individual = self.__run_function('check_valid_individual')
+        return check_valid_individual if self._constraint_set is None else ConstrainedCheck(self._constraint_set, check_valid_individual)
+
+    def __get_evaluator(self):
+        """ 返回持久的評估器，如果還不存在則創建它。
+
+        :return:
+            * 評估器對象（見 tools/evaluator.py）。
+        """
+        if self._evaluator is None:
+            self._evaluator = get_evaluator(self.evaluator, self.evaluator_workers, self.evaluator_chunk_size)
+        return self._evaluator
+
+    def __close_evaluator(self):
+        """ 關閉評估器的池（如果存在）。 """
+        if self._evaluator is not None:
+            self._evaluator.close()
+            self._evaluator = None
 
     def __update_termination_criteria_args(self):
-        """ 更新終止條件參數的方法。這個方法必須在遺傳演算法的每一新代中被調用。
+        """ 更新終止條件參數的方法（見 tools/termination_criteria.py 中的 update_termination_criteria_args）。這個方法必須在遺傳演算法的每一新代中被調用。
 
         :return:
         """
-        if list(self.termination_criteria.keys())[0] == 'max_num_generation_reached':
-            self._termination_criteria_args['generation_count'] = self._generation_count
-        elif list(self.termination_criteria.keys())[0] == 'goal_fitness_reached':
-            self._termination_criteria_args['generation_fitness'] = self.best_individual().fitness_value
+        update_termination_criteria_args(self._termination_criteria_args, self._generation_count, self.best_individual().fitness_value, self.fitness_evaluations, time.perf_counter() - self._run_start_time)
 
     def add_individual(self, individual):
         """ 將新個體添加到族群中的方法。這個方法覆蓋了具有相同名稱的類 Population 中的方法 ---> 這樣做是為了檢查是否添加的個體數超過了 self.size_population 許可的最大值。
@@ -238,25 +800,33 @@ class Gavl(Population):
                 ind = individual.chromosome.copy()
             else:
                 raise ValueError('提供的個體無效。它必須是一個基因列表或個體類的對象。')
-            if self.check_valid_individual(ind):
+            if self.check_valid_individual(ind) and (not self.constraints or ConstraintSet(self.constraints).is_satisfied(ind)):
                 # 檢查族群中的個體數是否小於允許的最大值
                 if len(self.population) < self.size_population:
                     super().add_individual(ind)
                 else:
                     raise AttributeError('族群已滿（有 {} 個體，這是指定的最大族群大小）。如果想要更多個體，可以通過調用 Gavl.set_hyperparameter("size_population", size) 改變族群大小。'.format(self.size_population))
             else:
-                raise ValueError('提供的個體無效。請檢查方法 check_valid_individual 或更改個體。')
+                raise ValueError('提供的個體無效。請檢查方法 check_valid_individual 和約束（\'constraints\'）或更改個體。')
 
     def best_individual(self):
-        """ 返回最佳個體的方法。
+        """ 返回最佳個體的方法。最佳個體被快取，直到族群或其適應度改變；如果族群沒有排序，則以 O(N) 找到最佳個體，而不是排序整個族群。
 
         :return:
             * :individual: (Individual) 最佳個體。
         """
         if not len(self.population):
             raise AttributeError('族群尚未生成。')
-        self._Population__sort_population()  # 從最佳個體到最差個體排序族群。
-        return self.population[0]
+        if any(ind.fitness_value is None for ind in self.population):
+            self._Population__calculate_fitness_population()  # 如果還沒有計算，先計算個體的適應度
+        if self._best_individual is None:
+            if self._sorted:
+                self._best_individual = self.population[0]
+            elif self.minimize:
+                self._best_individual = min(self.population, key=lambda x: x.fitness_value)
+            else:
+                self._best_individual = max(self.population, key=lambda x: x.fitness_value)
+        return self._best_individual
 
     def historic_fitness(self):
         """ 返回每一代的最佳適應度值的方法。
@@ -268,6 +838,16 @@ class Gavl(Population):
             raise ValueError('在調用此方法之前，必須進行優化（調用方法 .optimize()）。')
         return self.best_fitness_per_generation
 
+    def fitness_cache_stats(self):
+        """ 返回適應度快取的統計資料的方法。
+
+        :return:
+            * :stats: (dict) 包含 'hits'（節省的適應度計算次數）、'misses'、'evictions'、'size' 和 'max_size' 的字典。
+        """
+        if self._fitness_cache is None:
+            raise ValueError("適應度快取未啟用。可以通過調用方法 Gavl.set_hyperparameter('fitness_cache_size', size) 啟用它，然後調用方法 .optimize()。")
+        return self._fitness_cache.stats()
+
     def get_results(self):
         """ 獲取優化過程的結果的方法，一旦優化完成。
 
@@ -277,8 +857,8 @@ class Gavl(Population):
             * :historic_fitness: (浮點數列表) 每一代的最佳適應度值列表。
         """
         # 首先檢查所需屬性是否已定義。
-        if self.fitness is None:
-            raise AttributeError("在調用此方法之前，必須定義適應度方法。可以通過調用方法 Gavl.set_hyperparameter('fitness', value) 來定義，其中 value 是一個函數，其唯一參數是個體的染色體（fitness(chromosome)）並返回適應度值。")
+        if self.fitness is None and self.batch_fitness is None:
+            raise AttributeError("在調用此方法之前，必須定義適應度方法（或批量適應度方法 'batch_fitness'）。可以通過調用方法 Gavl.set_hyperparameter('fitness', value) 來定義，其中 value 是一個函數，其唯一參數是個體的染色體（fitness(chromosome)）並返回適應度值。")
         elif self.size_population is None:
             raise AttributeError("在調用此方法之前，必須定義屬性 'size_population'。它必須是一個大於 0 的整數，可以通過調用方法 Gavl.set_hyperparameter('size_population', value) 來設定。")
         elif self.min_length_chromosome is None:
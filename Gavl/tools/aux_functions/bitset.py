@@ -0,0 +1,117 @@
+"""
+In this file it is defined the auxiliary functions to represent a chromosome without repeated genes as a bitset. The chromosome must be encoded as integer indices (see tools/encoding.py) and the bitset is a Python int whose bit i is set if the gene with index i is in the chromosome. Thus, the set difference, the union and the size of the chromosomes are computed with bit operations.
+
+The bitset representation pays off when the chromosomes are dense (their length is a sizable fraction of the number of possible genes, e.g. a few thousand possible genes): then every bit operation handles 64 genes at once. Each bit operation costs O(number_of_possible_genes / 64), so with very large alphabets and short chromosomes (e.g. 10^6 possible genes and 100 genes per chromosome) the list representation with 'large_alphabet' = 1 is faster. To keep the cost bounded in any case, the conversions between lists and bitsets work on NumPy arrays of 64-bit words (instead of walking the Python int bit by bit) and the operators only convert the parents once per pair.
+
+Functions:
+    to_bitset: Returns the bitset of a list of indices.
+    from_bitset: Returns the sorted list of indices of a bitset.
+    popcount: Returns the number of genes of a bitset.
+    sample_bitset: Returns random indices among the genes of a bitset.
+    sample_complement: Returns random indices among the genes that are NOT in a bitset.
+"""
+import random
+import numpy as np
+
+SMALL_BITSET_SIZE = 4096  # 最大索引小於這個值時，以 Python 循環轉換（此時 NumPy 的固定開銷更大）
+
+
+def to_bitset(indices):
+    """
+    此函數返回索引列表的位集（bitset）。對於大的索引，位集以 NumPy 的 64 位字數組構造，然後一次轉換為 Python int（成本 O(len(indices) + 最大索引 / 64)）。
+
+    :param indices: (list of int) 基因的索引列表（不重複）。
+    :return:
+        * (int) 位集。
+    """
+    if len(indices) == 0:
+        return 0
+    if max(indices) < SMALL_BITSET_SIZE:
+        bitset = 0
+        for index in indices:
+            bitset |= 1 << index
+        return bitset
+    indices = np.asarray(indices, dtype=np.int64)
+    words = np.zeros(int(indices.max()) // 64 + 1, dtype='<u8')
+    np.bitwise_or.at(words, indices >> 6, np.left_shift(np.uint64(1), (indices & 63).astype(np.uint64)))
+    return int.from_bytes(words.tobytes(), 'little')
+
+
+def from_bitset(bitset):
+    """
+    此函數返回位集的索引列表（由小到大排序）。對於大的位集，位集以 int.to_bytes 轉換為 64 位字數組，只解包非零的字（成本 O(位集的大小 / 64 + 基因數量)，在 NumPy 中進行）。
+
+    :param bitset: (int) 位集。
+    :return:
+        * (list of int) 基因的索引列表。
+    """
+    if bitset.bit_length() <= SMALL_BITSET_SIZE:
+        indices = []
+        while bitset:
+            lowest_bit = bitset & -bitset  # 最低的已設定位
+            indices.append(lowest_bit.bit_length() - 1)
+            bitset ^= lowest_bit
+        return indices
+    number_of_words = (bitset.bit_length() + 63) // 64
+    words = np.frombuffer(bitset.to_bytes(8 * number_of_words, 'little'), dtype='<u8')
+    nonzero_words = np.flatnonzero(words)
+    bits = np.unpackbits(words[nonzero_words].view(np.uint8), bitorder='little').reshape(len(nonzero_words), 64)
+    rows, columns = np.nonzero(bits)
+    return (nonzero_words[rows] * 64 + columns).tolist()
+
+
+def popcount(bitset):
+    """
+    此函數返回位集中已設定位的數量（即染色體的基因數量）。
+
+    :param bitset: (int) 位集。
+    :return:
+        * (int) 基因數量。
+    """
+    try:
+        return bitset.bit_count()  # Python >= 3.10
+    except AttributeError:
+        return bin(bitset).count('1')
+
+
+def sample_bitset(bitset, number_of_genes, rng=random):
+    """
+    此函數返回位集中隨機選擇的基因索引（不重複）。
+
+    :param bitset: (int) 位集。
+    :param number_of_genes: (int) 要選擇的基因數量。
+    :param rng: (random.Random) 隨機數生成器。默認為 random 模組。
+    :return:
+        * (list of int) 隨機選擇的基因索引列表。
+    """
+    return rng.sample(from_bitset(bitset), number_of_genes)
+
+
+def sample_complement(bitset, number_of_possible_genes, number_of_genes, rng=random, genes=None):
+    """
+    此函數返回不在位集中的隨機基因索引（不重複），即從染色體的補集中抽樣。當補集很大時使用拒絕抽樣（成本與染色體長度成正比，而不是與可能的基因數量成正比）。
+
+    :param bitset: (int or None) 位集。如果給出 genes，可以是 None（只有在需要時才從 genes 構造位集，即補集較小時）。
+    :param number_of_possible_genes: (int) 可能的基因數量（索引從 0 到 number_of_possible_genes - 1）。
+    :param number_of_genes: (int) 要選擇的基因數量。
+    :param rng: (random.Random) 隨機數生成器。默認為 random 模組。
+    :param genes: (set of int or None) 位集中的基因的集合（如果已知）。拒絕抽樣以它檢查成員關係（O(1)），而不是移位整個位集（O(位集的大小 / 64)）。默認為 None。
+    :return:
+        * (list of int) 隨機選擇的基因索引列表。
+    """
+    size_complement = number_of_possible_genes - (len(genes) if genes is not None else popcount(bitset))
+    if number_of_genes > size_complement:
+        raise ValueError('補集中沒有足夠的基因（需要 {}，只有 {}）。'.format(number_of_genes, size_complement))
+    if size_complement >= 2 * (number_of_possible_genes - size_complement + number_of_genes):  # 補集很大 ---> 拒絕抽樣
+        if genes is None:
+            genes = set(from_bitset(bitset))
+        selected = set()
+        while len(selected) < number_of_genes:
+            index = rng.randrange(number_of_possible_genes)
+            if index not in genes:
+                selected.add(index)
+        return list(selected)
+    if bitset is None:
+        bitset = to_bitset(list(genes))
+    complement = ((1 << number_of_possible_genes) - 1) & ~bitset
+    return rng.sample(from_bitset(complement), number_of_genes)
@@ -0,0 +1,48 @@
+"""
+In this file it is defined the auxiliary functions to get a canonical (order-insensitive and hashable) form of a chromosome. As the genes of a chromosome are unordered, two chromosomes with the same genes (and the same number of repetitions of each gene) represent the same individual.
+
+Functions:
+    freeze_gene: function that returns a hashable version of a gene.
+    canonical_chromosome: function that returns the canonical key of a chromosome.
+"""
+from collections import Counter
+
+
+def freeze_gene(gene):
+    """
+    此函數返回基因的可雜湊（hashable）版本。可雜湊的基因（int、str、tuple...）直接返回；字典、列表和集合被遞歸地轉換為不可變的等價物。
+
+    :param gene: (...) 任何類型的基因。
+    :return:
+        * (hashable) 基因的可雜湊版本。
+    """
+    try:
+        hash(gene)
+        return gene  # 基因已經是可雜湊的
+    except TypeError:
+        pass
+    if isinstance(gene, dict):
+        return ('__dict__', frozenset((freeze_gene(k), freeze_gene(v)) for k, v in gene.items()))
+    elif isinstance(gene, (list, tuple)):
+        return ('__list__', tuple(freeze_gene(g) for g in gene))
+    elif isinstance(gene, (set, frozenset)):
+        return ('__set__', frozenset(freeze_gene(g) for g in gene))
+    else:
+        return ('__repr__', repr(gene))  # 最後的手段：使用對象的字串表示
+
+
+def canonical_chromosome(chromosome, repeated_genes_allowed):
+    """
+    此函數返回染色體的規範鍵（canonical key）。由於染色體的基因是無序的，因此擁有相同基因的兩個染色體會得到相同的鍵。
+    如果不允許基因重複，鍵是基因的 frozenset；如果允許基因重複，鍵是 (基因, 重複次數) 的 frozenset（即多重集合）。
+
+    :param chromosome: (list of genes) 染色體。
+    :param repeated_genes_allowed: (int) 表示染色體中的基因是否可以重複（1）或不可以（0）。
+    :return:
+        * (frozenset) 染色體的規範鍵。
+    """
+    frozen_genes = [freeze_gene(gen) for gen in chromosome]
+    if repeated_genes_allowed:
+        return frozenset(Counter(frozen_genes).items())  # 多重集合：每個基因及其出現次數
+    else:
+        return frozenset(frozen_genes)
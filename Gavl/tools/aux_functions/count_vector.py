@@ -0,0 +1,67 @@
+"""
+In this file it is defined the auxiliary functions to represent a chromosome with repeated genes (a multiset) as a count vector. The chromosome must be encoded as integer indices (see tools/encoding.py) and the count vector is a NumPy array whose position i holds the number of times that the gene with index i appears in the chromosome. Thus, adding and removing genes are vector additions and subtractions, the length of the chromosome is the sum of the vector and two chromosomes are equal if their count vectors are equal.
+
+Functions:
+    to_counts: Returns the count vector of a list of indices.
+    from_counts: Returns the list of indices of a count vector.
+    sample_counts: Returns a random sub-multiset (as a count vector) of a count vector.
+    counts_matrix: Returns the matrix with the count vectors of a list of chromosomes.
+"""
+import random
+import numpy as np
+
+
+def to_counts(indices, number_of_possible_genes):
+    """
+    此函數返回索引列表的計數向量。
+
+    :param indices: (list of int) 基因的索引列表（可以重複）。
+    :param number_of_possible_genes: (int) 計數向量的長度（可能的基因數量）。
+    :return:
+        * (numpy.ndarray of int) 計數向量。
+    """
+    return np.bincount(np.asarray(indices, dtype=np.int64), minlength=number_of_possible_genes)
+
+
+def from_counts(counts):
+    """
+    此函數返回計數向量的索引列表（由小到大排序）。
+
+    :param counts: (numpy.ndarray of int) 計數向量。
+    :return:
+        * (list of int) 基因的索引列表。
+    """
+    return np.repeat(np.arange(len(counts)), counts).tolist()
+
+
+def sample_counts(counts, number_of_genes, rng=random):
+    """
+    此函數返回計數向量的隨機子多重集合（每個基因的副本被選中的機率相同）。
+
+    :param counts: (numpy.ndarray of int) 計數向量。
+    :param number_of_genes: (int) 要選擇的基因數量（必須小於或等於計數向量的總和）。
+    :param rng: (random.Random) 隨機數生成器。默認為 random 模組。
+    :return:
+        * (numpy.ndarray of int) 子多重集合的計數向量。
+    """
+    cumulative_counts = np.cumsum(counts)
+    positions = np.fromiter(rng.sample(range(int(cumulative_counts[-1])), number_of_genes), dtype=np.int64, count=number_of_genes)  # 隨機選擇基因副本的位置
+    genes = np.searchsorted(cumulative_counts, positions, side='right')  # 位置 -> 基因的索引
+    return np.bincount(genes, minlength=len(counts))
+
+
+def counts_matrix(chromosomes, number_of_possible_genes):
+    """
+    此函數返回染色體列表的計數矩陣（每一行是一個染色體的計數向量）。
+
+    :param chromosomes: (list of lists of int) 染色體列表。
+    :param number_of_possible_genes: (int) 可能的基因數量。
+    :return:
+        * (numpy.ndarray of int) 形狀為 (染色體數量, 可能的基因數量) 的計數矩陣。
+    """
+    lengths = [len(chromosome) for chromosome in chromosomes]
+    rows = np.repeat(np.arange(len(chromosomes)), lengths)
+    columns = np.fromiter((gen for chromosome in chromosomes for gen in chromosome), dtype=np.int64, count=sum(lengths))
+    matrix = np.zeros((len(chromosomes), number_of_possible_genes), dtype=np.int64)
+    np.add.at(matrix, (rows, columns), 1)
+    return matrix
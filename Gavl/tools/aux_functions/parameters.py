@@ -0,0 +1,36 @@
+"""
+In this file it is defined the auxiliary functions to inspect the parameters of the functions given by the user (or of the built-in operators with optional parameters).
+
+Functions:
+    num_required_parameters: Returns the number of parameters of a function that do not have a default value.
+    accepts_parameter: Returns whether a function accepts a given keyword argument.
+"""
+from inspect import signature, Parameter
+
+
+def num_required_parameters(function):
+    """
+    此函數返回函數中沒有默認值的參數數量。這樣，帶有可選參數的算子（例如 tournament_selection(population, minimize, num_selected_ind, tournament_size=3)）
+    或用 functools.partial 固定了可選參數的算子，仍然被視為具有相同的必需參數。
+
+    :param function: (function) 要檢查的函數。
+    :return:
+        * (int) 沒有默認值的位置參數數量。
+    """
+    return len([parameter for parameter in signature(function).parameters.values()
+                if parameter.default is Parameter.empty and parameter.kind in (Parameter.POSITIONAL_ONLY, Parameter.POSITIONAL_OR_KEYWORD)])
+
+
+def accepts_parameter(function, name_parameter):
+    """
+    此函數檢查函數是否接受某個（關鍵字）參數。這樣，只有在算子支持時才傳遞可選的參數（例如交叉的最大嘗試次數），用戶定義的算子不需要改變。
+
+    :param function: (function) 要檢查的函數。
+    :param name_parameter: (str) 參數的名稱。
+    :return:
+        * (bool) 如果函數有這個參數或接受任意關鍵字參數（**kwargs），則為 True。
+    """
+    parameters = signature(function).parameters
+    if name_parameter in parameters:
+        return parameters[name_parameter].kind in (Parameter.POSITIONAL_OR_KEYWORD, Parameter.KEYWORD_ONLY)
+    return any(parameter.kind == Parameter.VAR_KEYWORD for parameter in parameters.values())
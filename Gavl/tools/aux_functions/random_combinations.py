@@ -0,0 +1,149 @@
+"""
+In this file it is defined the auxiliary functions to draw uniformly random combinations (k-subsets) of the elements of a list without enumerating them. Unlike enumerating the combinations in lexicographic order (where the first elements are tried together over and over), each combination is drawn with Floyd's algorithm in O(k). Optionally, the combinations already drawn are tracked so that none of them is repeated.
+
+Functions:
+    sample_indices: Returns a uniformly random combination of k indices of range(n).
+    sample_combination: Returns a uniformly random combination of k elements of a list.
+    random_combinations: Generator of uniformly random combinations of k elements of a list.
+    random_combination_pairs: Generator of uniformly random pairs of combinations of two lists.
+    sample_excluding: Returns random elements of a list that are not in a given set, using rejection sampling when the list is large.
+"""
+import random
+from itertools import combinations, product
+from math import comb
+from .canonical import freeze_gene
+
+
+def sample_indices(n, k, rng=random):
+    """
+    此函數使用 Floyd 演算法返回 range(n) 中 k 個索引的均勻隨機組合。成本是 O(k)（與 n 無關）。
+
+    :param n: (int) 索引的數量。
+    :param k: (int) 組合的長度（0 <= k <= n）。
+    :param rng: (random.Random) 隨機數生成器。默認為 random 模組。
+    :return:
+        * (tuple of int) 由小到大排序的索引組合。
+    """
+    selected = set()
+    for j in range(n - k, n):
+        index = rng.randrange(j + 1)
+        selected.add(j if index in selected else index)
+    return tuple(sorted(selected))
+
+
+def sample_combination(list_get_comb, length_combination, rng=random):
+    """
+    此函數返回列表中 length_combination 個元素的均勻隨機組合（按位置選擇，所以重複的元素被視為不同的元素）。
+
+    :param list_get_comb: (list) 想要獲取元素組合的列表。
+    :param length_combination: (int) 元素組合的長度。
+    :param rng: (random.Random) 隨機數生成器。默認為 random 模組。
+    :return:
+        * (list) 元素的組合。
+    """
+    check_combination_length(list_get_comb, length_combination)
+    return [list_get_comb[i] for i in sample_indices(len(list_get_comb), length_combination, rng)]
+
+
+def random_combinations(list_get_comb, length_combination, unique=False, rng=random):
+    """
+    生成器，逐個返回列表中 length_combination 個元素的均勻隨機組合，不需要枚舉所有組合。
+
+    :param list_get_comb: (list) 想要獲取元素組合的列表。
+    :param length_combination: (int) 元素組合的長度。
+    :param unique: (bool) 如果為 True，則不會返回重複的組合，並且在返回所有組合後生成器結束。如果為 False，則生成器是無限的。默認為 False。
+    :param rng: (random.Random) 隨機數生成器。默認為 random 模組。
+    :return:
+        * :generator: 元素組合（列表）的生成器。
+    """
+    check_combination_length(list_get_comb, length_combination)
+    for (indices,) in random_index_combinations([(len(list_get_comb), length_combination)], unique, rng):
+        yield [list_get_comb[i] for i in indices]
+
+
+def random_combination_pairs(list_a, length_combination_a, list_b, length_combination_b, unique=False, rng=random):
+    """
+    生成器，逐個返回組合對 (list_a 中 length_combination_a 個元素的組合, list_b 中 length_combination_b 個元素的組合)，每一對都是均勻隨機的。
+    例如，在交叉中用於選擇兩個個體要交換的基因。
+
+    :param list_a: (list) 第一個列表。
+    :param length_combination_a: (int) 第一個列表的組合長度。
+    :param list_b: (list) 第二個列表。
+    :param length_combination_b: (int) 第二個列表的組合長度。
+    :param unique: (bool) 如果為 True，則不會返回重複的組合對，並且在返回所有組合對後生成器結束。如果為 False，則生成器是無限的。默認為 False。
+    :param rng: (random.Random) 隨機數生成器。默認為 random 模組。
+    :return:
+        * :generator: 組合對（兩個列表的元組）的生成器。
+    """
+    check_combination_length(list_a, length_combination_a)
+    check_combination_length(list_b, length_combination_b)
+    for indices_a, indices_b in random_index_combinations([(len(list_a), length_combination_a), (len(list_b), length_combination_b)], unique, rng):
+        yield [list_a[i] for i in indices_a], [list_b[i] for i in indices_b]
+
+
+def random_index_combinations(sizes, unique, rng):
+    """
+    生成器，返回多個索引組合的元組，每個 (n, k) 對應一個 range(n) 中 k 個索引的組合。
+    如果 unique 為 True，使用集合記錄已返回的元組（拒絕抽樣）；當已返回的元組超過總數的一半時，拒絕抽樣變得低效，所以改為以隨機順序枚舉剩餘的元組。
+
+    :param sizes: (list of tuples of int) (n, k) 的列表。
+    :param unique: (bool) 是否不返回重複的元組。
+    :param rng: (random.Random) 隨機數生成器。
+    :return:
+        * :generator: 索引組合元組的生成器。
+    """
+    if not unique:
+        while True:
+            yield tuple(sample_indices(n, k, rng) for n, k in sizes)
+    total_combinations = 1
+    for n, k in sizes:
+        total_combinations *= comb(n, k)
+    seen = set()  # 已返回的組合
+    while 2 * len(seen) < total_combinations:
+        indices = tuple(sample_indices(n, k, rng) for n, k in sizes)
+        if indices not in seen:
+            seen.add(indices)
+            yield indices
+    remaining = [indices for indices in product(*[combinations(range(n), k) for n, k in sizes]) if indices not in seen]  # 剩餘的組合
+    rng.shuffle(remaining)
+    yield from remaining
+
+
+def check_combination_length(list_get_comb, length_combination):
+    """
+    此函數檢查組合的參數是否正確，否則引發錯誤。
+
+    :param list_get_comb: (list) 想要獲取元素組合的列表。
+    :param length_combination: (int) 元素組合的長度。
+    """
+    if not isinstance(list_get_comb, list):
+        raise TypeError("參數 'list_get_comb' 必須是列表。")
+    if not isinstance(length_combination, int):
+        raise TypeError("參數 'length_combination' 必須是一個非負整數，且小於或等於給定列表的長度。")
+    if length_combination < 0 or length_combination > len(list_get_comb):
+        raise ValueError("參數 'length_combination' 必須是一個非負整數，且小於或等於給定列表的長度。")
+
+
+def sample_excluding(list_elements, excluded, number_of_elements, rng=random):
+    """
+    此函數返回列表中不在 excluded 集合中的隨機元素（不重複）。當列表遠大於被排除的元素時，使用拒絕抽樣（成本與選擇的元素數量成正比，而不是與列表的長度成正比）；
+    否則構造剩餘元素的列表並從中抽樣。例如，用於從很大的可能基因列表中選擇不在染色體中的新基因。
+
+    :param list_elements: (list) 元素列表（不重複）。
+    :param excluded: (set) 被排除的元素（以 freeze_gene 凍結的形式，見 aux_functions/canonical.py）。
+    :param number_of_elements: (int) 要選擇的元素數量。
+    :param rng: (random.Random) 隨機數生成器。默認為 random 模組。
+    :return:
+        * (list) 隨機選擇的元素列表。如果剩餘的元素不足，則返回所有剩餘的元素。
+    """
+    size_list = len(list_elements)
+    if size_list >= 2 * (2 * len(excluded) + number_of_elements):  # 列表很大 ---> 拒絕抽樣
+        selected = {}  # 凍結的元素 ---> 元素
+        while len(selected) < number_of_elements:
+            element = list_elements[rng.randrange(size_list)]
+            frozen_element = freeze_gene(element)
+            if frozen_element not in excluded and frozen_element not in selected:
+                selected[frozen_element] = element
+        return list(selected.values())
+    remaining = [element for element in list_elements if freeze_gene(element) not in excluded]
+    return rng.sample(remaining, min(number_of_elements, len(remaining)))
@@ -0,0 +1,19 @@
+"""
+In this file it is defined the auxiliary functions to get the random number generators used by the vectorized operators.
+
+Functions:
+    numpy_rng: Returns a NumPy random generator seeded from a Python random generator.
+"""
+import random
+import numpy as np
+
+
+def numpy_rng(rng=random):
+    """
+    此函數返回一個 NumPy 隨機數生成器，其種子取自 Python 的隨機數生成器。這樣，調用 random.seed() 後向量化的算子也是可重現的。
+
+    :param rng: (random.Random) Python 的隨機數生成器。默認為 random 模組。
+    :return:
+        * (numpy.random.Generator) NumPy 隨機數生成器。
+    """
+    return np.random.default_rng(rng.getrandbits(64))
@@ -0,0 +1,73 @@
+"""
+In this file it is defined the functions to evaluate the fitness of many chromosomes at once with a batched (vectorized) fitness function.
+
+Functions:
+    build_gene_index: Returns the dictionary that maps each possible gene to its index.
+    build_index_matrix: Returns the padded matrix of gene indices of a list of chromosomes and their lengths.
+    evaluate_batch: Calls the batched fitness function and returns the fitness values.
+"""
+import numpy as np
+from .aux_functions.canonical import freeze_gene
+
+PADDING_INDEX = -1  # 用於填充索引矩陣中較短行的索引
+
+
+def build_gene_index(possible_genes):
+    """
+    此函數返回將每個可能的基因映射到其在 possible_genes 中的索引的字典。如果一個基因在列表中出現多次，使用第一次出現的索引。
+
+    :param possible_genes: (list of ...) 包含所有可能基因值的列表。
+    :return:
+        * (dict) 基因（可雜湊版本，見 freeze_gene）-> 索引。
+    """
+    gene_index = {}
+    for i, gen in enumerate(possible_genes):
+        gene_index.setdefault(freeze_gene(gen), i)
+    return gene_index
+
+
+def build_index_matrix(chromosomes, gene_index=None):
+    """
+    此函數返回染色體的基因索引矩陣。每一行是一個染色體，矩陣的寬度是最長染色體的長度，較短的行用 PADDING_INDEX（-1）填充。
+
+    :param chromosomes: (list of lists) 染色體列表。
+    :param gene_index: (dict) 基因 -> 索引的字典（見 build_gene_index）。如果為 None，則染色體已經是索引的列表。
+    :return:
+        * :index_matrix: (numpy.ndarray of int) 形狀為 (染色體數量, 最大長度) 的索引矩陣。
+        * :lengths: (numpy.ndarray of int) 每個染色體的長度。
+    """
+    lengths = np.fromiter((len(chromosome) for chromosome in chromosomes), dtype=np.int64, count=len(chromosomes))
+    width = int(lengths.max()) if len(chromosomes) else 0
+    index_matrix = np.full((len(chromosomes), width), PADDING_INDEX, dtype=np.int64)
+    for row, chromosome in enumerate(chromosomes):
+        if gene_index is None:
+            index_matrix[row, :len(chromosome)] = chromosome
+        else:
+            index_matrix[row, :len(chromosome)] = [gene_index[freeze_gene(gen)] for gen in chromosome]
+    return index_matrix, lengths
+
+
+def evaluate_batch(batch_fitness, chromosomes, batch_fitness_format, gene_index=None):
+    """
+    此函數調用批量適應度函數並返回適應度值。
+
+    :param batch_fitness: (function) 批量適應度函數。如果格式是 'list'，它接收染色體列表（batch_fitness(chromosomes)）；如果格式是 'index_matrix'，它接收索引矩陣和長度數組（batch_fitness(index_matrix, lengths)）。它必須返回每個染色體的適應度值（列表或 NumPy 數組）。
+    :param chromosomes: (list of lists) 要評估的染色體列表。
+    :param batch_fitness_format: (str) 'list' 或 'index_matrix'。
+    :param gene_index: (dict) 基因 -> 索引的字典（見 build_gene_index），僅用於 'index_matrix' 格式。如果為 None，則染色體已經是索引的列表。
+    :return:
+        * (list of float) 按順序排列的適應度值。
+    """
+    if not chromosomes:
+        return []
+    if batch_fitness_format == 'list':
+        values = batch_fitness(chromosomes)
+    elif batch_fitness_format == 'index_matrix':
+        index_matrix, lengths = build_index_matrix(chromosomes, gene_index)
+        values = batch_fitness(index_matrix, lengths)
+    else:
+        raise ValueError("批量適應度的格式必須是 'list' 或 'index_matrix'。")
+    values = np.asarray(values)
+    if values.ndim != 1 or len(values) != len(chromosomes):
+        raise ValueError('批量適應度函數必須為每個染色體返回一個適應度值（收到 {} 個染色體，返回的形狀為 {}）。'.format(len(chromosomes), values.shape))
+    return values.tolist()  # 轉換為 Python 的 int 或 float
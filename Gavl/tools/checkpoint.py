@@ -0,0 +1,52 @@
+"""
+In this file it is defined the functions to save and load the checkpoints of an optimization. A checkpoint is a dictionary with the state of the run (population, fitness values, counters, termination state and random state) serialized with pickle and compressed with zlib. The file is written atomically (to a temporary file in the same folder that then replaces the checkpoint with os.replace), so a run that dies while writing never leaves a corrupted checkpoint.
+
+Functions:
+    save_checkpoint: Writes the state of a run to a checkpoint file.
+    load_checkpoint: Reads the state of a run from a checkpoint file.
+"""
+import os
+import pickle
+import zlib
+
+CHECKPOINT_HEADER = b'GAVLCKPT'  # 檢查點文件的開頭，用於識別文件格式
+CHECKPOINT_VERSION = 1  # 檢查點格式的版本
+
+
+def save_checkpoint(path, state):
+    """
+    此函數將運行的狀態寫入檢查點文件。首先寫入同一文件夾中的臨時文件，然後以 os.replace 原子地替換檢查點，所以即使寫入時進程中斷，舊的檢查點也保持完整。
+
+    :param path: (str) 檢查點文件的路徑。
+    :param state: (dict) 運行的狀態（必須可以被序列化）。
+    """
+    data = CHECKPOINT_HEADER + bytes([CHECKPOINT_VERSION]) + zlib.compress(pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL))
+    temporary_path = '{}.{}.tmp'.format(path, os.getpid())
+    try:
+        with open(temporary_path, 'wb') as file:
+            file.write(data)
+            file.flush()
+            os.fsync(file.fileno())  # 確保在替換之前數據已寫入磁盤
+        os.replace(temporary_path, path)
+    except BaseException:
+        if os.path.exists(temporary_path):
+            os.remove(temporary_path)
+        raise
+
+
+def load_checkpoint(path):
+    """
+    此函數從檢查點文件讀取運行的狀態。
+
+    :param path: (str) 檢查點文件的路徑。
+    :return:
+        * (dict) 運行的狀態。
+    """
+    with open(path, 'rb') as file:
+        data = file.read()
+    if not data.startswith(CHECKPOINT_HEADER):
+        raise ValueError('文件 {} 不是 Gavl 的檢查點。'.format(path))
+    version = data[len(CHECKPOINT_HEADER)]
+    if version != CHECKPOINT_VERSION:
+        raise ValueError('檢查點 {} 的版本（{}）不受支持（支持的版本是 {}）。'.format(path, version, CHECKPOINT_VERSION))
+    return pickle.loads(zlib.decompress(data[len(CHECKPOINT_HEADER) + 1:]))
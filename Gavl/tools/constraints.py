@@ -0,0 +1,419 @@
+"""
+In this file it is defined the declarative constraints that a chromosome must satisfy. Unlike the opaque function check_valid_individual, the constraints know which genes cause a violation, so they are checked incrementally (each constraint keeps a small state that is updated in O(1) when a gene is added or removed) and a chromosome that violates them is repaired greedily instead of being discarded.
+
+Classes:
+    :Constraint: Base class of the constraints.
+    :WeightedCapacity: The sum of the weights of the genes must not exceed a capacity (e.g. knapsack).
+    :ForbiddenPairs: Some pairs of genes cannot be together in the same chromosome.
+    :RequiredGenes: Some genes must be in every chromosome.
+    :MaxCount: Maximum number of copies of each gene in a chromosome.
+    :ConstraintSet: Group of constraints, with the incremental checks and the greedy repair operator.
+    :ConstrainedCheck: Function that checks the constraints and the function check_valid_individual.
+    :RepairingGenerator: Wraps a function that generates new chromosomes so that they are repaired.
+
+Functions:
+    always_valid: Default check_valid_individual (every chromosome is valid).
+"""
+import random
+from collections import Counter
+from .aux_functions.canonical import freeze_gene
+from .aux_functions.parameters import accepts_parameter
+
+
+def always_valid(chromosome):
+    """
+    默認的 check_valid_individual：所有染色體都有效。它是模組級的函數（而不是 lambda），所以可以被序列化並發送到評估器的進程（例如 'initialization_parallel_validation' = 1 與 'evaluator' = 'process'）。
+
+    :param chromosome: (list of genes) 染色體。
+    :return:
+        * (bool) 總是 True。
+    """
+    return True
+
+
+class Constraint:
+    """ 約束的基類。每個約束有一個狀態（從空染色體開始），當添加或移除一個基因時以 O(1) 更新，並返回違反的程度（0 表示滿足約束）。 """
+
+    def initial_state(self):
+        """ 返回空染色體的狀態。 """
+        raise NotImplementedError
+
+    def add_gene(self, state, gene):
+        """ 更新狀態（原地）：向染色體添加一個基因。
+
+        :param state: 約束的狀態。
+        :param gene: (hashable) 凍結的基因（見 freeze_gene）。
+        """
+        raise NotImplementedError
+
+    def remove_gene(self, state, gene):
+        """ 更新狀態（原地）：從染色體移除一個基因。
+
+        :param state: 約束的狀態。
+        :param gene: (hashable) 凍結的基因（見 freeze_gene）。
+        """
+        raise NotImplementedError
+
+    def violation(self, state):
+        """ 返回違反約束的程度（大於或等於 0 的數字，0 表示滿足約束）。
+
+        :param state: 約束的狀態。
+        :return:
+            * (number) 違反的程度。
+        """
+        raise NotImplementedError
+
+    def can_remove(self, state, gene):
+        """ 返回修復時是否可以移除一個（凍結的）基因（默認可以）。
+
+        :param state: 約束的狀態。
+        :param gene: (hashable) 凍結的基因（見 freeze_gene）。
+        :return:
+            * (bool) 如果可以移除，則為 True。
+        """
+        return True
+
+    def genes_to_add(self, state):
+        """ 返回修復時應該添加的基因（默認沒有）。
+
+        :param state: 約束的狀態。
+        :return:
+            * (list) 基因列表。
+        """
+        return []
+
+    def encode(self, encode_gene):
+        """ 返回一個等價的約束，其中基因被替換為它們的整數索引（用於 'gene_encoding' = 'index' 或位集和計數向量表示）。
+
+        :param encode_gene: (function) 接收一個基因並返回其索引的函數。
+        :return:
+            * (Constraint) 編碼後的約束。
+        """
+        raise NotImplementedError
+
+
+class WeightedCapacity(Constraint):
+    """ 容量約束：染色體中基因的重量之和不能超過容量（例如背包問題）。 """
+
+    def __init__(self, weights, capacity, default_weight=0):
+        """ 構造函數。
+
+        :param weights: (dict) 基因 ---> 重量。
+        :param capacity: (number) 最大允許的重量之和。
+        :param default_weight: (number) 不在 weights 中的基因的重量。默認為 0。
+        """
+        self.weights = {freeze_gene(gene): weight for gene, weight in weights.items()}
+        self.capacity = capacity
+        self.default_weight = default_weight
+
+    def initial_state(self):
+        return [0]  # 重量之和
+
+    def add_gene(self, state, gene):
+        state[0] += self.weights.get(gene, self.default_weight)
+
+    def remove_gene(self, state, gene):
+        state[0] -= self.weights.get(gene, self.default_weight)
+
+    def violation(self, state):
+        return max(0, state[0] - self.capacity)
+
+    def encode(self, encode_gene):
+        encoded = WeightedCapacity({}, self.capacity, self.default_weight)
+        encoded.weights = {encode_gene(gene): weight for gene, weight in self.weights.items()}
+        return encoded
+
+
+class ForbiddenPairs(Constraint):
+    """ 禁止的基因對：每一對中的兩個基因不能同時在染色體中。 """
+
+    def __init__(self, pairs):
+        """ 構造函數。
+
+        :param pairs: (list of tuples) 禁止的基因對 [(gene_a, gene_b), ...]。
+        """
+        self.neighbours = {}  # 基因 ---> 不能與它同時出現的基因集合
+        for gene_a, gene_b in pairs:
+            gene_a, gene_b = freeze_gene(gene_a), freeze_gene(gene_b)
+            self.neighbours.setdefault(gene_a, set()).add(gene_b)
+            self.neighbours.setdefault(gene_b, set()).add(gene_a)
+
+    def initial_state(self):
+        return {'counts': Counter(), 'violations': 0}  # 禁止基因的副本數量和染色體中禁止的對的數量
+
+    def add_gene(self, state, gene):
+        neighbours = self.neighbours.get(gene)
+        if neighbours:
+            counts = state['counts']
+            state['violations'] += sum(counts[neighbour] for neighbour in neighbours)
+            counts[gene] += 1
+
+    def remove_gene(self, state, gene):
+        neighbours = self.neighbours.get(gene)
+        if neighbours:
+            counts = state['counts']
+            counts[gene] -= 1
+            state['violations'] -= sum(counts[neighbour] for neighbour in neighbours)
+
+    def violation(self, state):
+        return state['violations']
+
+    def encode(self, encode_gene):
+        encoded = ForbiddenPairs([])
+        encoded.neighbours = {encode_gene(gene): {encode_gene(neighbour) for neighbour in neighbours} for gene, neighbours in self.neighbours.items()}
+        return encoded
+
+
+class RequiredGenes(Constraint):
+    """ 必需的基因：這些基因必須在每個染色體中。 """
+
+    def __init__(self, genes):
+        """ 構造函數。
+
+        :param genes: (list) 必需的基因。
+        """
+        self.genes = list(genes)
+        self._frozen_genes = [freeze_gene(gene) for gene in self.genes]
+        self._genes_set = set(self._frozen_genes)
+
+    def initial_state(self):
+        return {'counts': Counter(), 'missing': len(self._genes_set)}  # 必需基因的副本數量和缺少的必需基因數量
+
+    def add_gene(self, state, gene):
+        if gene in self._genes_set:
+            state['counts'][gene] += 1
+            if state['counts'][gene] == 1:
+                state['missing'] -= 1
+
+    def remove_gene(self, state, gene):
+        if gene in self._genes_set:
+            state['counts'][gene] -= 1
+            if state['counts'][gene] == 0:
+                state['missing'] += 1
+
+    def violation(self, state):
+        return state['missing']
+
+    def can_remove(self, state, gene):
+        return gene not in self._genes_set or state['counts'][gene] > 1  # 不移除必需基因的最後一個副本
+
+    def genes_to_add(self, state):
+        return [gene for gene, frozen_gene in zip(self.genes, self._frozen_genes) if state['counts'][frozen_gene] == 0]
+
+    def encode(self, encode_gene):
+        return RequiredGenes([encode_gene(gene) for gene in self.genes])
+
+
+class MaxCount(Constraint):
+    """ 每個基因的最大副本數量（用於允許重複基因的情況）。 """
+
+    def __init__(self, max_counts, default_max_count=None):
+        """ 構造函數。
+
+        :param max_counts: (dict or int) 基因 ---> 最大副本數量，或所有基因的最大副本數量（整數）。
+        :param default_max_count: (int or None) 不在 max_counts 中的基因的最大副本數量。None 表示沒有限制。默認為 None。
+        """
+        if isinstance(max_counts, int):
+            self.max_counts = {}
+            self.default_max_count = max_counts
+        else:
+            self.max_counts = {freeze_gene(gene): max_count for gene, max_count in max_counts.items()}
+            self.default_max_count = default_max_count
+
+    def _max_count(self, gene):
+        return self.max_counts.get(gene, self.default_max_count)
+
+    def initial_state(self):
+        return {'counts': Counter(), 'excess': 0}  # 每個基因的副本數量和超出的副本總數
+
+    def add_gene(self, state, gene):
+        max_count = self._max_count(gene)
+        if max_count is not None:
+            if state['counts'][gene] >= max_count:
+                state['excess'] += 1
+            state['counts'][gene] += 1
+
+    def remove_gene(self, state, gene):
+        max_count = self._max_count(gene)
+        if max_count is not None:
+            state['counts'][gene] -= 1
+            if state['counts'][gene] >= max_count:
+                state['excess'] -= 1
+
+    def violation(self, state):
+        return state['excess']
+
+    def encode(self, encode_gene):
+        encoded = MaxCount({}, self.default_max_count)
+        encoded.max_counts = {encode_gene(gene): max_count for gene, max_count in self.max_counts.items()}
+        return encoded
+
+
+class ConstraintSet:
+    """ 一組約束。它計算染色體的狀態，增量地更新它們，並提供貪婪的修復算子。 """
+
+    def __init__(self, constraints):
+        """ 構造函數。
+
+        :param constraints: (list of Constraint) 約束列表。
+        """
+        self.constraints = list(constraints)
+
+    def state(self, chromosome):
+        """ 返回染色體的狀態（每個約束一個）。
+
+        :param chromosome: (list of genes) 染色體。
+        :return:
+            * (list) 狀態列表。
+        """
+        states = [constraint.initial_state() for constraint in self.constraints]
+        for gene in chromosome:
+            self.add_gene(states, freeze_gene(gene))
+        return states
+
+    def add_gene(self, states, gene):
+        """ 更新所有狀態：添加一個（凍結的）基因。 """
+        for constraint, state in zip(self.constraints, states):
+            constraint.add_gene(state, gene)
+
+    def remove_gene(self, states, gene):
+        """ 更新所有狀態：移除一個（凍結的）基因。 """
+        for constraint, state in zip(self.constraints, states):
+            constraint.remove_gene(state, gene)
+
+    def violation(self, states):
+        """ 返回所有約束的違反程度之和（0 表示滿足所有約束）。 """
+        return sum(constraint.violation(state) for constraint, state in zip(self.constraints, states))
+
+    def is_satisfied(self, chromosome):
+        """ 返回染色體是否滿足所有約束。
+
+        :param chromosome: (list of genes) 染色體。
+        :return:
+            * (bool) 如果滿足所有約束，則為 True。
+        """
+        return self.violation(self.state(chromosome)) == 0
+
+    def can_remove(self, states, gene):
+        """ 返回修復時是否可以移除一個（凍結的）基因（所有約束都允許）。 """
+        return all(constraint.can_remove(state, gene) for constraint, state in zip(self.constraints, states))
+
+    def can_add(self, states, gene):
+        """ 返回添加一個（凍結的）基因後是否仍然滿足所有約束（狀態不變）。 """
+        self.add_gene(states, gene)
+        satisfied = self.violation(states) == 0
+        self.remove_gene(states, gene)
+        return satisfied
+
+    def repair(self, chromosome, possible_genes, min_length_chromosome, max_length_chromosome, repeated_genes_allowed, rng=random):
+        """
+        貪婪的修復算子。首先添加缺少的必需基因，然後每次移除使違反程度最小的基因（約束不允許移除的基因除外，例如必需基因）（直到滿足所有約束並且長度不超過最大長度），
+        最後如果染色體太短，則添加不違反約束的隨機基因。每一步使用增量的狀態更新，所以成本與染色體長度成正比（而不是重新檢查整個染色體）。
+
+        :param chromosome: (list of genes) 要修復的染色體（不會被修改）。
+        :param possible_genes: (list of genes) 所有可能的基因。
+        :param min_length_chromosome: (int) 染色體的最小允許長度。
+        :param max_length_chromosome: (int) 染色體的最大允許長度。
+        :param repeated_genes_allowed: (int) 是否允許基因重複（1）或不允許（0）。
+        :param rng: (random.Random) 隨機數生成器。默認為 random 模組。
+        :return:
+            * (list of genes or None) 修復後的染色體，如果無法修復則為 None。
+        """
+        chromosome = list(chromosome)
+        frozen_chromosome = [freeze_gene(gene) for gene in chromosome]
+        states = self.state(chromosome)
+        # 1. 添加缺少的必需基因：
+        for constraint, state in zip(self.constraints, states):
+            for gene in constraint.genes_to_add(state):
+                frozen_gene = freeze_gene(gene)
+                chromosome.append(gene)
+                frozen_chromosome.append(frozen_gene)
+                self.add_gene(states, frozen_gene)
+        # 2. 貪婪地移除基因：
+        current_violation = self.violation(states)
+        while current_violation > 0 or len(chromosome) > max_length_chromosome:
+            best_positions, best_violation = [], None
+            tested = {}  # 凍結的基因 ---> 移除後的違反程度（相同的基因只測試一次）
+            for position, frozen_gene in enumerate(frozen_chromosome):
+                if frozen_gene not in tested:
+                    if self.can_remove(states, frozen_gene):
+                        self.remove_gene(states, frozen_gene)
+                        tested[frozen_gene] = self.violation(states)
+                        self.add_gene(states, frozen_gene)
+                    else:
+                        tested[frozen_gene] = None
+                new_violation = tested[frozen_gene]
+                if new_violation is None:
+                    continue
+                if best_violation is None or new_violation < best_violation:
+                    best_positions, best_violation = [position], new_violation
+                elif new_violation == best_violation:
+                    best_positions.append(position)
+            if best_violation is None or (best_violation >= current_violation and len(chromosome) <= max_length_chromosome):
+                return None  # 移除任何基因都不能減少違反程度
+            position = rng.choice(best_positions)
+            self.remove_gene(states, frozen_chromosome[position])
+            chromosome[position], frozen_chromosome[position] = chromosome[-1], frozen_chromosome[-1]
+            chromosome.pop()
+            frozen_chromosome.pop()
+            current_violation = best_violation
+        # 3. 添加不違反約束的隨機基因，直到達到最小長度：
+        chromosome_genes = set(frozen_chromosome)
+        attempts = 0
+        while len(chromosome) < min_length_chromosome:
+            attempts += 1
+            if attempts > 100 * min_length_chromosome + len(possible_genes):
+                return None  # 找不到可以添加的基因
+            gene = possible_genes[rng.randrange(len(possible_genes))]
+            frozen_gene = freeze_gene(gene)
+            if (repeated_genes_allowed or frozen_gene not in chromosome_genes) and self.can_add(states, frozen_gene):
+                chromosome.append(gene)
+                chromosome_genes.add(frozen_gene)
+                self.add_gene(states, frozen_gene)
+        return chromosome
+
+    def encode(self, encode_gene):
+        """ 返回一個等價的約束組，其中基因被替換為它們的整數索引。
+
+        :param encode_gene: (function) 接收一個基因並返回其索引的函數。
+        :return:
+            * (ConstraintSet) 編碼後的約束組。
+        """
+        return ConstraintSet([constraint.encode(encode_gene) for constraint in self.constraints])
+
+
+class ConstrainedCheck:
+    """ 檢查染色體是否滿足約束組和函數 check_valid_individual 的可調用對象。它定義在模組層級（而不是使用 lambda），以便能夠被傳送到其他進程。 """
+
+    def __init__(self, constraint_set, check_valid_individual):
+        """ 構造函數。
+
+        :param constraint_set: (ConstraintSet) 約束組。
+        :param check_valid_individual: (function) 用戶的檢查有效性的函數。
+        """
+        self.constraint_set = constraint_set
+        self.check_valid_individual = check_valid_individual
+
+    def __call__(self, chromosome):
+        return self.constraint_set.is_satisfied(chromosome) and self.check_valid_individual(chromosome)
+
+
+class RepairingGenerator:
+    """ 包裝生成新染色體的函數，使生成的染色體被修復（見 ConstraintSet.repair）。如果無法修復，則返回原始的染色體（它將被有效性檢查拒絕）。 """
+
+    def __init__(self, generate_new_chromosome, constraint_set, rng=random):
+        """ 構造函數。
+
+        :param generate_new_chromosome: (function) 生成新染色體的函數（見 Gavl.generate_new_chromosome）。
+        :param constraint_set: (ConstraintSet) 約束組。
+        :param rng: (random.Random) 修復（以及接受關鍵字參數 rng 的生成函數）使用的隨機數生成器。默認為 random 模組。
+        """
+        self.generate_new_chromosome = generate_new_chromosome
+        self.constraint_set = constraint_set
+        self.rng = rng
+        self.generator_kwargs = {'rng': rng} if accepts_parameter(generate_new_chromosome, 'rng') else {}  # 只有當生成函數接受時才傳遞的可選參數
+
+    def __call__(self, min_length_chromosome, max_length_chromosome, possible_genes, repeated_genes_allowed):
+        chromosome = self.generate_new_chromosome(min_length_chromosome, max_length_chromosome, possible_genes, repeated_genes_allowed, **self.generator_kwargs)
+        repaired_chromosome = self.constraint_set.repair(chromosome, possible_genes, min_length_chromosome, max_length_chromosome, repeated_genes_allowed, self.rng)
+        return chromosome if repaired_chromosome is None else repaired_chromosome
@@ -1,19 +1,89 @@
 import random
-from .aux_functions.combinations import combinations  # 引入組合計算功能
+from .aux_functions.random_combinations import random_combination_pairs  # 引入隨機組合抽樣功能
+from .aux_functions.bitset import to_bitset, from_bitset  # 引入位集表示
+from .aux_functions.count_vector import to_counts, from_counts, sample_counts  # 引入計數向量表示
 
 
-def cross_individuals(chromosome_a, chromosome_b, min_length_chromosome, max_length_chromosome, repeated_genes_allowed, check_valid_individual):
+def feasible_size_pairs(length_a, length_b, num_genes_a, num_genes_b, min_length_chromosome, max_length_chromosome):
     """
-    這個函數計算兩個不同個體之間的交叉。它選擇隨機數量的基因從 a 和 b 個體交換，並檢查是否存在可能的交叉大小（使用函數 check_valid_individual 檢查）。
-    如果存在，則隨機選擇一種可能的交叉進行，並返回結果新染色體。如果沒有可能的交叉大小，則測試另一個不同的組合大小。
-    注意，使用函數 check_valid_individual 來測試創建的個體，如果進行了 2000 次不成功的交叉，則認為是無法配對的個體對，並返回它們的原始染色體。
-    
+    這個函數直接從長度限制計算所有可行的交換基因數量對 (num_a, num_b)：從 A 轉移 num_a 個基因到 B，從 B 轉移 num_b 個基因到 A，並且交叉後的兩個個體的長度都在 [min_length_chromosome, max_length_chromosome] 之內。
+    對於每個 num_a，可行的 num_b 是一個連續的區間，所以不需要測試每一對。
+
+    :param length_a: (int) 個體 A 的染色體長度。
+    :param length_b: (int) 個體 B 的染色體長度。
+    :param num_genes_a: (int) A 中可交換的基因數量（num_a 的最大值）。
+    :param num_genes_b: (int) B 中可交換的基因數量（num_b 的最大值）。
+    :param min_length_chromosome: (int) 染色體的最小基因數。
+    :param max_length_chromosome: (int) 染色體的最大基因數。
+    :return:
+        * :size_pairs: (list of tuples of int) 所有可行的 (num_a, num_b)。
+    """
+    size_pairs = []
+    for num_a in range(1, num_genes_a + 1):
+        # A 的新長度 = length_a - num_a + num_b，B 的新長度 = length_b - num_b + num_a
+        min_num_b = max(1, min_length_chromosome - length_a + num_a, length_b + num_a - max_length_chromosome)
+        max_num_b = min(num_genes_b, max_length_chromosome - length_a + num_a, length_b + num_a - min_length_chromosome)
+        size_pairs.extend((num_a, num_b) for num_b in range(min_num_b, max_num_b + 1))
+    return size_pairs
+
+
+def sample_genes_to_swap(genes_a, genes_b, size_pairs, rng=random):
+    """
+    生成器，返回要交換的基因組合對 (genes_change_a, genes_change_b)。每次隨機選擇一對可行的交換基因數量，然後隨機選擇（不重複的）基因組合，
+    所以所有的數量對都有機會被測試，而不是在第一對上用完所有的嘗試次數。當所有數量對的所有組合都已返回時，生成器結束。
+
+    :param genes_a: (list) A 中可交換的基因。
+    :param genes_b: (list) B 中可交換的基因。
+    :param size_pairs: (list of tuples of int) 可行的 (num_a, num_b)（見 feasible_size_pairs）。
+    :param rng: (random.Random) 隨機數生成器。默認為 random 模組。
+    :return:
+        * :generator: 基因組合對的生成器。
+    """
+    size_pairs = list(size_pairs)
+    combinations_by_size = {}  # (num_a, num_b) ---> 該數量對的隨機組合生成器
+    while size_pairs:
+        position = rng.randrange(len(size_pairs))
+        size_pair = size_pairs[position]
+        if size_pair not in combinations_by_size:
+            combinations_by_size[size_pair] = random_combination_pairs(genes_a, size_pair[0], genes_b, size_pair[1], unique=True, rng=rng)
+        try:
+            yield next(combinations_by_size[size_pair])
+        except StopIteration:  # 這個數量對的所有組合都已測試過
+            size_pairs[position] = size_pairs[-1]
+            size_pairs.pop()
+            del combinations_by_size[size_pair]
+
+
+def update_crossover_stats(crossover_stats, attempts, invalid, no_op):
+    """
+    這個函數更新交叉的計數器（如果有的話）。
+
+    :param crossover_stats: (dict or None) 計數器的字典，包含 'attempts'（嘗試的交叉次數）、'invalid'（產生無效個體的嘗試次數）和 'no_op'（返回原始染色體的交叉次數）。
+    :param attempts: (int) 嘗試的交叉次數。
+    :param invalid: (int) 產生無效個體的嘗試次數。
+    :param no_op: (int) 返回原始染色體的交叉次數。
+    """
+    if crossover_stats is not None:
+        crossover_stats['attempts'] = crossover_stats.get('attempts', 0) + attempts
+        crossover_stats['invalid'] = crossover_stats.get('invalid', 0) + invalid
+        crossover_stats['no_op'] = crossover_stats.get('no_op', 0) + no_op
+
+
+def cross_individuals(chromosome_a, chromosome_b, min_length_chromosome, max_length_chromosome, repeated_genes_allowed, check_valid_individual, max_attempts=2000, crossover_stats=None, rng=random):
+    """
+    這個函數計算兩個不同個體之間的交叉。它首先計算所有滿足長度限制的交換基因數量對 (num_a, num_b)，然後在它們之中隨機抽樣，並隨機抽取（不重複的）要交換的基因組合，
+    直到找到一個有效的交叉（使用函數 check_valid_individual 檢查），並返回結果新染色體。
+    注意，如果進行了 max_attempts 次不成功的交叉（或所有可能的交叉都已測試過），則認為是無法配對的個體對，並返回它們的原始染色體。
+
     :param chromosome_a: (list) 個體 A 的染色體。
     :param chromosome_b: (list) 個體 B 的染色體。
     :param min_length_chromosome: (int) 染色體的最小基因數。
     :param max_length_chromosome: (int) 染色體的最大基因數。
     :param repeated_genes_allowed: (int) 表示個體是否可以有重複基因的布爾值，1 表示允許重複基因，0 表示不允許。
     :param check_valid_individual: (function) 函數接收一個染色體並返回一個布爾值，指出這個染色體是否構成一個有效的個體（True）或不（False）。
+    :param max_attempts: (int) 每對個體的最大交叉嘗試次數。默認為 2000。
+    :param crossover_stats: (dict or None) 交叉的計數器（見 update_crossover_stats）。默認為 None。
+    :param rng: (random.Random) 隨機數生成器。默認為 random 模組。
     :return:
         * :crossed_a: (list) 交叉後的個體 A。
         * :crossed_b: (list) 交叉後的個體 B。
@@ -24,41 +94,28 @@ def cross_individuals(chromosome_a, chromosome_b, min_length_chromosome, max_len
     else:  # 不允許重複基因
         genes_a = [gen for gen in chromosome_a if gen not in chromosome_b]  # 從 A 中選擇不在 B 中的基因
         genes_b = [gen for gen in chromosome_b if gen not in chromosome_a]  # 從 B 中選擇不在 A 中的基因
-    random.shuffle(genes_a)  # 隨機打亂 A 的基因順序
-    random.shuffle(genes_b)  # 隨機打亂 B 的基因順序
-    number_of_genes_to_change_a = list(range(1, len(genes_a) + 1))  # A 的可交換基因數量列表
-    random.shuffle(number_of_genes_to_change_a)  # 隨機打亂 A 的交換基因數量
+    size_pairs = feasible_size_pairs(len(chromosome_a), len(chromosome_b), len(genes_a), len(genes_b), min_length_chromosome, max_length_chromosome)  # 所有滿足長度限制的 (num_a, num_b)
     count_crossover_tried = 0  # 試圖交叉的次數計數器
-    for num_a in number_of_genes_to_change_a:  # 從 A 中隨機選擇基因數進行交換
-        number_of_genes_to_change_b = list(range(1, len(genes_b) + 1))  # B 的可交換基因數量列表
-        random.shuffle(number_of_genes_to_change_b)  # 隨機打亂 B 的交換基因數量
-        for num_b in number_of_genes_to_change_b:  # 從 B 中隨機選擇基因數進行交換
-            if min_length_chromosome <= len(chromosome_a) - num_a + num_b <= max_length_chromosome and min_length_chromosome <= len(chromosome_b) - num_b + num_a <= max_length_chromosome:  # 確保交叉後的個體在染色體長度限制內
-                genes_a_combinations = combinations(genes_a, num_a)  # 從 A 中選擇的基因組合
-                for genes_change_a in genes_a_combinations:
-                    genes_b_combinations = combinations(genes_b, num_b)  # 從 B 中選擇的基因組合
-                    for genes_change_b in genes_b_combinations:
-                        count_crossover_tried += 1
-                        crossed_a = chromosome_a.copy()
-                        crossed_b = chromosome_b.copy()
-                        for gen in genes_change_a:
-                            crossed_a.remove(gen)
-                            crossed_b.append(gen)
-                        for gen in genes_change_b:
-                            crossed_b.remove(gen)
-                            crossed_a.append(gen)
-                        if not check_valid_individual(crossed_b):
-                            break  # 如果 B 的任何基因組合都不能構成有效個體，則跳出，嘗試 A 的其他基因組合
-                        if check_valid_individual(crossed_a):  # 如果 A 的某個組合有效
-                            return crossed_a, crossed_b
-                        if count_crossover_tried >= 2000:
-                            return chromosome_a, chromosome_b  # 如果試圖交叉 2000 次均失敗，則返回原始染色體
-            else:
-                break  # 如果結果個體不在染色體長度限制內，則嘗試其他組合
+    for genes_change_a, genes_change_b in sample_genes_to_swap(genes_a, genes_b, size_pairs, rng):
+        count_crossover_tried += 1
+        crossed_a = chromosome_a.copy()
+        crossed_b = chromosome_b.copy()
+        for gen in genes_change_a:
+            crossed_a.remove(gen)
+            crossed_b.append(gen)
+        for gen in genes_change_b:
+            crossed_b.remove(gen)
+            crossed_a.append(gen)
+        if check_valid_individual(crossed_b) and check_valid_individual(crossed_a):  # 如果兩個交叉後的個體都有效
+            update_crossover_stats(crossover_stats, count_crossover_tried, count_crossover_tried - 1, 0)
+            return crossed_a, crossed_b
+        if count_crossover_tried >= max_attempts:
+            break  # 如果試圖交叉 max_attempts 次均失敗，則返回原始染色體
+    update_crossover_stats(crossover_stats, count_crossover_tried, count_crossover_tried, 1)
     return chromosome_a, chromosome_b  # 如果沒有可能的交叉，則返回兩個原始個體
 
 
-def mating(list_of_paired_ind, min_length_chromosome, max_length_chromosome, repeated_genes_allowed, check_valid_individual):
+def mating(list_of_paired_ind, min_length_chromosome, max_length_chromosome, repeated_genes_allowed, check_valid_individual, max_attempts=2000, crossover_stats=None, rng=random):
     """
     這個函數返回當可能進行配對時的配對個體。如果所有組合都導致無效的個體（例如，如果 repeated_genes_allowed = 0 且兩個個體完全相同），則返回原本打算配對的兩個個體。
     
@@ -67,12 +124,145 @@ def mating(list_of_paired_ind, min_length_chromosome, max_length_chromosome, rep
     :param max_length_chromosome: (int) 染色體的最大基因數。
     :param repeated_genes_allowed: (int) 表示個體是否可以有重複基因的布爾值，1 表示允許重複基因，0 表示不允許。
     :param check_valid_individual: (function) 函數接收一個染色體並返回一個布爾值，指出這個染色體是否構成一個有效的個體（True）或不（False）。
+    :param max_attempts: (int) 每對個體的最大交叉嘗試次數。默認為 2000。
+    :param crossover_stats: (dict or None) 交叉的計數器（見 update_crossover_stats），由所有配對累加。默認為 None。
+    :param rng: (random.Random) 隨機數生成器。默認為 random 模組。
+    :return:
+        * :crossed_individuals: (list of lists) 交叉後個體的染色體列表。
+    """
+    crossed_individuals = []  # 輸出 ---> 交叉後個體的列表。
+    for (chromosome_a, chromosome_b) in list_of_paired_ind:
+        crossed_a, crossed_b = cross_individuals(chromosome_a=chromosome_a, chromosome_b=chromosome_b, min_length_chromosome=min_length_chromosome, max_length_chromosome=max_length_chromosome, repeated_genes_allowed=repeated_genes_allowed, check_valid_individual=check_valid_individual, max_attempts=max_attempts, crossover_stats=crossover_stats, rng=rng)
+        crossed_individuals.append(crossed_a)
+        crossed_individuals.append(crossed_b)
+    return crossed_individuals  # 返回交叉後的個體列表
+
+
+def cross_individuals_bitset(chromosome_a, chromosome_b, min_length_chromosome, max_length_chromosome, check_valid_individual, max_attempts=2000, crossover_stats=None, rng=random):
+    """
+    這個函數與 cross_individuals 相同（不允許重複基因的情況），但是可交換基因的計算（集合差）使用位集（見 aux_functions/bitset.py）：每對個體只轉換一次，然後每次嘗試的交叉後個體由父代的列表減去交換的基因再加上換入的基因構造（成本與染色體長度成正比，與可能的基因數量無關），並且由小到大排序。
+    注意染色體必須是基因的整數索引列表（見 'gene_encoding'）。當染色體相對於可能的基因數量較密集時（例如幾千個可能的基因）應選擇位集表示；對於非常大的字母表和短的染色體，列表表示（'large_alphabet' = 1）更快。
+
+    :param chromosome_a: (list of int) 個體 A 的染色體。
+    :param chromosome_b: (list of int) 個體 B 的染色體。
+    :param min_length_chromosome: (int) 染色體的最小基因數。
+    :param max_length_chromosome: (int) 染色體的最大基因數。
+    :param check_valid_individual: (function) 函數接收一個染色體並返回一個布爾值，指出這個染色體是否構成一個有效的個體（True）或不（False）。
+    :param max_attempts: (int) 每對個體的最大交叉嘗試次數。默認為 2000。
+    :param crossover_stats: (dict or None) 交叉的計數器（見 update_crossover_stats）。默認為 None。
+    :param rng: (random.Random) 隨機數生成器。默認為 random 模組。
+    :return:
+        * :crossed_a: (list of int) 交叉後的個體 A。
+        * :crossed_b: (list of int) 交叉後的個體 B。
+    """
+    bitset_a = to_bitset(chromosome_a)
+    bitset_b = to_bitset(chromosome_b)
+    common = bitset_a & bitset_b  # 共同的基因（A ^ common 等於 A & ~B，但不需要構造負的大整數）
+    genes_a = from_bitset(bitset_a ^ common)  # 從 A 中選擇不在 B 中的基因
+    genes_b = from_bitset(bitset_b ^ common)  # 從 B 中選擇不在 A 中的基因
+    size_pairs = feasible_size_pairs(len(chromosome_a), len(chromosome_b), len(genes_a), len(genes_b), min_length_chromosome, max_length_chromosome)  # 所有滿足長度限制的 (num_a, num_b)
+    count_crossover_tried = 0  # 試圖交叉的次數計數器
+    for genes_change_a, genes_change_b in sample_genes_to_swap(genes_a, genes_b, size_pairs, rng):
+        count_crossover_tried += 1
+        change_a = set(genes_change_a)
+        change_b = set(genes_change_b)
+        crossed_b = sorted([gene for gene in chromosome_b if gene not in change_b] + list(genes_change_a))  # B - 交換的 B 基因 + 交換的 A 基因（O(長度)，不解碼位集）
+        if check_valid_individual(crossed_b):
+            crossed_a = sorted([gene for gene in chromosome_a if gene not in change_a] + list(genes_change_b))  # A - 交換的 A 基因 + 交換的 B 基因
+            if check_valid_individual(crossed_a):  # 如果兩個交叉後的個體都有效
+                update_crossover_stats(crossover_stats, count_crossover_tried, count_crossover_tried - 1, 0)
+                return crossed_a, crossed_b
+        if count_crossover_tried >= max_attempts:
+            break  # 如果試圖交叉 max_attempts 次均失敗，則返回原始染色體
+    update_crossover_stats(crossover_stats, count_crossover_tried, count_crossover_tried, 1)
+    return chromosome_a, chromosome_b  # 如果沒有可能的交叉，則返回兩個原始個體
+
+
+def mating_bitset(list_of_paired_ind, min_length_chromosome, max_length_chromosome, repeated_genes_allowed, check_valid_individual, max_attempts=2000, crossover_stats=None, rng=random):
+    """
+    這個函數與 mating 相同，但是使用位集表示（見 cross_individuals_bitset）。它只能用於不允許重複基因的情況，並且染色體必須是基因的整數索引列表。
+
+    :param list_of_paired_ind: (list of tuples of lists) 配對個體的染色體列表。
+    :param min_length_chromosome: (int) 染色體的最小基因數。
+    :param max_length_chromosome: (int) 染色體的最大基因數。
+    :param repeated_genes_allowed: (int) 必須為 0（不允許重複基因）。
+    :param check_valid_individual: (function) 函數接收一個染色體並返回一個布爾值，指出這個染色體是否構成一個有效的個體（True）或不（False）。
+    :param max_attempts: (int) 每對個體的最大交叉嘗試次數。默認為 2000。
+    :param crossover_stats: (dict or None) 交叉的計數器（見 update_crossover_stats），由所有配對累加。默認為 None。
+    :param rng: (random.Random) 隨機數生成器。默認為 random 模組。
+    :return:
+        * :crossed_individuals: (list of lists) 交叉後個體的染色體列表。
+    """
+    if repeated_genes_allowed:
+        raise ValueError('位集表示只能用於不允許重複基因的情況（repeated_genes_allowed = 0）。')
+    crossed_individuals = []  # 輸出 ---> 交叉後個體的列表。
+    for (chromosome_a, chromosome_b) in list_of_paired_ind:
+        crossed_a, crossed_b = cross_individuals_bitset(chromosome_a=chromosome_a, chromosome_b=chromosome_b, min_length_chromosome=min_length_chromosome, max_length_chromosome=max_length_chromosome, check_valid_individual=check_valid_individual, max_attempts=max_attempts, crossover_stats=crossover_stats, rng=rng)
+        crossed_individuals.append(crossed_a)
+        crossed_individuals.append(crossed_b)
+    return crossed_individuals  # 返回交叉後的個體列表
+
+
+def cross_individuals_counts(chromosome_a, chromosome_b, min_length_chromosome, max_length_chromosome, check_valid_individual, max_attempts=2000, crossover_stats=None, rng=random):
+    """
+    這個函數計算兩個允許重複基因的個體之間的交叉，染色體被表示為計數向量（見 aux_functions/count_vector.py）。它隨機選擇一對滿足長度限制的交換基因數量 (num_a, num_b)，
+    從 A 中隨機取 num_a 個基因（子多重集合），從 B 中隨機取 num_b 個基因，然後交叉後的個體通過向量的加減法獲得（長度就是向量的和）。
+    注意染色體必須是基因的整數索引列表（見 'gene_encoding'），如果進行了 max_attempts 次不成功的交叉，則返回它們的原始染色體。
+
+    :param chromosome_a: (list of int) 個體 A 的染色體。
+    :param chromosome_b: (list of int) 個體 B 的染色體。
+    :param min_length_chromosome: (int) 染色體的最小基因數。
+    :param max_length_chromosome: (int) 染色體的最大基因數。
+    :param check_valid_individual: (function) 函數接收一個染色體並返回一個布爾值，指出這個染色體是否構成一個有效的個體（True）或不（False）。
+    :param max_attempts: (int) 每對個體的最大交叉嘗試次數。默認為 2000。
+    :param crossover_stats: (dict or None) 交叉的計數器（見 update_crossover_stats）。默認為 None。
+    :param rng: (random.Random) 隨機數生成器。默認為 random 模組。
+    :return:
+        * :crossed_a: (list of int) 交叉後的個體 A。
+        * :crossed_b: (list of int) 交叉後的個體 B。
+    """
+    number_of_genes = max(max(chromosome_a, default=-1), max(chromosome_b, default=-1)) + 1  # 計數向量的長度
+    counts_a = to_counts(chromosome_a, number_of_genes)
+    counts_b = to_counts(chromosome_b, number_of_genes)
+    size_pairs = feasible_size_pairs(len(chromosome_a), len(chromosome_b), len(chromosome_a), len(chromosome_b), min_length_chromosome, max_length_chromosome)  # 所有滿足長度限制的 (num_a, num_b)
+    if not size_pairs:
+        update_crossover_stats(crossover_stats, 0, 0, 1)
+        return chromosome_a, chromosome_b  # 沒有可能的交叉
+    for count_crossover_tried in range(1, max_attempts + 1):
+        num_a, num_b = rng.choice(size_pairs)
+        change_a = sample_counts(counts_a, num_a, rng)  # 從 A 轉移到 B 的基因
+        change_b = sample_counts(counts_b, num_b, rng)  # 從 B 轉移到 A 的基因
+        crossed_b = from_counts(counts_b - change_b + change_a)
+        if not check_valid_individual(crossed_b):
+            continue
+        crossed_a = from_counts(counts_a - change_a + change_b)
+        if check_valid_individual(crossed_a):
+            update_crossover_stats(crossover_stats, count_crossover_tried, count_crossover_tried - 1, 0)
+            return crossed_a, crossed_b
+    update_crossover_stats(crossover_stats, max_attempts, max_attempts, 1)
+    return chromosome_a, chromosome_b  # 如果試圖交叉 max_attempts 次均失敗，則返回原始染色體
+
+
+def mating_counts(list_of_paired_ind, min_length_chromosome, max_length_chromosome, repeated_genes_allowed, check_valid_individual, max_attempts=2000, crossover_stats=None, rng=random):
+    """
+    這個函數與 mating 相同，但是使用計數向量表示（見 cross_individuals_counts）。它只能用於允許重複基因的情況，並且染色體必須是基因的整數索引列表。
+
+    :param list_of_paired_ind: (list of tuples of lists) 配對個體的染色體列表。
+    :param min_length_chromosome: (int) 染色體的最小基因數。
+    :param max_length_chromosome: (int) 染色體的最大基因數。
+    :param repeated_genes_allowed: (int) 必須為 1（允許重複基因）。
+    :param check_valid_individual: (function) 函數接收一個染色體並返回一個布爾值，指出這個染色體是否構成一個有效的個體（True）或不（False）。
+    :param max_attempts: (int) 每對個體的最大交叉嘗試次數。默認為 2000。
+    :param crossover_stats: (dict or None) 交叉的計數器（見 update_crossover_stats），由所有配對累加。默認為 None。
+    :param rng: (random.Random) 隨機數生成器。默認為 random 模組。
     :return:
         * :crossed_individuals: (list of lists) 交叉後個體的染色體列表。
     """
+    if not repeated_genes_allowed:
+        raise ValueError('計數向量表示只能用於允許重複基因的情況（repeated_genes_allowed = 1）。')
     crossed_individuals = []  # 輸出 ---> 交叉後個體的列表。
     for (chromosome_a, chromosome_b) in list_of_paired_ind:
-        crossed_a, crossed_b = cross_individuals(chromosome_a=chromosome_a, chromosome_b=chromosome_b, min_length_chromosome=min_length_chromosome, max_length_chromosome=max_length_chromosome, repeated_genes_allowed=repeated_genes_allowed, check_valid_individual=check_valid_individual)
+        crossed_a, crossed_b = cross_individuals_counts(chromosome_a=chromosome_a, chromosome_b=chromosome_b, min_length_chromosome=min_length_chromosome, max_length_chromosome=max_length_chromosome, check_valid_individual=check_valid_individual, max_attempts=max_attempts, crossover_stats=crossover_stats, rng=rng)
         crossed_individuals.append(crossed_a)
         crossed_individuals.append(crossed_b)
     return crossed_individuals  # 返回交叉後的個體列表
@@ -0,0 +1,88 @@
+"""
+In this file it is defined the class to encode the genes as integer indices. When this encoding is used, the possible genes are mapped once to their indices in the list of possible genes, all the operators work on lists of ints, and the chromosomes are only decoded back to genes when calling the user functions (fitness, check_valid_individual) or when returning the results.
+
+Classes:
+    :GeneEncoder: Maps the genes to integer indices and vice versa.
+    :DecodedFunction: Wraps a function of a chromosome so that it receives the decoded chromosome.
+"""
+from .aux_functions.canonical import freeze_gene
+from .batch_fitness import build_gene_index
+
+
+class GeneEncoder:
+    """ 基因編碼器類：將 possible_genes 中的基因映射到其索引（整數）。 """
+
+    def __init__(self, possible_genes):
+        """ 構造函數。
+
+        :param possible_genes: (list of ...) 包含所有可能基因值的列表。基因不能重複（否則同一個基因有多個索引，編碼和解碼不一致）。
+        """
+        self.genes = list(possible_genes)  # 索引 -> 基因
+        self.indices = list(range(len(self.genes)))  # 編碼後的可能基因（整數索引）
+        self._gene_index = build_gene_index(self.genes)  # 基因 -> 索引
+        if len(self._gene_index) != len(self.genes):
+            repeated = [gen for i, gen in enumerate(self.genes) if self._gene_index[freeze_gene(gen)] != i]
+            raise ValueError('使用整數索引編碼時，可能的基因列表（possible_genes）不能有重複的基因。重複的基因: {}。'.format(repeated[:10]))
+
+    def encode(self, chromosome):
+        """ 將基因列表編碼為索引列表。
+
+        :param chromosome: (list of genes) 染色體。
+        :return:
+            * (list of int) 編碼後的染色體。
+        """
+        try:
+            return [self._gene_index[freeze_gene(gen)] for gen in chromosome]
+        except KeyError as e:
+            raise ValueError('基因 {} 不在可能的基因列表（possible_genes）中。'.format(e))
+
+    def encode_gene(self, gene):
+        """ 將一個基因編碼為其索引。
+
+        :param gene: (...) 基因（或其凍結的版本，見 freeze_gene）。
+        :return:
+            * (int) 基因的索引。
+        """
+        try:
+            return self._gene_index[freeze_gene(gene)]
+        except KeyError as e:
+            raise ValueError('基因 {} 不在可能的基因列表（possible_genes）中。'.format(e))
+
+    def decode(self, chromosome):
+        """ 將索引列表解碼為基因列表。
+
+        :param chromosome: (list of int) 編碼後的染色體。
+        :return:
+            * (list of genes) 染色體。
+        """
+        genes = self.genes
+        return [genes[i] for i in chromosome]
+
+    def decoded(self, function):
+        """ 包裝一個接收染色體的函數，使其接收解碼後的染色體。
+
+        :param function: (function) 接收染色體（基因列表）的函數，例如適應度函數。
+        :return:
+            * (DecodedFunction) 接收編碼後的染色體的函數。
+        """
+        return DecodedFunction(function, self.genes)
+
+    def __len__(self):
+        return len(self.genes)
+
+
+class DecodedFunction:
+    """ 先解碼染色體再調用原始函數的可調用對象。它定義在模組層級（而不是使用 lambda），以便能夠被傳送到其他進程。 """
+
+    def __init__(self, function, genes):
+        """ 構造函數。
+
+        :param function: (function) 接收染色體（基因列表）的原始函數。
+        :param genes: (list of ...) 索引 -> 基因的列表。
+        """
+        self.function = function
+        self.genes = genes
+
+    def __call__(self, chromosome):
+        genes = self.genes
+        return self.function([genes[i] for i in chromosome])
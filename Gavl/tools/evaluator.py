@@ -0,0 +1,135 @@
+"""
+In this file it is defined the backends used to evaluate the fitness of the population. The evaluation can be done serially, in a pool of threads or in a pool of processes. The pools are persistent: they are created the first time they are used and reused across generations until the method close() is called.
+
+Classes:
+    :SerialEvaluator: Evaluates the chromosomes one after the other in the current thread.
+    :ThreadPoolEvaluator: Evaluates chunks of chromosomes in a pool of threads.
+    :ProcessPoolEvaluator: Evaluates chunks of chromosomes in a pool of processes.
+
+Functions:
+    get_evaluator: Given the name of the backend, returns the evaluator.
+"""
+import os
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+
+def evaluate_chunk(function, chunk):
+    """
+    此函數對一組（chunk）元素調用函數。注意它必須定義在模組層級，以便能夠被傳送到其他進程。
+
+    :param function: (function) 要調用的函數（例如適應度函數）。
+    :param chunk: (list) 元素列表（例如染色體列表）。
+    :return:
+        * (list) 按順序排列的結果列表。
+    """
+    return [function(element) for element in chunk]
+
+
+class SerialEvaluator:
+    """ 串行評估器：在當前線程中逐個評估。 """
+
+    def __init__(self, workers=None, chunk_size=None):
+        """ 構造函數。參數只是為了與其他評估器保持相同的接口。 """
+        self.workers = 1  # 工作者數量
+        self.chunk_size = chunk_size  # 每個區塊的大小（未使用）
+
+    def map(self, function, elements):
+        """ 對每個元素調用函數並按順序返回結果。
+
+        :param function: (function) 要調用的函數。
+        :param elements: (list) 元素列表。
+        :return:
+            * (list) 按順序排列的結果列表。
+        """
+        return evaluate_chunk(function, elements)
+
+    def close(self):
+        """ 釋放資源（串行評估器沒有資源）。 """
+        pass
+
+
+class _PoolEvaluator:
+    """ 基於執行器（executor）池的評估器的基類。元素被分成區塊（chunk）發送到池中，然後按原始順序重新組合結果。 """
+
+    _executor_class = None  # 執行器類（由子類定義）
+
+    def __init__(self, workers=None, chunk_size=None):
+        """ 構造函數。
+
+        :param workers: (int) 池中的工作者數量。如果為 None，則使用 CPU 的數量。
+        :param chunk_size: (int) 每個區塊的元素數量。如果為 None，則自動計算（每個工作者大約四個區塊）。
+        """
+        self.workers = workers if workers is not None else (os.cpu_count() or 1)  # 工作者數量
+        self.chunk_size = chunk_size  # 每個區塊的大小
+        self._executor = None  # 池在第一次使用時創建，並在各代之間重複使用
+
+    def _get_executor(self):
+        """ 返回持久的池，如果還不存在則創建它。 """
+        if self._executor is None:
+            self._executor = self._executor_class(max_workers=self.workers)
+        return self._executor
+
+    def map(self, function, elements):
+        """ 對每個元素調用函數並按順序返回結果。如果函數引發異常，該異常會在這裡重新引發。
+
+        :param function: (function) 要調用的函數。
+        :param elements: (list) 元素列表。
+        :return:
+            * (list) 按順序排列的結果列表。
+        """
+        elements = list(elements)
+        if not elements:
+            return []
+        chunk_size = self.chunk_size if self.chunk_size is not None else max(1, -(-len(elements) // (self.workers * 4)))  # 向上取整
+        executor = self._get_executor()
+        futures = [executor.submit(evaluate_chunk, function, elements[i:i + chunk_size]) for i in range(0, len(elements), chunk_size)]
+        results = []
+        try:
+            for future in futures:
+                results.extend(future.result())  # 按提交順序收集結果，以便寫回正確的個體
+        except BaseException:
+            for future in futures:
+                future.cancel()  # 取消尚未開始的區塊
+            raise
+        return results
+
+    def close(self):
+        """ 關閉池並釋放其資源。 """
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_executor'] = None  # 池不能被序列化
+        return state
+
+
+class ThreadPoolEvaluator(_PoolEvaluator):
+    """ 線程池評估器。適用於釋放 GIL 的適應度函數（例如 NumPy 運算或 I/O）。 """
+
+    _executor_class = ThreadPoolExecutor
+
+
+class ProcessPoolEvaluator(_PoolEvaluator):
+    """ 進程池評估器。注意適應度函數和基因必須是可序列化的（pickle），例如定義在模組層級的函數（不能是 lambda）。 """
+
+    _executor_class = ProcessPoolExecutor
+
+
+EVALUATORS = {'serial': SerialEvaluator, 'thread': ThreadPoolEvaluator, 'process': ProcessPoolEvaluator}  # 可用的評估器
+
+
+def get_evaluator(evaluator, workers=None, chunk_size=None):
+    """
+    此函數返回評估器。
+
+    :param evaluator: (str) 評估器的名稱：'serial'、'thread' 或 'process'。
+    :param workers: (int) 工作者數量。如果為 None，則使用 CPU 的數量。
+    :param chunk_size: (int) 每個區塊的元素數量。如果為 None，則自動計算。
+    :return:
+        * 評估器對象（有 map 和 close 方法）。
+    """
+    if evaluator not in EVALUATORS:
+        raise ValueError("評估器必須是 'serial'、'thread' 或 'process' 中的一個。")
+    return EVALUATORS[evaluator](workers=workers, chunk_size=chunk_size)
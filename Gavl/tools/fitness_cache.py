@@ -0,0 +1,85 @@
+"""
+In this file it is defined the class to memoize the fitness of the chromosomes. The chromosomes are stored by their canonical form (see aux_functions/canonical.py), so the order of the genes does not matter.
+
+Classes:
+    :FitnessCache: LRU cache of fitness values with a bounded size.
+"""
+from collections import OrderedDict
+from .aux_functions.canonical import canonical_chromosome
+
+
+class FitnessCache:
+    """ 適應度快取類。以染色體的規範形式為鍵儲存適應度值，當快取已滿時，淘汰最近最少使用（LRU）的項目。 """
+
+    def __init__(self, max_size, repeated_genes_allowed):
+        """ 構造函數。
+
+        :param max_size: (int) 快取中可儲存的最大染色體數量。
+        :param repeated_genes_allowed: (int) 表示染色體中的基因是否可以重複（1）或不可以（0）。決定規範鍵是集合還是多重集合。
+        """
+        if type(max_size) != int or max_size <= 0:
+            raise ValueError('快取的最大大小必須是大於 0 的整數。')
+        self.max_size = max_size  # 快取的最大大小
+        self.repeated_genes_allowed = repeated_genes_allowed  # 是否允許基因重複
+        self._values = OrderedDict()  # 規範鍵 -> 適應度值
+        self.hits = 0  # 命中次數
+        self.misses = 0  # 未命中次數
+        self.evictions = 0  # 淘汰次數
+
+    def key(self, chromosome):
+        """ 返回染色體的規範鍵。
+
+        :param chromosome: (list of genes) 染色體。
+        :return:
+            * (frozenset) 規範鍵。
+        """
+        return canonical_chromosome(chromosome, self.repeated_genes_allowed)
+
+    def get(self, key):
+        """ 查詢快取。如果找到，將項目標記為最近使用的。
+
+        :param key: 染色體的規範鍵（見 FitnessCache.key）。
+        :return:
+            * :found: (bool) 是否在快取中找到。
+            * :value: (float) 適應度值（如果沒有找到則為 None）。
+        """
+        if key in self._values:
+            self._values.move_to_end(key)  # 標記為最近使用
+            self.hits += 1
+            return True, self._values[key]
+        self.misses += 1
+        return False, None
+
+    def put(self, key, value):
+        """ 在快取中儲存適應度值。如果快取已滿，淘汰最近最少使用的項目。
+
+        :param key: 染色體的規範鍵（見 FitnessCache.key）。
+        :param value: (float) 適應度值。
+        """
+        if key in self._values:
+            self._values.move_to_end(key)
+        self._values[key] = value
+        while len(self._values) > self.max_size:
+            self._values.popitem(last=False)  # 淘汰最近最少使用的項目
+            self.evictions += 1
+
+    def clear(self):
+        """ 清空快取並重設計數器。 """
+        self._values.clear()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def stats(self):
+        """ 返回快取的統計資料。
+
+        :return:
+            * (dict) 包含 'hits'、'misses'、'evictions'、'size' 和 'max_size' 的字典。注意 'hits' 即為節省的適應度計算次數。
+        """
+        return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions, 'size': len(self._values), 'max_size': self.max_size}
+
+    def __len__(self):
+        return len(self._values)
+
+    def __contains__(self, key):
+        return key in self._values
@@ -19,6 +19,7 @@ class Individual:
             self.fitness_value = None  # 適應度值將在評估時填充
             self.normalized_fitness_value = None  # 存儲相對於族群的正規化適應度
             self.inverse_normalized_fitness_value = None  # 存儲相對於族群的逆正規化適應度
+            self._evaluated_chromosome = None  # 設置適應度值時染色體內容的快照（用於檢測染色體是否被就地修改）
 
     def set_new_chromosome(self, chromosome):
         """ 設置新染色體的方法。
@@ -37,6 +38,7 @@ class Individual:
         """
         if type(fitness_value) in [int, float, np.float64]:
             self.fitness_value = fitness_value
+            self._evaluated_chromosome = tuple(self.chromosome)  # 適應度值對應的染色體內容
         else:
             raise ValueError('適應度值必須是整數或浮點數。接收到的類型為 {}。'.format(type(fitness_value)))
 
@@ -72,19 +74,34 @@ class Individual:
         except Exception as e:
             raise Exception(str(e) + '\n計算個體適應度時出錯')
 
-    def kill_and_reset(self, chromosome):
+    def kill_and_reset(self, chromosome, fitness_value=None, evaluated_chromosome=None):
         """ 重設個體的方法。如果要創建新一代的新個體，重設已有個體的值會比創建全新個體並取消引用舊個體更快。
 
         :param chromosome: (list of genes) 個體的染色體。
+        :param fitness_value: (float) 如果染色體沒有改變（例如精英或未能交叉的個體），可以傳入其已知的適應度值以避免重新計算。默認為 None（需要重新計算）。
+        :param evaluated_chromosome: (tuple or None) 已知的適應度值對應的染色體內容的快照（見 evaluated_chromosome_unchanged）。默認為 None（使用 chromosome 的內容）。
         """
         if type(chromosome) != list:
             raise AttributeError('染色體必須是基因的列表')
         else:
             self.chromosome = chromosome  # 更新染色體
-            self.fitness_value = None  # 重設適應度值
+            self.fitness_value = fitness_value  # 重設適應度值（或保留已知的值）
+            if fitness_value is None:
+                self._evaluated_chromosome = None
+            else:
+                self._evaluated_chromosome = evaluated_chromosome if evaluated_chromosome is not None else tuple(chromosome)
             self.normalized_fitness_value = None  # 重設正規化適應度值
             self.inverse_normalized_fitness_value = None  # 重設逆正規化適應度值
 
+    def evaluated_chromosome_unchanged(self, chromosome):
+        """ 檢查 chromosome 的內容是否與設置適應度值時的染色體內容相同（自定義的算子可能就地修改染色體並返回同一個列表對象，此時已知的適應度值已過時）。
+
+        :param chromosome: (list of genes) 要檢查的染色體。
+        :return:
+            * (bool) 如果適應度值仍然對應 chromosome 的內容，則返回 True。
+        """
+        return self._evaluated_chromosome is not None and len(self._evaluated_chromosome) == len(chromosome) and self._evaluated_chromosome == tuple(chromosome)
+
     def __eq__(self, other):
         if not isinstance(other, self.__class__):
             return NotImplemented
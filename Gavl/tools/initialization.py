@@ -0,0 +1,127 @@
+"""
+In this file it is defined the functions to generate the initial population in batches. The candidate chromosomes of the default generator are drawn all at once as a NumPy matrix of random indices of the possible genes, they are validated as a batch (optionally in parallel with an evaluator, see tools/evaluator.py) and the process stops with a clear error when the attempt or time budget is exhausted, instead of looping forever with a strict check_valid_individual.
+
+Functions:
+    generate_index_chromosomes: Returns a batch of random chromosomes as lists of indices of the possible genes.
+    generate_chromosomes_batch: Returns a batch of candidate chromosomes (with the default or with a custom generator).
+    generate_valid_chromosomes: Returns the required number of valid chromosomes within an attempt and time budget.
+"""
+import time
+import random
+import numpy as np
+from .generate_chromosome import generate_chromosome
+from .aux_functions.rng import numpy_rng
+from .aux_functions.parameters import accepts_parameter
+
+MAX_RANDOM_MATRIX_SIZE = 2 ** 22  # argpartition 使用的隨機矩陣的最大元素數量（每塊約 32 MB）
+DENSE_ALPHABET_FACTOR = 8  # 如果可能的基因數量不超過寬度的這個倍數，則使用 argpartition（否則每行不放回抽樣）
+
+
+def generate_index_chromosomes(number_of_chromosomes, min_length_chromosome, max_length_chromosome, number_of_possible_genes, repeated_genes_allowed, np_rng=None):
+    """
+    此函數一次生成一批隨機染色體（基因在可能基因列表中的索引）。長度在 [min_length_chromosome, max_length_chromosome] 中均勻分佈，與 generate_chromosome 相同。
+    如果不允許重複基因：當可能的基因很多時（多於寬度的平方），抽取有放回的索引矩陣並重新抽取有重複索引的行（拒絕抽樣）；當可能的基因與寬度相近時，每行取隨機矩陣的 argpartition（隨機排列的前綴，分塊以限制記憶體）；否則每行以 np_rng.choice 不放回抽樣。這樣成本和記憶體與寬度成正比，而不是與可能的基因數量乘以染色體數量成正比。
+
+    :param number_of_chromosomes: (int) 要生成的染色體數量。
+    :param min_length_chromosome: (int) 染色體的最小允許長度。
+    :param max_length_chromosome: (int) 染色體的最大允許長度。
+    :param number_of_possible_genes: (int) 可能的基因數量。
+    :param repeated_genes_allowed: (int) 是否允許基因重複（1）或不允許（0）。
+    :param np_rng: (numpy.random.Generator) NumPy 隨機數生成器。默認為 None（從 random 模組獲取種子）。
+    :return:
+        * (list of lists of int) 染色體列表（索引列表）。
+    """
+    if np_rng is None:
+        np_rng = numpy_rng()
+    lengths = np_rng.integers(min_length_chromosome, max_length_chromosome + 1, size=number_of_chromosomes)
+    width = max_length_chromosome if repeated_genes_allowed else min(max_length_chromosome, number_of_possible_genes)
+    if width == 0:
+        return [[] for _ in range(number_of_chromosomes)]
+    if repeated_genes_allowed:
+        matrix = np_rng.integers(0, number_of_possible_genes, size=(number_of_chromosomes, width))
+    elif width * width <= number_of_possible_genes:  # 很多可能的基因 ---> 重複的機率很低，拒絕抽樣
+        matrix = np_rng.integers(0, number_of_possible_genes, size=(number_of_chromosomes, width))
+        while True:
+            sorted_matrix = np.sort(matrix, axis=1)
+            rows_repeated = np.flatnonzero((sorted_matrix[:, 1:] == sorted_matrix[:, :-1]).any(axis=1))  # 有重複索引的行
+            if len(rows_repeated) == 0:
+                break
+            matrix[rows_repeated] = np_rng.integers(0, number_of_possible_genes, size=(len(rows_repeated), width))
+    elif number_of_possible_genes <= DENSE_ALPHABET_FACTOR * width:  # 可能的基因與長度相近 ---> 每行取隨機排列的前綴（分塊，使隨機矩陣不超過 MAX_RANDOM_MATRIX_SIZE 個元素）
+        rows_per_block = max(1, MAX_RANDOM_MATRIX_SIZE // number_of_possible_genes)
+        matrix = np.concatenate([np.argpartition(np_rng.random((min(rows_per_block, number_of_chromosomes - start), number_of_possible_genes)), width - 1, axis=1)[:, :width]
+                                 for start in range(0, number_of_chromosomes, rows_per_block)])
+    else:  # 可能的基因遠多於長度 ---> 每行不放回抽樣（成本與長度成正比，而不是與可能的基因數量成正比）
+        matrix = np.array([np_rng.choice(number_of_possible_genes, width, replace=False) for _ in range(number_of_chromosomes)])
+    return [row[:length] for row, length in zip(matrix.tolist(), lengths.tolist())]
+
+
+def generate_chromosomes_batch(number_of_chromosomes, generate_new_chromosome, min_length_chromosome, max_length_chromosome, possible_genes, repeated_genes_allowed, rng=random, np_rng=None):
+    """
+    此函數返回一批候選染色體。如果使用默認的生成函數（generate_chromosome），染色體以 NumPy 索引矩陣一次生成（見 generate_index_chromosomes）；否則逐個調用自定義的生成函數（如果它接受關鍵字參數 rng，則傳遞 rng）。
+
+    :param number_of_chromosomes: (int) 要生成的染色體數量。
+    :param generate_new_chromosome: (function) 生成新染色體的函數（見 Gavl.generate_new_chromosome）。
+    :param min_length_chromosome: (int) 染色體的最小允許長度。
+    :param max_length_chromosome: (int) 染色體的最大允許長度。
+    :param possible_genes: (list of ...) 包含所有可能基因值的列表。
+    :param repeated_genes_allowed: (int) 是否允許基因重複（1）或不允許（0）。
+    :param rng: (random.Random) 隨機數生成器。默認為 random 模組。
+    :param np_rng: (numpy.random.Generator or None) NumPy 隨機數生成器。None 表示從 rng 獲取種子。默認為 None。
+    :return:
+        * (list of lists) 候選染色體列表。
+    """
+    if generate_new_chromosome is generate_chromosome:
+        index_chromosomes = generate_index_chromosomes(number_of_chromosomes, min_length_chromosome, max_length_chromosome, len(possible_genes), repeated_genes_allowed, np_rng if np_rng is not None else numpy_rng(rng))
+        return [[possible_genes[i] for i in chromosome] for chromosome in index_chromosomes]
+    generator_kwargs = {'rng': rng} if accepts_parameter(generate_new_chromosome, 'rng') else {}  # 只有當生成函數接受時才傳遞的可選參數
+    return [generate_new_chromosome(min_length_chromosome, max_length_chromosome, possible_genes, repeated_genes_allowed, **generator_kwargs) for _ in range(number_of_chromosomes)]
+
+
+def generate_valid_chromosomes(number_of_chromosomes, generate_new_chromosome, min_length_chromosome, max_length_chromosome, possible_genes, repeated_genes_allowed, check_valid_individual, map_function=map, max_attempts=None, max_time=None, repair_function=None, rng=random, np_rng=None, partial=False):
+    """
+    此函數以批次生成候選染色體並檢查其有效性，直到獲得 number_of_chromosomes 個有效染色體。每批的大小根據目前的接受率估計。
+    如果超過嘗試次數或時間的預算，則引發 RuntimeError（而不是無限循環），或者如果 partial 是 True，則返回已找到的有效染色體。
+
+    :param number_of_chromosomes: (int) 需要的有效染色體數量。
+    :param generate_new_chromosome: (function) 生成新染色體的函數。
+    :param min_length_chromosome: (int) 染色體的最小允許長度。
+    :param max_length_chromosome: (int) 染色體的最大允許長度。
+    :param possible_genes: (list of ...) 包含所有可能基因值的列表。
+    :param repeated_genes_allowed: (int) 是否允許基因重複（1）或不允許（0）。
+    :param check_valid_individual: (function) 檢查染色體有效性的函數。
+    :param map_function: (function) 用於檢查一批染色體的 map 函數（例如評估器的 map，以並行檢查）。默認為內置的 map。
+    :param max_attempts: (int or None) 最多生成的候選染色體數量。None 表示沒有限制。
+    :param max_time: (float or None) 最多使用的時間（秒）。None 表示沒有限制。
+    :param repair_function: (function or None) 在檢查有效性之前應用於每個候選染色體的函數（例如修復違反約束的染色體，見 tools/constraints.py）。None 表示不修復。
+    :param rng: (random.Random) 隨機數生成器。默認為 random 模組。
+    :param np_rng: (numpy.random.Generator or None) NumPy 隨機數生成器（用於默認的生成函數）。None 表示從 rng 獲取種子。默認為 None。
+    :param partial: (bool) 如果是 True，超過預算時返回已找到的有效染色體（可能少於 number_of_chromosomes），而不是引發 RuntimeError（例如保持多樣性協議，它可以保留舊的染色體）。默認為 False。
+    :return:
+        * :valid_chromosomes: (list of lists) 有效的染色體列表。
+        * :initialization_stats: (dict) 統計：'generated'（生成的候選染色體數量）、'accepted'（有效的數量）、'acceptance_rate'（接受率）和 'time'（秒）。
+    """
+    start_time = time.perf_counter()
+    valid_chromosomes = []
+    generated = 0  # 生成的候選染色體數量
+    while len(valid_chromosomes) < number_of_chromosomes:
+        elapsed_time = time.perf_counter() - start_time
+        if (max_attempts is not None and generated >= max_attempts) or (max_time is not None and elapsed_time >= max_time):
+            if partial:
+                break
+            raise RuntimeError('無法生成初始族群：在 {} 次嘗試和 {:.2f} 秒內只找到 {} 個有效個體（需要 {} 個，接受率 {:.4%}）。函數 check_valid_individual 可能過於嚴格，'
+                               '可以放寬它（並在適應度函數中懲罰無效的個體），或增加 \'initialization_max_attempts\' 或 \'initialization_max_time\'。'.format(generated, elapsed_time, len(valid_chromosomes), number_of_chromosomes, len(valid_chromosomes) / generated if generated else 0))
+        missing = number_of_chromosomes - len(valid_chromosomes)
+        acceptance_rate = len(valid_chromosomes) / generated if generated else 1
+        size_batch = min(int(missing / max(acceptance_rate, 0.01)) + 1, 10 * number_of_chromosomes)  # 根據接受率估計所需的候選數量
+        if max_attempts is not None:
+            size_batch = min(size_batch, max_attempts - generated)
+        candidates = generate_chromosomes_batch(size_batch, generate_new_chromosome, min_length_chromosome, max_length_chromosome, possible_genes, repeated_genes_allowed, rng, np_rng)
+        generated += size_batch
+        if repair_function is not None:
+            candidates = [repair_function(chromosome) for chromosome in candidates]
+        for chromosome, is_valid in zip(candidates, map_function(check_valid_individual, candidates)):
+            if is_valid:
+                valid_chromosomes.append(chromosome)
+    initialization_stats = {'generated': generated, 'accepted': len(valid_chromosomes), 'acceptance_rate': len(valid_chromosomes) / generated if generated else 1, 'time': time.perf_counter() - start_time}
+    return valid_chromosomes[:number_of_chromosomes], initialization_stats  # 最後一批可能有多餘的有效染色體
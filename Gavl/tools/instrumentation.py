@@ -0,0 +1,204 @@
+"""
+In this file it is defined the optional instrumentation of an optimization: the wall time of each phase of every generation (fitness, elitism, selection, pairing, lookup of the paired individuals, crossover, repair, mutation, reset of the population, keep diversity and statistics), counters (fitness evaluations, cache hits, crossover and mutation attempts...) and, optionally, the peak memory measured with tracemalloc. When the instrumentation is disabled the operators receive a null object whose methods do nothing, so the overhead is a few empty calls per generation.
+
+Classes:
+    :GenerationStats: Timings and counters of one generation.
+    :RunStats: Stats of a whole optimization (list of GenerationStats, totals and peak memory).
+    :CountingCheck: Wraps check_valid_individual to count the attempts of an operator and the invalid results.
+"""
+import time
+import tracemalloc
+
+
+class GenerationStats:
+    """ 一代的計時和計數器。每個階段的時間是兩次調用 lap 之間的時間（同一個階段可以累加多次）。 """
+
+    def __init__(self, generation):
+        """ 構造函數。
+
+        :param generation: (int) 代數。
+        """
+        self.generation = generation
+        self.phase_times = {}  # 階段 -> 時間（秒）
+        self.counters = {}  # 計數器的名稱 -> 值
+        self.peak_memory = None  # 這一代的峰值記憶體（字節，只有使用 tracemalloc 時）
+        self._last_time = time.perf_counter()
+
+    def lap(self, phase):
+        """ 將上一次調用以來的時間累加到階段 phase。
+
+        :param phase: (str) 階段的名稱。
+        """
+        now = time.perf_counter()
+        self.phase_times[phase] = self.phase_times.get(phase, 0) + now - self._last_time
+        self._last_time = now
+
+    def count(self, name, value):
+        """ 將 value 累加到計數器 name。
+
+        :param name: (str) 計數器的名稱。
+        :param value: (int) 要累加的值。
+        """
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def as_dict(self):
+        """ 返回這一代的統計的字典。
+
+        :return:
+            * (dict) 'generation'、'phase_times'、'counters' 和 'peak_memory'。
+        """
+        return {'generation': self.generation, 'phase_times': dict(self.phase_times), 'counters': dict(self.counters), 'peak_memory': self.peak_memory}
+
+
+class _NullGenerationStats:
+    """ 沒有啟用儀表時使用的空對象：所有方法都不做任何事。 """
+
+    def lap(self, phase):
+        pass
+
+    def count(self, name, value):
+        pass
+
+
+NULL_GENERATION_STATS = _NullGenerationStats()
+
+
+class RunStats:
+    """ 一次優化過程的統計：每一代的 GenerationStats、初始化的時間、總計和峰值記憶體。 """
+
+    def __init__(self, trace_memory=0):
+        """ 構造函數。
+
+        :param trace_memory: (int) 是否以 tracemalloc 測量每一代的峰值記憶體（1）或不（0）。注意 tracemalloc 會明顯減慢 Python 的記憶體分配。默認為 0。
+        """
+        self.trace_memory = trace_memory
+        self.generations = []  # 每一代的 GenerationStats
+        self.initialization_time = None  # 初始族群的生成和計算的時間（秒）
+        self.initialization_peak_memory = None  # 初始化的峰值記憶體（字節，只有使用 tracemalloc 時）
+        self._started_tracemalloc = False  # tracemalloc 是否由這個對象啟動（結束時只停止自己啟動的追蹤）
+
+    def start(self):
+        """ 開始測量（如果需要，啟動 tracemalloc）。 """
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+
+    def stop(self):
+        """ 結束測量（停止由這個對象啟動的 tracemalloc）。 """
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    def peak(self):
+        """ 返回上一次重設以來的峰值記憶體（字節）並重設峰值。如果沒有使用 tracemalloc，則返回 None。
+
+        :return:
+            * (int or None) 峰值記憶體。
+        """
+        if not self.trace_memory or not tracemalloc.is_tracing():
+            return None
+        peak_memory = tracemalloc.get_traced_memory()[1]
+        tracemalloc.reset_peak()
+        return peak_memory
+
+    def begin_generation(self, generation):
+        """ 開始一代的測量。
+
+        :param generation: (int) 代數。
+        :return:
+            * (GenerationStats) 這一代的統計。
+        """
+        return GenerationStats(generation)
+
+    def end_generation(self, generation_stats):
+        """ 結束一代的測量並保存它的統計。
+
+        :param generation_stats: (GenerationStats) 這一代的統計。
+        """
+        generation_stats.peak_memory = self.peak()
+        self.generations.append(generation_stats)
+
+    def phase_totals(self):
+        """ 返回所有代中每個階段的總時間。
+
+        :return:
+            * (dict) 階段 -> 總時間（秒）。
+        """
+        totals = {}
+        for generation_stats in self.generations:
+            for phase, phase_time in generation_stats.phase_times.items():
+                totals[phase] = totals.get(phase, 0) + phase_time
+        return totals
+
+    def counter_totals(self):
+        """ 返回所有代中每個計數器的總和。
+
+        :return:
+            * (dict) 計數器的名稱 -> 總和。
+        """
+        totals = {}
+        for generation_stats in self.generations:
+            for name, value in generation_stats.counters.items():
+                totals[name] = totals.get(name, 0) + value
+        return totals
+
+    def peak_memory(self):
+        """ 返回整個優化過程的峰值記憶體（字節）。如果沒有使用 tracemalloc，則返回 None。
+
+        :return:
+            * (int or None) 峰值記憶體。
+        """
+        peaks = [generation_stats.peak_memory for generation_stats in self.generations if generation_stats.peak_memory is not None]
+        if self.initialization_peak_memory is not None:
+            peaks.append(self.initialization_peak_memory)
+        return max(peaks) if peaks else None
+
+    def as_dict(self):
+        """ 返回統計的字典（例如用於序列化為 JSON）。
+
+        :return:
+            * (dict) 'initialization_time'、'phase_totals'、'counter_totals'、'peak_memory' 和 'generations'（每一代的字典）。
+        """
+        return {'initialization_time': self.initialization_time, 'phase_totals': self.phase_totals(), 'counter_totals': self.counter_totals(),
+                'peak_memory': self.peak_memory(), 'generations': [generation_stats.as_dict() for generation_stats in self.generations]}
+
+    def summary(self):
+        """ 返回統計的文字摘要：每個階段的總時間和所佔比例、計數器的總和和峰值記憶體。
+
+        :return:
+            * (str) 摘要。
+        """
+        phase_totals = self.phase_totals()
+        total_time = sum(phase_totals.values())
+        lines = ['Generations: {}'.format(len(self.generations))]
+        if self.initialization_time is not None:
+            lines.append('Initialization: {:.4f} s'.format(self.initialization_time))
+        for phase, phase_time in sorted(phase_totals.items(), key=lambda item: -item[1]):
+            lines.append('{:<16}{:>12.4f} s{:>8.1%}'.format(phase, phase_time, phase_time / total_time if total_time else 0))
+        for name, value in sorted(self.counter_totals().items()):
+            lines.append('{:<24}{:>12}'.format(name, value))
+        if self.peak_memory() is not None:
+            lines.append('Peak memory: {:.1f} KiB'.format(self.peak_memory() / 1024))
+        return '\n'.join(lines)
+
+
+class CountingCheck:
+    """ 包裝檢查有效性的函數，計算調用的次數（算子的嘗試次數）和無效的結果。 """
+
+    def __init__(self, check_valid_individual):
+        """ 構造函數。
+
+        :param check_valid_individual: (function) 檢查有效性的函數。
+        """
+        self.check_valid_individual = check_valid_individual
+        self.calls = 0  # 調用的次數
+        self.invalid = 0  # 返回 False 的次數
+
+    def __call__(self, chromosome):
+        self.calls += 1
+        is_valid = self.check_valid_individual(chromosome)
+        if not is_valid:
+            self.invalid += 1
+        return is_valid
@@ -0,0 +1,319 @@
+"""
+In this file it is defined the island model. Several Gavl instances (the islands), each one with its own population, operators, hyperparameters and random state, evolve in parallel (one process per island). Every few generations the best individuals of each island migrate to its neighbouring islands, according to a topology (ring, fully connected or a custom one). The histories of the islands are merged into one result.
+
+Classes:
+    :IslandModel: Runs the islands and merges their results.
+
+Functions:
+    topology_neighbours: Returns the destinations of the migrants of each island for a given topology.
+"""
+import copy
+import random
+import traceback
+import multiprocessing
+from .individual import Individual
+
+
+def topology_neighbours(topology, number_of_islands):
+    """
+    此函數返回每個島嶼的遷出個體的目的地（島嶼的索引）。
+
+    :param topology: (str or list of lists of int) 'ring'（每個島嶼遷移到下一個島嶼）、'fully_connected'（每個島嶼遷移到所有其他島嶼），或自定義的拓撲：列表的第 i 個元素是島嶼 i 的目的地列表。
+    :param number_of_islands: (int) 島嶼的數量。
+    :return:
+        * (list of lists of int) 每個島嶼的目的地列表。
+    """
+    if topology == 'ring':
+        return [[(i + 1) % number_of_islands] if number_of_islands > 1 else [] for i in range(number_of_islands)]
+    elif topology == 'fully_connected':
+        return [[j for j in range(number_of_islands) if j != i] for i in range(number_of_islands)]
+    elif isinstance(topology, list) and len(topology) == number_of_islands and all(isinstance(destinations, list) and all(type(j) == int and 0 <= j < number_of_islands and j != i for j in destinations) for i, destinations in enumerate(topology)):
+        return [list(destinations) for destinations in topology]
+    else:
+        raise ValueError("拓撲必須是 'ring'、'fully_connected'，或每個島嶼一個目的地列表（其他島嶼的索引）的列表。")
+
+
+class _Island:
+    """ 一個島嶼：Gavl 實例和它自己的隨機數生成器。算子使用島嶼的 random.Random（見 Gavl._start_run），並且每個命令都在島嶼自己的 random 模組狀態下執行（用於不接受 rng 的自定義算子），所以島嶼之間（以及在同一個進程中運行時）的隨機序列是獨立的。
+    島嶼不打印自己的進度（'show_progress' 在執行命令時被設為 0），進度由 IslandModel 統一報告。 """
+
+    def __init__(self, ga, seed):
+        """ 構造函數。
+
+        :param ga: (Gavl) 已配置的 Gavl 實例。
+        :param seed: (int) 島嶼的隨機數生成器的種子。
+        """
+        self.ga = ga
+        self.rng = random.Random(seed)  # 島嶼的算子使用的隨機數生成器
+        self.random_state = random.Random(self.rng.getrandbits(64)).getstate()  # 島嶼的 random 模組狀態
+        self.finished = False  # 島嶼是否滿足其終止條件
+
+    def execute(self, command, argument):
+        """ 在島嶼的隨機狀態下執行一個命令（'start'、'evolve'、'immigrate'、'finish' 或 'abort'）。
+
+        :param command: (str) 命令的名稱。
+        :param argument: 命令的參數。
+        :return:
+            命令的結果。
+        """
+        previous_state = random.getstate()
+        random.setstate(self.random_state)
+        show_progress = self.ga.show_progress
+        self.ga.show_progress = 0  # 每個島嶼（進程）不打印交錯的進度
+        try:
+            return getattr(self, command)(argument)
+        finally:
+            self.ga.show_progress = show_progress
+            self.random_state = random.getstate()
+            random.setstate(previous_state)
+
+    def _check_finished(self):
+        self.finished = self.ga._check_termination_criteria_function(self.ga._termination_criteria_args)
+        return self.finished
+
+    def start(self, _):
+        self.ga._start_run(rng=self.rng)
+        return self._check_finished()
+
+    def evolve(self, argument):
+        number_of_generations, number_of_emigrants = argument
+        for _ in range(number_of_generations):
+            if self.finished:
+                break
+            self.ga._run_generation()
+            self._check_finished()
+        return self.finished, self.ga._emigrants(number_of_emigrants), self.ga._generation_count
+
+    def immigrate(self, chromosomes):
+        return self.ga._immigrate(chromosomes)
+
+    def finish(self, _):
+        try:
+            self.ga._Population__calculate_fitness_and_sort()  # 計算適應度並排序
+        finally:
+            self.ga._finish_run()
+        return {'population': [(individual.chromosome, individual.fitness_value) for individual in self.ga.population], 'best_fitness_per_generation': self.ga.best_fitness_per_generation, 'generation_count': self.ga._generation_count}
+
+    def abort(self, _):
+        self.ga._finish_run()
+
+
+def _island_worker(connection, island):
+    """
+    工作進程的主循環：接收命令，在島嶼上執行它們並發送結果，直到收到 'finish' 或 'abort'。注意它必須定義在模組層級，以便能夠被傳送到其他進程。
+
+    :param connection: (multiprocessing.connection.Connection) 與主進程的連接。
+    :param island: (_Island) 島嶼。
+    """
+    while True:
+        command, argument = connection.recv()
+        try:
+            connection.send(('ok', island.execute(command, argument)))
+        except BaseException:
+            connection.send(('error', traceback.format_exc()))
+        if command in ('finish', 'abort'):
+            break
+    connection.close()
+
+
+class _LocalIsland:
+    """ 在當前進程中運行的島嶼（use_processes = 0），與 _ProcessIsland 的接口相同。 """
+
+    def __init__(self, island, context=None):
+        self.island = island
+        self._result = None
+
+    def send(self, command, argument=None):
+        try:
+            self._result = ('ok', self.island.execute(command, argument))
+        except BaseException:
+            self._result = ('error', traceback.format_exc())
+
+    def receive(self):
+        status, result = self._result
+        if status == 'error':
+            raise RuntimeError('島嶼出錯：\n' + result)
+        return result
+
+    def close(self):
+        pass
+
+
+class _ProcessIsland:
+    """ 在工作進程中運行的島嶼。命令通過管道（Pipe）發送，所以可以先向所有島嶼發送命令，然後再接收結果（島嶼並行運行）。 """
+
+    def __init__(self, island, context):
+        self.connection, child_connection = context.Pipe()
+        self.process = context.Process(target=_island_worker, args=(child_connection, island))  # 不是守護進程，所以島嶼可以使用進程池評估器
+        self.process.start()
+        child_connection.close()
+
+    def send(self, command, argument=None):
+        self.connection.send((command, argument))
+
+    def receive(self):
+        status, result = self.connection.recv()
+        if status == 'error':
+            raise RuntimeError('島嶼的工作進程出錯：\n' + result)
+        return result
+
+    def close(self):
+        self.connection.close()
+        self.process.join(timeout=5)
+        if self.process.is_alive():
+            self.process.terminate()
+            self.process.join()
+
+
+class IslandModel:
+    """ 島嶼模型：多個 Gavl 實例在不同的進程中並行進化，每 migration_interval 代按照拓撲交換最好的 migration_size 個個體。 """
+
+    def __init__(self, islands, topology='ring', migration_interval=10, migration_size=1, use_processes=1, seed=None, start_method=None):
+        """ 構造函數。
+
+        :param islands: (list of Gavl) 已配置的 Gavl 實例（每個島嶼一個）。每個島嶼可以有不同的算子和超參數，但它們必須有相同的優化方向（'minimize'）。
+        :param topology: (str or list of lists of int) 遷移的拓撲（見 topology_neighbours）。默認為 'ring'。
+        :param migration_interval: (int) 兩次遷移之間的代數。默認為 10。
+        :param migration_size: (int) 每個島嶼每次遷出的最好個體數量。遷入的個體替換目的地島嶼中最差的個體。默認為 1。
+        :param use_processes: (int) 每個島嶼是否在自己的進程中運行（1）或所有島嶼在當前進程中依次運行（0）。默認為 1。
+        :param seed: (int or None) 用於生成每個島嶼的種子的種子。None 表示從 random 模組獲取種子。默認為 None。
+        :param start_method: (str or None) multiprocessing 的啟動方法（'fork'、'spawn' 或 'forkserver'）。None 表示平台的默認方法。注意除了 'fork' 以外，Gavl 實例（包括其函數）必須可以被序列化（pickle），所以不能使用 lambda。默認為 None。
+        """
+        if not isinstance(islands, list) or not islands or not all(hasattr(ga, '_run_generation') for ga in islands):
+            raise ValueError('島嶼必須是 Gavl 實例的非空列表。')
+        if len(set(ga.minimize for ga in islands)) != 1:
+            raise ValueError("所有島嶼必須有相同的優化方向（'minimize'）。")
+        if type(migration_interval) != int or migration_interval < 1:
+            raise ValueError('遷移間隔必須是大於 0 的整數。')
+        if type(migration_size) != int or migration_size < 0:
+            raise ValueError('遷移的個體數量必須是大於或等於 0 的整數。')
+        self.islands = islands
+        self.neighbours = topology_neighbours(topology, len(islands))  # 每個島嶼的目的地
+        self.migration_interval = migration_interval
+        self.migration_size = migration_size
+        self.use_processes = use_processes
+        self.seed = seed
+        self.start_method = start_method
+        self.best_fitness_per_generation = []  # 每一代所有島嶼中的最佳適應度
+        self.island_best_fitness_per_generation = []  # 每個島嶼每一代的最佳適應度
+        self.migrations = 0  # 遷移的次數
+        self.immigrants_accepted = 0  # 被接受的遷入個體總數
+        self._best_individual = None
+
+    @classmethod
+    def replicate(cls, ga, number_of_islands, **kwargs):
+        """ 以一個 Gavl 實例的 number_of_islands 個副本創建島嶼模型（所有島嶼有相同的配置，但有不同的隨機狀態）。
+
+        :param ga: (Gavl) 已配置的 Gavl 實例。
+        :param number_of_islands: (int) 島嶼的數量。
+        :param kwargs: IslandModel 構造函數的其他參數。
+        :return:
+            * (IslandModel) 島嶼模型。
+        """
+        if type(number_of_islands) != int or number_of_islands < 1:
+            raise ValueError('島嶼的數量必須是大於 0 的整數。')
+        return cls([copy.deepcopy(ga) for _ in range(number_of_islands)], **kwargs)
+
+    def __broadcast(self, workers, command, arguments):
+        """ 向每個島嶼發送命令（arguments 中對應的參數，None 表示不發送），然後收集結果，所以島嶼並行運行。 """
+        targets = [i for i, argument in enumerate(arguments) if argument is not None]
+        for i in targets:
+            workers[i].send(command, arguments[i])
+        results = [None] * len(workers)
+        errors = []
+        for i in targets:
+            try:
+                results[i] = workers[i].receive()
+            except RuntimeError as e:
+                errors.append(str(e))
+        if errors:
+            raise RuntimeError('\n'.join(errors))
+        return results
+
+    def optimize(self):
+        """ 開始島嶼模型的最優化。每個島嶼運行直到滿足其自己的終止條件；在所有島嶼都結束時，最優化結束。
+        優化後，每個 Gavl 實例（self.islands）包含其最後一代的族群和 best_fitness_per_generation。
+
+        :return:
+            (Individual) 所有島嶼中的最佳個體。
+        """
+        number_of_islands = len(self.islands)
+        seed_rng = random.Random(self.seed) if self.seed is not None else random
+        islands = [_Island(ga, seed_rng.getrandbits(64)) for ga in self.islands]
+        context = multiprocessing.get_context(self.start_method) if self.use_processes else None
+        worker_class = _ProcessIsland if self.use_processes else _LocalIsland
+        workers = []
+        self.migrations = 0
+        self.immigrants_accepted = 0
+        finished_run = False
+        try:
+            workers = [worker_class(island, context) for island in islands]
+            finished = self.__broadcast(workers, 'start', [True] * number_of_islands)
+            while not all(finished):
+                results = self.__broadcast(workers, 'evolve', [(self.migration_interval, self.migration_size)] * number_of_islands)
+                finished = [result[0] for result in results]
+                if any(ga.show_progress for ga in self.islands):  # 每次遷移報告一次進度（而不是每個島嶼每一代）
+                    print('Generation: {}'.format(max(result[2] for result in results)))
+                if all(finished) or self.migration_size == 0:
+                    continue
+                # 遷移：每個島嶼最好的個體被發送到其目的地，替換那裡最差的個體
+                immigrants = [[] for _ in range(number_of_islands)]
+                for i, (_, emigrants, _) in enumerate(results):
+                    for j in self.neighbours[i]:
+                        immigrants[j].extend(emigrants)
+                accepted = self.__broadcast(workers, 'immigrate', [immigrants[j] if immigrants[j] and not finished[j] else None for j in range(number_of_islands)])
+                self.immigrants_accepted += sum(number for number in accepted if number is not None)
+                self.migrations += 1
+            island_results = self.__broadcast(workers, 'finish', [True] * number_of_islands)
+            finished_run = True
+        finally:
+            if not finished_run and workers:
+                for worker in workers:  # 關閉島嶼的評估器並結束工作進程
+                    try:
+                        worker.send('abort')
+                        worker.receive()
+                    except Exception:
+                        pass
+            for worker in workers:
+                worker.close()
+        self.__merge_results(island_results)
+        return self._best_individual
+
+    def __merge_results(self, island_results):
+        """ 將每個島嶼的結果合併：更新 Gavl 實例（如果島嶼在其他進程中運行），並計算每一代所有島嶼中的最佳適應度和最佳個體。 """
+        minimize = self.islands[0].minimize
+        best = min if minimize else max
+        for ga, result in zip(self.islands, island_results):
+            if self.use_processes:  # 島嶼在其他進程中運行 ---> 將結果複製到 Gavl 實例
+                population = []
+                for chromosome, fitness_value in result['population']:
+                    individual = Individual(chromosome)
+                    individual.set_fitness_value(fitness_value)
+                    population.append(individual)
+                ga._Population__set_population(population)
+                ga.best_fitness_per_generation = result['best_fitness_per_generation']
+                ga._generation_count = result['generation_count']
+        self.island_best_fitness_per_generation = [list(ga.best_fitness_per_generation) for ga in self.islands]
+        number_of_generations = max(len(history) for history in self.island_best_fitness_per_generation)
+        self.best_fitness_per_generation = [best(history[generation] for history in self.island_best_fitness_per_generation if generation < len(history)) for generation in range(number_of_generations)]
+        self._best_individual = best((ga.best_individual() for ga in self.islands), key=lambda individual: individual.fitness_value)
+
+    def best_individual(self):
+        """ 返回所有島嶼中的最佳個體的方法。
+
+        :return:
+            * :individual: (Individual) 最佳個體。
+        """
+        if self._best_individual is None:
+            raise ValueError('在調用此方法之前，必須進行優化（調用方法 .optimize()）。')
+        return self._best_individual
+
+    def historic_fitness(self):
+        """ 返回每一代所有島嶼中的最佳適應度值的方法。
+
+        :return:
+            * :bfv: (浮點數列表) 每一代的最佳適應度值列表。
+        """
+        if not self.best_fitness_per_generation:
+            raise ValueError('在調用此方法之前，必須進行優化（調用方法 .optimize()）。')
+        return self.best_fitness_per_generation
@@ -1,14 +1,27 @@
 """
-In this file it is defined a function to keep the diversity.
+In this file it is defined a function to keep the diversity. The repeated individuals are detected with hashed canonical keys (see aux_functions/canonical.py), so the whole population is checked in linear time and the chromosomes of the population are not modified.
 
 Functions:
     keep_diversity: Function called to keep the diversity.
+    keep_diversity_counts: Function called to keep the diversity with the count vector representation of the chromosomes.
+    duplicated_individuals: Returns which chromosomes are repeated (an equal chromosome appears before in the list).
+    replace_duplicates: Returns the next generation: the non-repeated individuals of the best 75% are kept, the repeated individuals and the worst 25% are replaced by new random valid individuals.
+
+The new individuals are generated in batches with generate_valid_chromosomes (see tools/initialization.py), with the random number generator of the run and an attempt and time budget: if the budget is exhausted (e.g. a very strict check_valid_individual), the remaining slots keep their old chromosomes instead of looping forever.
 """
+import random
+import numpy as np
+from .aux_functions.canonical import canonical_chromosome
+from .aux_functions.count_vector import counts_matrix
+from .initialization import generate_valid_chromosomes
+
+ATTEMPTS_PER_NEW_INDIVIDUAL = 1000  # 沒有給出 max_attempts 時，每個要生成的個體的候選染色體數量
 
 
-def keep_diversity(population, generate_chromosome, min_length_chromosome, max_length_chromosome, possible_genes, repeated_genes_allowed, check_valid_chromosome):
+def keep_diversity(population, generate_chromosome, min_length_chromosome, max_length_chromosome, possible_genes, repeated_genes_allowed, check_valid_chromosome, diversity_stats=None, rng=random, np_rng=None, max_attempts=None, max_time=None):
     """
-    此函數在希望強調族群多樣性時調用。當族群中出現重複的個體時，將其替換為全新隨機生成的個體。同時，最差的 25% 個體也被全新隨機個體所替代。
+    此函數在希望強調族群多樣性時調用。保留最好的 75% 中不重複的個體（最好的個體總是被保留），重複的個體和最差的 25% 個體被替換為全新隨機生成的有效個體（見 replace_duplicates）。
+    重複的個體以規範鍵（基因的 frozenset，如果允許重複基因則為多重集合，見 canonical_chromosome）的雜湊集合檢測，所以成本是 O(N·L)，並且不會修改族群的染色體。
     注意在調用此函數前，必須先按適應度對族群進行排序。
 
     :param population: (list of Individuals) 按適應度排序的族群（從最好到最差）。
@@ -18,32 +31,95 @@ def keep_diversity(population, generate_chromosome, min_length_chromosome, max_l
     :param possible_genes: (list of ...) 包含所有可能基因值的列表。
     :param repeated_genes_allowed: (bool) 指示染色體中的基因是否可以重複的布爾值。
     :param check_valid_chromosome: (function) 函數接收染色體，如果創建有效的個體則返回 True，否則返回 False。
+    :param diversity_stats: (dict or None) 如果不是 None，則在其中寫入 'duplicates'（最好的 75% 中重複的個體數量）、'new_individuals'（新生成的個體總數）和 'not_replaced'（因為超過預算而保留舊染色體的個體數量）。默認為 None。
+    :param rng: (random.Random) 隨機數生成器。默認為 random 模組。
+    :param np_rng: (numpy.random.Generator or None) NumPy 隨機數生成器。None 表示從 rng 獲取種子。默認為 None。
+    :param max_attempts: (int or None) 最多生成的候選染色體數量。None 表示每個要生成的個體 ATTEMPTS_PER_NEW_INDIVIDUAL 個。默認為 None。
+    :param max_time: (float or None) 生成新個體最多使用的時間（秒）。None 表示沒有限制。默認為 None。
+    :return:
+        (list of chromosomes) 將代表下一代的染色體列表。
+    """
+    list_chromosomes = [ind.chromosome for ind in population]  # 所有個體的染色體列表
+    is_duplicate = duplicated_individuals([canonical_chromosome(chromosome, repeated_genes_allowed) for chromosome in list_chromosomes])
+    return replace_duplicates(list_chromosomes, is_duplicate, generate_chromosome, min_length_chromosome, max_length_chromosome, possible_genes, repeated_genes_allowed, check_valid_chromosome, diversity_stats, rng, np_rng, max_attempts, max_time)
+
+
+def keep_diversity_counts(population, generate_chromosome, min_length_chromosome, max_length_chromosome, possible_genes, repeated_genes_allowed, check_valid_chromosome, diversity_stats=None, rng=random, np_rng=None, max_attempts=None, max_time=None):
+    """
+    此函數與 keep_diversity 相同，但是使用計數向量表示（見 aux_functions/count_vector.py）檢測重複的個體：兩個染色體相等當且僅當它們的計數向量相等。
+    注意染色體必須是基因的整數索引列表（possible_genes 是索引 0 到 n - 1 的列表，見 'gene_encoding'），並且在調用此函數前，必須先按適應度對族群進行排序。
+
+    :param population: (list of Individuals) 按適應度排序的族群（從最好到最差）。
+    :param generate_chromosome: (function) 生成新染色體的函數。
+    :param min_length_chromosome: (int) 染色體的最小允許長度。
+    :param max_length_chromosome: (int) 染色體的最大允許長度。
+    :param possible_genes: (list of int) 包含所有可能基因索引的列表。
+    :param repeated_genes_allowed: (bool) 指示染色體中的基因是否可以重複的布爾值。
+    :param check_valid_chromosome: (function) 函數接收染色體，如果創建有效的個體則返回 True，否則返回 False。
+    :param diversity_stats: (dict or None) 如果不是 None，則在其中寫入 'duplicates'、'new_individuals' 和 'not_replaced'（見 keep_diversity）。默認為 None。
+    :param rng: (random.Random) 隨機數生成器。默認為 random 模組。
+    :param np_rng: (numpy.random.Generator or None) NumPy 隨機數生成器。None 表示從 rng 獲取種子。默認為 None。
+    :param max_attempts: (int or None) 最多生成的候選染色體數量（見 keep_diversity）。默認為 None。
+    :param max_time: (float or None) 生成新個體最多使用的時間（秒）。None 表示沒有限制。默認為 None。
     :return:
         (list of chromosomes) 將代表下一代的染色體列表。
     """
-    new_population = [population[0].chromosome]  # 新族群列表，初始包括最優個體的染色體
     list_chromosomes = [ind.chromosome for ind in population]  # 所有個體的染色體列表
-    copy_list_chromosomes = list_chromosomes.copy()  # 染色體列表的副本
-    try:
-        for i in range(len(list_chromosomes)):
-            chrom = list_chromosomes[i]
-            if type(chrom[0]) in [int, float, str, chr]:
-                chrom.sort()  # 對基因進行排序，以正確移除重複個體
-            elif type(chrom[0]) == dict:
-                list_chromosomes[i] = sorted(chrom, key=lambda i: (list(i.keys())[0], list(i.values())[0]))  # 嘗試對字典類型的基因進行排序
-    except:
-        print('Sorting error in keep_diversity.')
-        list_chromosomes = copy_list_chromosomes.copy()  # 排序出錯時，使用原始染色體列表
-    for i in range(1, int(len(list_chromosomes) / 4)):  # 遍歷前 25% 的個體
-        if population[i].chromosome in list_chromosomes[:i]:
-            new_ind = generate_chromosome(min_length_chromosome, max_length_chromosome, possible_genes, repeated_genes_allowed)  # 生成新個體
-            while not check_valid_chromosome(new_ind):
-                new_ind = generate_chromosome(min_length_chromosome, max_length_chromosome, possible_genes, repeated_genes_allowed)  # 驗證新個體是否有效
-            new_population.append(new_ind)
-        else:
-            new_population.append(population[i].chromosome)
-    while len(new_population) < len(population):  # 為替換最差的 25% 增加新的隨機生成個體
-        new_ind = generate_chromosome(min_length_chromosome, max_length_chromosome, possible_genes, repeated_genes_allowed)
-        if check_valid_chromosome(new_ind):
-            new_population.append(new_ind)
+    matrix = counts_matrix(list_chromosomes, len(possible_genes))  # 每一行是一個染色體的計數向量
+    _, first_index, inverse = np.unique(matrix, axis=0, return_index=True, return_inverse=True)
+    is_duplicate = (first_index[inverse.reshape(-1)] < np.arange(len(list_chromosomes))).tolist()  # 如果前面已經有相同的計數向量，則為重複的個體
+    return replace_duplicates(list_chromosomes, is_duplicate, generate_chromosome, min_length_chromosome, max_length_chromosome, possible_genes, repeated_genes_allowed, check_valid_chromosome, diversity_stats, rng, np_rng, max_attempts, max_time)
+
+
+def duplicated_individuals(keys):
+    """
+    此函數返回每個染色體是否重複（列表中前面已經有相同的鍵）。使用雜湊集合，所以成本是 O(N)。
+
+    :param keys: (list of hashables) 每個染色體的規範鍵（見 canonical_chromosome）。
+    :return:
+        * (list of bool) 如果前面已經有相同的鍵，則為 True。
+    """
+    seen = set()
+    is_duplicate = []
+    for key in keys:
+        is_duplicate.append(key in seen)
+        seen.add(key)
+    return is_duplicate
+
+
+def replace_duplicates(list_chromosomes, is_duplicate, generate_chromosome, min_length_chromosome, max_length_chromosome, possible_genes, repeated_genes_allowed, check_valid_chromosome, diversity_stats=None, rng=random, np_rng=None, max_attempts=None, max_time=None):
+    """
+    此函數返回下一代的染色體列表：保留最好的 75% 中不重複的個體（最好的個體總是被保留），重複的個體和最差的 25% 個體被替換為全新隨機生成的有效個體。
+    新個體以 generate_valid_chromosomes 批量生成（有嘗試次數和時間的預算）。如果超過預算，剩餘的位置保留其舊染色體（先替換重複的個體，再替換最差的個體），而不是無限循環。
+
+    :param list_chromosomes: (list of chromosomes) 按適應度排序的染色體列表（從最好到最差）。
+    :param is_duplicate: (list of bool) 每個染色體是否重複（見 duplicated_individuals）。
+    :param generate_chromosome: (function) 生成新染色體的函數。
+    :param min_length_chromosome: (int) 染色體的最小允許長度。
+    :param max_length_chromosome: (int) 染色體的最大允許長度。
+    :param possible_genes: (list of ...) 包含所有可能基因值的列表。
+    :param repeated_genes_allowed: (bool) 指示染色體中的基因是否可以重複的布爾值。
+    :param check_valid_chromosome: (function) 函數接收染色體，如果創建有效的個體則返回 True，否則返回 False。
+    :param diversity_stats: (dict or None) 如果不是 None，則在其中寫入 'duplicates'、'new_individuals' 和 'not_replaced'（見 keep_diversity）。默認為 None。
+    :param rng: (random.Random) 隨機數生成器。默認為 random 模組。
+    :param np_rng: (numpy.random.Generator or None) NumPy 隨機數生成器。None 表示從 rng 獲取種子。默認為 None。
+    :param max_attempts: (int or None) 最多生成的候選染色體數量。None 表示每個要生成的個體 ATTEMPTS_PER_NEW_INDIVIDUAL 個。默認為 None。
+    :param max_time: (float or None) 生成新個體最多使用的時間（秒）。None 表示沒有限制。默認為 None。
+    :return:
+        (list of chromosomes) 將代表下一代的染色體列表。
+    """
+    size_kept = len(list_chromosomes) - int(len(list_chromosomes) / 4)  # 最差的 25% 個體總是被替換
+    duplicates = [i for i in range(1, size_kept) if is_duplicate[i]]  # 最好的個體總是被保留
+    replaced = duplicates + list(range(size_kept, len(list_chromosomes)))  # 要替換的位置（先替換重複的個體）
+    if max_attempts is None:
+        max_attempts = ATTEMPTS_PER_NEW_INDIVIDUAL * len(replaced)
+    new_chromosomes, _ = generate_valid_chromosomes(len(replaced), generate_chromosome, min_length_chromosome, max_length_chromosome, possible_genes, repeated_genes_allowed, check_valid_chromosome,
+                                                    max_attempts=max_attempts, max_time=max_time, rng=rng, np_rng=np_rng, partial=True)
+    new_population = list(list_chromosomes)
+    for i, new_chromosome in zip(replaced, new_chromosomes):
+        new_population[i] = new_chromosome
+    if diversity_stats is not None:
+        diversity_stats['duplicates'] = len(duplicates)
+        diversity_stats['new_individuals'] = len(new_chromosomes)
+        diversity_stats['not_replaced'] = len(replaced) - len(new_chromosomes)
     return new_population
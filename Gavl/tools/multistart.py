@@ -0,0 +1,165 @@
+"""
+In this file it is defined the multi-start runner: as the GA is stochastic, the same configuration is usually optimized several times with different seeds and the best result is kept. The independent runs are executed in a pool of processes (each run starts from a fresh copy of the configured Gavl instance and with its own seed) and, when the termination criteria is 'goal_fitness_reached', the remaining runs are cancelled as soon as one run reaches the goal.
+
+Functions:
+    run_once: Runs one optimization with a given seed, stopping early if a shared event is set.
+    cancelled_result: Returns the result of a run that was cancelled before starting.
+    goal_reached: Returns if a fitness value reaches the goal of the termination criteria 'goal_fitness_reached'.
+    report_progress: Prints the progress when a run finishes (the runs do not print their own progress).
+    run_independent: Runs several independent optimizations (in parallel) and aggregates their results.
+"""
+import os
+import copy
+import random
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed, CancelledError
+from .individual import Individual
+
+_template_ga = None  # 工作進程中已配置的 Gavl 實例（每次運行使用它的副本）
+_cancel_event = None  # 工作進程中共享的取消事件
+
+
+def _init_worker(ga, cancel_event):
+    """ 工作進程的初始化函數：保存已配置的 Gavl 實例和共享的取消事件。使用 'fork' 啟動方法時，它們不需要被序列化。 """
+    global _template_ga, _cancel_event
+    _template_ga = ga
+    _cancel_event = cancel_event
+
+
+def _run_in_worker(seed):
+    """ 在工作進程中以已配置的 Gavl 實例的新副本運行一次優化。注意它必須定義在模組層級，以便能夠被傳送到其他進程。 """
+    return run_once(copy.deepcopy(_template_ga), seed, _cancel_event)
+
+
+def run_once(ga, seed, cancel_event=None):
+    """
+    此函數以給定的種子運行一次優化（見 Gavl.optimize）。在每一代之前檢查取消事件，如果它被設置，則停止優化並返回目前為止的最佳個體。
+    運行不打印每一代的進度（'show_progress' 被設為 0），進度由 run_independent 在每次運行結束時報告。
+
+    :param ga: (Gavl) 已配置的 Gavl 實例（會被修改）。
+    :param seed: (int) 運行的種子（算子的隨機數生成器和 random 模組的種子）。
+    :param cancel_event: (multiprocessing.Event or None) 共享的取消事件。None 表示不能取消。默認為 None。
+    :return:
+        * (dict) 運行的結果：'seed'、'status'（'completed' 或 'cancelled'）、'best_chromosome'、'best_fitness' 和 'best_fitness_per_generation'。
+    """
+    if cancel_event is not None and cancel_event.is_set():  # 在開始之前已被取消
+        return cancelled_result(seed)
+    random.seed(seed)  # 用於不接受 rng 的自定義算子
+    ga.show_progress = 0  # 並行的運行不打印交錯的進度
+    cancelled = False
+    ga._start_run(rng=random.Random(seed))
+    try:
+        while not ga._check_termination_criteria_function(ga._termination_criteria_args):
+            if cancel_event is not None and cancel_event.is_set():
+                cancelled = True
+                break
+            ga._run_generation()
+        ga._Population__calculate_fitness_and_sort()  # 計算適應度並排序
+    finally:
+        ga._finish_run()
+    best_individual = ga.best_individual()
+    return {'seed': seed, 'status': 'cancelled' if cancelled else 'completed', 'best_chromosome': best_individual.chromosome, 'best_fitness': best_individual.fitness_value, 'best_fitness_per_generation': list(ga.best_fitness_per_generation)}
+
+
+def cancelled_result(seed):
+    """
+    此函數返回在開始之前被取消的運行的結果。
+
+    :param seed: (int) 運行的種子。
+    :return:
+        * (dict) 運行的結果（見 run_once），沒有最佳個體。
+    """
+    return {'seed': seed, 'status': 'cancelled', 'best_chromosome': None, 'best_fitness': None, 'best_fitness_per_generation': []}
+
+
+def goal_reached(ga, fitness_value):
+    """
+    此函數返回適應度值是否達到終止條件 'goal_fitness_reached' 的目標。如果終止條件不是 'goal_fitness_reached'，則返回 False。
+
+    :param ga: (Gavl) 已配置的 Gavl 實例。
+    :param fitness_value: (float or None) 適應度值。
+    :return:
+        * (bool) 如果達到目標，則為 True。
+    """
+    if fitness_value is None or 'goal_fitness_reached' not in ga.termination_criteria:
+        return False
+    goal_fitness = ga.termination_criteria['goal_fitness_reached']
+    return fitness_value <= goal_fitness if ga.minimize else fitness_value >= goal_fitness
+
+
+def report_progress(ga, run_result, finished_runs, n_runs):
+    """
+    此函數在一次運行結束時打印進度（如果 ga 的 'show_progress' 是 1），代替每次運行每一代的進度。
+
+    :param ga: (Gavl) 已配置的 Gavl 實例。
+    :param run_result: (dict) 結束的運行的結果（見 run_once）。
+    :param finished_runs: (int) 已結束的運行數量。
+    :param n_runs: (int) 運行的總數。
+    """
+    if ga.show_progress:
+        print('Run: {}/{} (best fitness: {})'.format(finished_runs, n_runs, run_result['best_fitness']))
+
+
+def run_independent(ga, n_runs, workers=None, seed=None, start_method=None):
+    """
+    此函數以不同的種子運行 n_runs 次獨立的優化（每次使用已配置的 Gavl 實例的新副本，所以 ga 不會被修改），並返回所有運行中的最佳個體。
+    運行在進程池中並行執行。如果終止條件是 'goal_fitness_reached'，當一次運行達到目標時，尚未開始的運行被取消，正在進行的運行在下一代之前停止。
+
+    :param ga: (Gavl) 已配置的 Gavl 實例。
+    :param n_runs: (int) 運行的次數。
+    :param workers: (int or None) 池中的進程數量。None 表示 CPU 的數量；1 表示在當前進程中依次運行。默認為 None。
+    :param seed: (int or None) 用於生成每次運行的種子的種子。None 表示從 random 模組獲取種子。默認為 None。
+    :param start_method: (str or None) multiprocessing 的啟動方法。None 表示平台的默認方法。注意除了 'fork' 以外，Gavl 實例（包括其函數）必須可以被序列化（pickle）。默認為 None。
+    :return:
+        * :best_individual: (Individual or None) 所有運行中的最佳個體（None 表示沒有運行返回結果）。
+        * :run_results: (list of dicts) 每次運行的結果（見 run_once），按運行的順序排列。
+    """
+    if type(n_runs) != int or n_runs < 1:
+        raise ValueError('運行的次數必須是大於 0 的整數。')
+    if workers is not None and (type(workers) != int or workers < 1):
+        raise ValueError('進程的數量必須是大於 0 的整數或 None。')
+    seed_rng = random.Random(seed) if seed is not None else random
+    seeds = [seed_rng.getrandbits(64) for _ in range(n_runs)]
+    workers = min(workers if workers is not None else (os.cpu_count() or 1), n_runs)
+    run_results = [None] * n_runs
+    if workers == 1:  # 在當前進程中依次運行（不改變 random 模組的狀態）
+        random_state = random.getstate()
+        try:
+            for i, run_seed in enumerate(seeds):
+                if i and goal_reached(ga, run_results[i - 1]['best_fitness']):  # 達到目標 ---> 取消剩餘的運行
+                    break
+                run_results[i] = run_once(copy.deepcopy(ga), run_seed)
+                report_progress(ga, run_results[i], i + 1, n_runs)
+        finally:
+            random.setstate(random_state)
+    else:
+        context = multiprocessing.get_context(start_method)
+        cancel_event = context.Event()
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=_init_worker, initargs=(ga, cancel_event)) as executor:
+            futures = {executor.submit(_run_in_worker, run_seed): i for i, run_seed in enumerate(seeds)}
+            try:
+                for future in as_completed(futures):
+                    i = futures[future]
+                    try:
+                        run_results[i] = future.result()
+                    except CancelledError:
+                        continue
+                    report_progress(ga, run_results[i], sum(result is not None for result in run_results), n_runs)
+                    if goal_reached(ga, run_results[i]['best_fitness']) and not cancel_event.is_set():  # 達到目標 ---> 取消其他運行
+                        cancel_event.set()
+                        for other_future in futures:
+                            other_future.cancel()
+            except BaseException:
+                cancel_event.set()
+                for future in futures:
+                    future.cancel()
+                raise
+    run_results = [result if result is not None else cancelled_result(run_seed) for result, run_seed in zip(run_results, seeds)]  # 沒有開始的運行
+    finished_runs = [result for result in run_results if result['best_fitness'] is not None]
+    if not finished_runs:
+        return None, run_results
+    best = min if ga.minimize else max
+    best_run = best(finished_runs, key=lambda result: result['best_fitness'])
+    best_individual = Individual(best_run['best_chromosome'])
+    best_individual.set_fitness_value(best_run['best_fitness'])
+    return best_individual, run_results
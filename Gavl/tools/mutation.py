@@ -5,89 +5,103 @@ Function:
     mutation: Function that performs mutation.
     mutate_genes_manner: Auxiliary function to make the mutation by changing the genes.
     mutate_length_manner: Auxiliary function to make the mutation in length.
+    mutate_genes_manner_large_alphabet: Auxiliary function to make the mutation by changing the genes when there are many possible genes (without building the complement of the chromosome).
+    mutate_length_manner_large_alphabet: Auxiliary function to make the mutation in length when there are many possible genes (without building the complement of the chromosome).
+    mutation_bitset: Function that performs mutation with the bitset representation of the chromosomes.
+    mutate_genes_manner_bitset: Auxiliary function to make the mutation by changing the genes (bitset representation).
+    mutate_length_manner_bitset: Auxiliary function to make the mutation in length (bitset representation).
+    mutation_counts: Function that performs mutation with the count vector representation of the chromosomes.
+    mutate_genes_manner_counts: Auxiliary function to make the mutation by changing the genes (count vector representation).
+    mutate_length_manner_counts: Auxiliary function to make the mutation in length (count vector representation).
 """
 import random
-from .aux_functions.combinations import combinations
+from .aux_functions.random_combinations import random_combinations, random_combination_pairs, sample_combination, sample_excluding
+from .aux_functions.canonical import freeze_gene
+from .aux_functions.bitset import to_bitset, sample_complement
+from .aux_functions.count_vector import to_counts, from_counts, sample_counts
 
 
-def mutation(chromosomes_to_mutate, mutation_type, max_num_gen_changed_mutation, min_length_chromosome, max_length_chromosome, repeated_genes_allowed, check_valid_individual, possible_genes):
-    """ 這個函數接收染色體並對其元素進行隨機突變。它會迭代所有可能的突變，直到找到一個為止，此時執行停止。如果沒有找到突變，則返回輸入的染色體。請注意，使用函數 check_valid_individual 來測試創建的個體，如果對同一個體進行了1000次不成功的突變，則將其視為無法突變的個體，並返回其原始染色體。 """
+def mutation(chromosomes_to_mutate, mutation_type, max_num_gen_changed_mutation, min_length_chromosome, max_length_chromosome, repeated_genes_allowed, check_valid_individual, possible_genes, large_alphabet=0, rng=random):
+    """ 這個函數接收染色體並對其元素進行隨機突變。它會隨機抽取（不重複的）可能的突變，直到找到一個有效的突變為止，此時執行停止。如果沒有找到突變，則返回輸入的染色體。請注意，使用函數 check_valid_individual 來測試創建的個體，如果對同一個體進行了1000次不成功的突變，則將其視為無法突變的個體，並返回其原始染色體。
+    如果 large_alphabet 為 1 且不允許重複基因，則不構造不在染色體中的可能基因列表（其成本與可能的基因數量成正比），而是以拒絕抽樣選擇新基因，所以成本與染色體長度成正比。
+    所有的隨機抽取都使用 rng（random.Random 實例，默認為 random 模組），所以給定種子的運行是可重現的，並且不同的 Gavl 實例互不干擾。 """
     if mutation_type not in ['mut_gene', 'addsub_gene', 'both']:  # 檢查突變類型是否在指定範圍內
         raise ValueError("The parameter 'mutation_type' can only take the values 'mut_gene', 'addsub_gene' or 'both'.")
     list_new_mutated_chromosomes = []  # 初始化一個列表來存儲突變後的染色體
     for chromosome in chromosomes_to_mutate:  # 遍歷每一條需要突變的染色體
+        if large_alphabet and not repeated_genes_allowed:  # 大字母表模式：不構造補集列表
+            if (mutation_type == 'mut_gene') or ((mutation_type == 'both') and (rng.random() <= 0.5)):
+                new_mutated_chromosome = mutate_genes_manner_large_alphabet(chromosome, max_num_gen_changed_mutation, possible_genes, check_valid_individual, rng)
+            else:
+                new_mutated_chromosome = mutate_length_manner_large_alphabet(chromosome, max_num_gen_changed_mutation, min_length_chromosome, max_length_chromosome, possible_genes, check_valid_individual, rng)
+            list_new_mutated_chromosomes.append(new_mutated_chromosome)  # 將突變後的染色體添加到列表中
+            continue
         if repeated_genes_allowed:  # 如果允許重複基因
             mutation_genes = possible_genes  # 使用所有可能的基因作為突變基因
         else:  # 如果不允許重複基因
             mutation_genes = [e for e in possible_genes if e not in chromosome]  # 選擇未在當前染色體中的基因作為突變基因
-        both_mutations_selection = int(random.random() > 0.5)  # 如果突變類型為'both'，隨機選擇突變類型
+        both_mutations_selection = int(rng.random() > 0.5)  # 如果突變類型為'both'，隨機選擇突變類型
         # 開始突變演算法
         if (mutation_type == 'mut_gene') or ((mutation_type == 'both') and (both_mutations_selection == 0)):  # 如果是單基因突變或隨機選擇了單基因突變
-            new_mutated_chromosome = mutate_genes_manner(chromosome, max_num_gen_changed_mutation, mutation_genes, check_valid_individual)  # 進行基因突變
+            new_mutated_chromosome = mutate_genes_manner(chromosome, max_num_gen_changed_mutation, mutation_genes, check_valid_individual, rng)  # 進行基因突變
             list_new_mutated_chromosomes.append(new_mutated_chromosome)  # 將突變後的染色體添加到列表中
         elif (mutation_type == 'addsub_gene') or ((mutation_type == 'both') and (both_mutations_selection == 1)):  # 如果是基因數目增減突變或隨機選擇了基因數目增減突變
-            new_mutated_chromosome = mutate_length_manner(chromosome, max_num_gen_changed_mutation, min_length_chromosome, max_length_chromosome, mutation_genes, check_valid_individual)  # 進行基因長度的調整突變
+            new_mutated_chromosome = mutate_length_manner(chromosome, max_num_gen_changed_mutation, min_length_chromosome, max_length_chromosome, mutation_genes, check_valid_individual, rng)  # 進行基因長度的調整突變
             list_new_mutated_chromosomes.append(new_mutated_chromosome)  # 將突變後的染色體添加到列表中
     return list_new_mutated_chromosomes  # 返回所有突變後的染色體列表
 
 
-def mutate_genes_manner(chromosome, max_num_gen_changed_mutation, mutation_genes, check_valid_individual):
+def mutate_genes_manner(chromosome, max_num_gen_changed_mutation, mutation_genes, check_valid_individual, rng=random):
     """ 這個函數執行基因的突變（不涉及長度的變化）。
 
     :param chromosome: (list of genes) 需要突變的染色體。
     :param max_num_gen_changed_mutation: (int) 單次突變中最大可改變的基因數量。
     :param mutation_genes: (list of genes) 可用於突變的基因列表（這些基因不在個體中）。
     :param check_valid_individual: (function) 函數，接收一個染色體並返回一個布林值，表示該染色體是否構成一個有效的個體。
+    :param rng: (random.Random) 隨機數生成器。默認為 random 模組。
     :return:
         * :new_chromosome: (list of genes) 突變後的新染色體。
     """
-    random.shuffle(chromosome)  # 對染色體進行隨機排序
-    random.shuffle(mutation_genes)  # 對可突變基因進行隨機排序
     # 隨機獲取變更基因的數量
     num_genes_to_mutate = list(range(1, min(max_num_gen_changed_mutation, len(mutation_genes), len(chromosome)) + 1))  # 從可變更的基因數量中生成範圍列表
-    random.shuffle(num_genes_to_mutate)  # 對基因變更數量列表進行隨機排序
+    rng.shuffle(num_genes_to_mutate)  # 對基因變更數量列表進行隨機排序
     count_mutations_tried = 0  # 計算嘗試的突變次數
     # 開始執行突變演算法
     for num_gen in num_genes_to_mutate:  # 選取一定數量的基因進行突變
-        genes_in_combinations = combinations(mutation_genes, num_gen)  # 從突變基因中選取可能的組合
-        for gen_in_comb in genes_in_combinations:
-            genes_out_combinations = combinations(chromosome, num_gen)  # 從當前染色體中選取將被替換的基因組合
-            for gen_out_comb in genes_out_combinations:
-                count_mutations_tried += 1  # 突變嘗試次數加一
-                new_chromosome = chromosome.copy()  # 複製當前染色體以進行突變
-                for gen in gen_out_comb:
-                    new_chromosome.remove(gen)  # 從染色體中移除舊的基因
-                new_chromosome.extend(gen_in_comb)  # 向染色體中添加新的基因
-                if check_valid_individual(new_chromosome):  # 檢查新染色體是否有效
-                    return new_chromosome  # 如果有效則返回新染色體
-                if count_mutations_tried >= 1000:  # 如果嘗試突變達到1000次仍未成功，則中斷
-                    return chromosome  # 返回原始染色體
+        # 隨機選取（不重複的）新基因組合和將被替換的基因組合
+        for gen_in_comb, gen_out_comb in random_combination_pairs(mutation_genes, num_gen, chromosome, num_gen, unique=True, rng=rng):
+            count_mutations_tried += 1  # 突變嘗試次數加一
+            new_chromosome = chromosome.copy()  # 複製當前染色體以進行突變
+            for gen in gen_out_comb:
+                new_chromosome.remove(gen)  # 從染色體中移除舊的基因
+            new_chromosome.extend(gen_in_comb)  # 向染色體中添加新的基因
+            if check_valid_individual(new_chromosome):  # 檢查新染色體是否有效
+                return new_chromosome  # 如果有效則返回新染色體
+            if count_mutations_tried >= 1000:  # 如果嘗試突變達到1000次仍未成功，則中斷
+                return chromosome  # 返回原始染色體
     return chromosome  # 如果未找到有效的突變，則返回原始染色體
 
 
-def mutate_length_manner(chromosome, max_num_gen_changed_mutation, min_length_chromosome, max_length_chromosome, mutation_genes, check_valid_individual):
+def mutate_length_manner(chromosome, max_num_gen_changed_mutation, min_length_chromosome, max_length_chromosome, mutation_genes, check_valid_individual, rng=random):
     """進行染色體長度的突變（添加或刪除基因）"""
-    random.shuffle(chromosome)  # 對染色體隨機排序
-    random.shuffle(mutation_genes)  # 對可能的突變基因隨機排序
     # 決定是添加還是刪除基因
     if len(chromosome) == min_length_chromosome:  # 如果達到最小長度，則添加基因
         add = 1
     elif len(chromosome) == max_length_chromosome:  # 如果達到最大長度，則刪除基因
         add = 0
     else:
-        add = int(random.random() > 0.5)  # 隨機決定添加或刪除
+        add = int(rng.random() > 0.5)  # 隨機決定添加或刪除
     # 根據添加或刪除選擇改變的基因數目
     if add:
         num_genes_to_mutate = list(range(1, min(max_num_gen_changed_mutation, len(mutation_genes), max_length_chromosome - len(chromosome)) + 1))  # 建立添加基因的數目範圍
     else:
         num_genes_to_mutate = list(range(1, min(max_num_gen_changed_mutation, len(chromosome) - min_length_chromosome) + 1))  # 建立刪除基因的數目範圍
-    random.shuffle(num_genes_to_mutate)  # 對數目列表進行隨機排序
+    rng.shuffle(num_genes_to_mutate)  # 對數目列表進行隨機排序
     count_mutations_tried = 0  # 計數試圖突變的次數
     # 開始突變演算法
     if add:  # 添加基因的情況
         for num_gen in num_genes_to_mutate:
-            genes_in_combinations = combinations(mutation_genes, num_gen)  # 從可能的突變基因中選出組合
-            for gen_comb in genes_in_combinations:
+            for gen_comb in random_combinations(mutation_genes, num_gen, unique=True, rng=rng):  # 從可能的突變基因中隨機選出組合（不重複）
                 count_mutations_tried += 1
                 new_chromosome = chromosome.copy()
                 new_chromosome.extend(gen_comb)  # 將新基因添加到染色體中
@@ -97,8 +111,7 @@ def mutate_length_manner(chromosome, max_num_gen_changed_mutation, min_length_ch
                     return chromosome
     else:  # 刪除基因的情況
         for num_gen in num_genes_to_mutate:
-            genes_in_combinations = combinations(chromosome, num_gen)  # 從染色體中選出將要刪除的基因組合
-            for gen_comb in genes_in_combinations:
+            for gen_comb in random_combinations(chromosome, num_gen, unique=True, rng=rng):  # 從染色體中隨機選出將要刪除的基因組合（不重複）
                 count_mutations_tried += 1
                 new_chromosome = chromosome.copy()
                 for gen in gen_comb:
@@ -108,3 +121,245 @@ def mutate_length_manner(chromosome, max_num_gen_changed_mutation, min_length_ch
                 if count_mutations_tried >= 1000:  # 如果嘗試了1000次仍未找到有效突變，則停止
                     return chromosome
     return chromosome  # 如果找不到有效的突變，返回原染色體
+
+
+def mutate_genes_manner_large_alphabet(chromosome, max_num_gen_changed_mutation, possible_genes, check_valid_individual, rng=random):
+    """ 這個函數執行基因的突變（不涉及長度的變化），用於可能的基因很多且不允許重複基因的情況。新基因以拒絕抽樣從不在染色體中的基因中選擇（見 sample_excluding），
+    所以每次嘗試的成本與染色體長度成正比，而不是與可能的基因數量成正比。
+
+    :param chromosome: (list of genes) 需要突變的染色體。
+    :param max_num_gen_changed_mutation: (int) 單次突變中最大可改變的基因數量。
+    :param possible_genes: (list of genes) 所有可能的基因列表。
+    :param check_valid_individual: (function) 函數，接收一個染色體並返回一個布林值，表示該染色體是否構成一個有效的個體。
+    :param rng: (random.Random) 隨機數生成器。默認為 random 模組。
+    :return:
+        * :new_chromosome: (list of genes) 突變後的新染色體。
+    """
+    chromosome_genes = {freeze_gene(gen) for gen in chromosome}  # 染色體的基因集合（用於拒絕抽樣）
+    num_genes_to_mutate = list(range(1, min(max_num_gen_changed_mutation, len(possible_genes) - len(chromosome_genes), len(chromosome)) + 1))  # 可變更的基因數量
+    if not num_genes_to_mutate:
+        return chromosome
+    rng.shuffle(num_genes_to_mutate)  # 對基因變更數量列表進行隨機排序
+    for count_mutations_tried in range(1000):  # 最多嘗試1000次突變
+        num_gen = num_genes_to_mutate[count_mutations_tried % len(num_genes_to_mutate)]
+        new_chromosome = chromosome.copy()
+        for gen in sample_combination(chromosome, num_gen, rng):
+            new_chromosome.remove(gen)  # 從染色體中移除舊的基因
+        new_chromosome.extend(sample_excluding(possible_genes, chromosome_genes, num_gen, rng))  # 向染色體中添加新的基因（不在染色體中）
+        if check_valid_individual(new_chromosome):  # 檢查新染色體是否有效
+            return new_chromosome
+    return chromosome  # 如果未找到有效的突變，則返回原始染色體
+
+
+def mutate_length_manner_large_alphabet(chromosome, max_num_gen_changed_mutation, min_length_chromosome, max_length_chromosome, possible_genes, check_valid_individual, rng=random):
+    """ 進行染色體長度的突變（添加或刪除基因），用於可能的基因很多且不允許重複基因的情況（見 mutate_genes_manner_large_alphabet）。
+
+    :param chromosome: (list of genes) 需要突變的染色體。
+    :param max_num_gen_changed_mutation: (int) 單次突變中最大可改變的基因數量。
+    :param min_length_chromosome: (int) 染色體的最小允許長度。
+    :param max_length_chromosome: (int) 染色體的最大允許長度。
+    :param possible_genes: (list of genes) 所有可能的基因列表。
+    :param check_valid_individual: (function) 函數，接收一個染色體並返回一個布林值，表示該染色體是否構成一個有效的個體。
+    :param rng: (random.Random) 隨機數生成器。默認為 random 模組。
+    :return:
+        * :new_chromosome: (list of genes) 突變後的新染色體。
+    """
+    chromosome_genes = {freeze_gene(gen) for gen in chromosome}  # 染色體的基因集合（用於拒絕抽樣）
+    # 決定是添加還是刪除基因
+    if len(chromosome) == min_length_chromosome:  # 如果達到最小長度，則添加基因
+        add = 1
+    elif len(chromosome) == max_length_chromosome:  # 如果達到最大長度，則刪除基因
+        add = 0
+    else:
+        add = int(rng.random() > 0.5)  # 隨機決定添加或刪除
+    if add:
+        num_genes_to_mutate = list(range(1, min(max_num_gen_changed_mutation, len(possible_genes) - len(chromosome_genes), max_length_chromosome - len(chromosome)) + 1))  # 添加基因的數目範圍
+    else:
+        num_genes_to_mutate = list(range(1, min(max_num_gen_changed_mutation, len(chromosome) - min_length_chromosome) + 1))  # 刪除基因的數目範圍
+    if not num_genes_to_mutate:
+        return chromosome
+    rng.shuffle(num_genes_to_mutate)  # 對數目列表進行隨機排序
+    for count_mutations_tried in range(1000):  # 最多嘗試1000次突變
+        num_gen = num_genes_to_mutate[count_mutations_tried % len(num_genes_to_mutate)]
+        if add:
+            new_chromosome = chromosome + sample_excluding(possible_genes, chromosome_genes, num_gen, rng)  # 添加新基因（不在染色體中）
+        else:
+            new_chromosome = chromosome.copy()
+            for gen in sample_combination(chromosome, num_gen, rng):
+                new_chromosome.remove(gen)  # 從染色體中移除選定的基因
+        if check_valid_individual(new_chromosome):  # 檢查新的染色體是否有效
+            return new_chromosome
+    return chromosome  # 如果找不到有效的突變，返回原染色體
+
+
+def mutation_bitset(chromosomes_to_mutate, mutation_type, max_num_gen_changed_mutation, min_length_chromosome, max_length_chromosome, repeated_genes_allowed, check_valid_individual, possible_genes, rng=random):
+    """ 這個函數與 mutation 相同，但是使用位集表示（見 aux_functions/bitset.py）：不需要構造可能基因的補集列表，新基因通過補集抽樣獲得。每個染色體只轉換為位集一次，突變後的染色體由列表減去移除的基因再加上新的基因構造（不在每次嘗試中解碼位集），並且由小到大排序。
+    當染色體相對於可能的基因數量較密集時（例如幾千個可能的基因）應選擇位集表示；對於非常大的字母表和短的染色體，列表表示（'large_alphabet' = 1）更快。它只能用於不允許重複基因的情況，並且染色體必須是基因的整數索引列表（possible_genes 是索引 0 到 n - 1 的列表，見 'gene_encoding'）。如果對同一個體進行了1000次不成功的突變，則返回其原始染色體。 """
+    if mutation_type not in ['mut_gene', 'addsub_gene', 'both']:  # 檢查突變類型是否在指定範圍內
+        raise ValueError("The parameter 'mutation_type' can only take the values 'mut_gene', 'addsub_gene' or 'both'.")
+    if repeated_genes_allowed:
+        raise ValueError('位集表示只能用於不允許重複基因的情況（repeated_genes_allowed = 0）。')
+    number_of_possible_genes = len(possible_genes)  # 可能的基因數量
+    list_new_mutated_chromosomes = []  # 初始化一個列表來存儲突變後的染色體
+    for chromosome in chromosomes_to_mutate:  # 遍歷每一條需要突變的染色體
+        both_mutations_selection = int(rng.random() > 0.5)  # 如果突變類型為'both'，隨機選擇突變類型
+        if (mutation_type == 'mut_gene') or ((mutation_type == 'both') and (both_mutations_selection == 0)):  # 如果是單基因突變或隨機選擇了單基因突變
+            new_mutated_chromosome = mutate_genes_manner_bitset(chromosome, max_num_gen_changed_mutation, number_of_possible_genes, check_valid_individual, rng)
+        else:  # 如果是基因數目增減突變或隨機選擇了基因數目增減突變
+            new_mutated_chromosome = mutate_length_manner_bitset(chromosome, max_num_gen_changed_mutation, min_length_chromosome, max_length_chromosome, number_of_possible_genes, check_valid_individual, rng)
+        list_new_mutated_chromosomes.append(new_mutated_chromosome)  # 將突變後的染色體添加到列表中
+    return list_new_mutated_chromosomes  # 返回所有突變後的染色體列表
+
+
+def mutate_genes_manner_bitset(chromosome, max_num_gen_changed_mutation, number_of_possible_genes, check_valid_individual, rng=random):
+    """ 這個函數執行基因的突變（不涉及長度的變化），使用位集表示。
+
+    :param chromosome: (list of int) 需要突變的染色體。
+    :param max_num_gen_changed_mutation: (int) 單次突變中最大可改變的基因數量。
+    :param number_of_possible_genes: (int) 可能的基因數量。
+    :param check_valid_individual: (function) 函數，接收一個染色體並返回一個布林值，表示該染色體是否構成一個有效的個體。
+    :param rng: (random.Random) 隨機數生成器。默認為 random 模組。
+    :return:
+        * :new_chromosome: (list of int) 突變後的新染色體。
+    """
+    bitset = to_bitset(chromosome) if number_of_possible_genes < 3 * len(chromosome) + 2 * max_num_gen_changed_mutation else None  # 只轉換一次，並且只有當補集抽樣需要時（補集較小，見 sample_complement）
+    sorted_genes = sorted(chromosome)
+    genes = set(chromosome)
+    num_genes_to_mutate = list(range(1, min(max_num_gen_changed_mutation, number_of_possible_genes - len(chromosome), len(chromosome)) + 1))  # 可變更的基因數量
+    if not num_genes_to_mutate:
+        return chromosome
+    rng.shuffle(num_genes_to_mutate)  # 對基因變更數量列表進行隨機排序
+    for count_mutations_tried in range(1000):  # 最多嘗試1000次突變
+        num_gen = num_genes_to_mutate[count_mutations_tried % len(num_genes_to_mutate)]
+        genes_out = set(rng.sample(sorted_genes, num_gen))  # 將被替換的基因
+        genes_in = sample_complement(bitset, number_of_possible_genes, num_gen, rng, genes)  # 新的基因（不在染色體中）
+        new_chromosome = sorted([gene for gene in sorted_genes if gene not in genes_out] + genes_in)  # 不解碼位集（O(長度)）
+        if check_valid_individual(new_chromosome):  # 檢查新染色體是否有效
+            return new_chromosome
+    return chromosome  # 如果未找到有效的突變，則返回原始染色體
+
+
+def mutate_length_manner_bitset(chromosome, max_num_gen_changed_mutation, min_length_chromosome, max_length_chromosome, number_of_possible_genes, check_valid_individual, rng=random):
+    """ 進行染色體長度的突變（添加或刪除基因），使用位集表示。
+
+    :param chromosome: (list of int) 需要突變的染色體。
+    :param max_num_gen_changed_mutation: (int) 單次突變中最大可改變的基因數量。
+    :param min_length_chromosome: (int) 染色體的最小允許長度。
+    :param max_length_chromosome: (int) 染色體的最大允許長度。
+    :param number_of_possible_genes: (int) 可能的基因數量。
+    :param check_valid_individual: (function) 函數，接收一個染色體並返回一個布林值，表示該染色體是否構成一個有效的個體。
+    :param rng: (random.Random) 隨機數生成器。默認為 random 模組。
+    :return:
+        * :new_chromosome: (list of int) 突變後的新染色體。
+    """
+    bitset = to_bitset(chromosome) if number_of_possible_genes < 3 * len(chromosome) + 2 * max_num_gen_changed_mutation else None  # 只轉換一次，並且只有當補集抽樣需要時（補集較小，見 sample_complement）
+    sorted_genes = sorted(chromosome)
+    genes = set(chromosome)
+    # 決定是添加還是刪除基因
+    if len(chromosome) == min_length_chromosome:  # 如果達到最小長度，則添加基因
+        add = 1
+    elif len(chromosome) == max_length_chromosome:  # 如果達到最大長度，則刪除基因
+        add = 0
+    else:
+        add = int(rng.random() > 0.5)  # 隨機決定添加或刪除
+    if add:
+        num_genes_to_mutate = list(range(1, min(max_num_gen_changed_mutation, number_of_possible_genes - len(chromosome), max_length_chromosome - len(chromosome)) + 1))  # 添加基因的數目範圍
+    else:
+        num_genes_to_mutate = list(range(1, min(max_num_gen_changed_mutation, len(chromosome) - min_length_chromosome) + 1))  # 刪除基因的數目範圍
+    if not num_genes_to_mutate:
+        return chromosome
+    rng.shuffle(num_genes_to_mutate)  # 對數目列表進行隨機排序
+    for count_mutations_tried in range(1000):  # 最多嘗試1000次突變
+        num_gen = num_genes_to_mutate[count_mutations_tried % len(num_genes_to_mutate)]
+        if add:
+            new_chromosome = sorted(sorted_genes + sample_complement(bitset, number_of_possible_genes, num_gen, rng, genes))  # 添加新基因（不在染色體中）
+        else:
+            genes_out = set(rng.sample(sorted_genes, num_gen))
+            new_chromosome = [gene for gene in sorted_genes if gene not in genes_out]  # 移除基因
+        if check_valid_individual(new_chromosome):  # 檢查新的染色體是否有效
+            return new_chromosome
+    return chromosome  # 如果找不到有效的突變，返回原染色體
+
+
+def mutation_counts(chromosomes_to_mutate, mutation_type, max_num_gen_changed_mutation, min_length_chromosome, max_length_chromosome, repeated_genes_allowed, check_valid_individual, possible_genes, rng=random):
+    """ 這個函數與 mutation 相同，但是染色體被表示為計數向量（見 aux_functions/count_vector.py）：基因的添加和移除都是向量的加減法。
+    它只能用於允許重複基因的情況，並且染色體必須是基因的整數索引列表（possible_genes 是索引 0 到 n - 1 的列表，見 'gene_encoding'）。如果對同一個體進行了1000次不成功的突變，則返回其原始染色體。 """
+    if mutation_type not in ['mut_gene', 'addsub_gene', 'both']:  # 檢查突變類型是否在指定範圍內
+        raise ValueError("The parameter 'mutation_type' can only take the values 'mut_gene', 'addsub_gene' or 'both'.")
+    if not repeated_genes_allowed:
+        raise ValueError('計數向量表示只能用於允許重複基因的情況（repeated_genes_allowed = 1）。')
+    number_of_possible_genes = len(possible_genes)  # 可能的基因數量
+    list_new_mutated_chromosomes = []  # 初始化一個列表來存儲突變後的染色體
+    for chromosome in chromosomes_to_mutate:  # 遍歷每一條需要突變的染色體
+        both_mutations_selection = int(rng.random() > 0.5)  # 如果突變類型為'both'，隨機選擇突變類型
+        if (mutation_type == 'mut_gene') or ((mutation_type == 'both') and (both_mutations_selection == 0)):  # 如果是單基因突變或隨機選擇了單基因突變
+            new_mutated_chromosome = mutate_genes_manner_counts(chromosome, max_num_gen_changed_mutation, number_of_possible_genes, check_valid_individual, rng)
+        else:  # 如果是基因數目增減突變或隨機選擇了基因數目增減突變
+            new_mutated_chromosome = mutate_length_manner_counts(chromosome, max_num_gen_changed_mutation, min_length_chromosome, max_length_chromosome, number_of_possible_genes, check_valid_individual, rng)
+        list_new_mutated_chromosomes.append(new_mutated_chromosome)  # 將突變後的染色體添加到列表中
+    return list_new_mutated_chromosomes  # 返回所有突變後的染色體列表
+
+
+def mutate_genes_manner_counts(chromosome, max_num_gen_changed_mutation, number_of_possible_genes, check_valid_individual, rng=random):
+    """ 這個函數執行基因的突變（不涉及長度的變化），使用計數向量表示。
+
+    :param chromosome: (list of int) 需要突變的染色體。
+    :param max_num_gen_changed_mutation: (int) 單次突變中最大可改變的基因數量。
+    :param number_of_possible_genes: (int) 可能的基因數量。
+    :param check_valid_individual: (function) 函數，接收一個染色體並返回一個布林值，表示該染色體是否構成一個有效的個體。
+    :param rng: (random.Random) 隨機數生成器。默認為 random 模組。
+    :return:
+        * :new_chromosome: (list of int) 突變後的新染色體。
+    """
+    num_genes_to_mutate = list(range(1, min(max_num_gen_changed_mutation, len(chromosome)) + 1))  # 可變更的基因數量
+    if not num_genes_to_mutate:
+        return chromosome
+    counts = to_counts(chromosome, number_of_possible_genes)
+    rng.shuffle(num_genes_to_mutate)  # 對基因變更數量列表進行隨機排序
+    for count_mutations_tried in range(1000):  # 最多嘗試1000次突變
+        num_gen = num_genes_to_mutate[count_mutations_tried % len(num_genes_to_mutate)]
+        genes_out = sample_counts(counts, num_gen, rng)  # 將被替換的基因
+        genes_in = to_counts([rng.randrange(number_of_possible_genes) for _ in range(num_gen)], number_of_possible_genes)  # 新的基因（允許重複）
+        new_chromosome = from_counts(counts - genes_out + genes_in)
+        if check_valid_individual(new_chromosome):  # 檢查新染色體是否有效
+            return new_chromosome
+    return chromosome  # 如果未找到有效的突變，則返回原始染色體
+
+
+def mutate_length_manner_counts(chromosome, max_num_gen_changed_mutation, min_length_chromosome, max_length_chromosome, number_of_possible_genes, check_valid_individual, rng=random):
+    """ 進行染色體長度的突變（添加或刪除基因），使用計數向量表示。
+
+    :param chromosome: (list of int) 需要突變的染色體。
+    :param max_num_gen_changed_mutation: (int) 單次突變中最大可改變的基因數量。
+    :param min_length_chromosome: (int) 染色體的最小允許長度。
+    :param max_length_chromosome: (int) 染色體的最大允許長度。
+    :param number_of_possible_genes: (int) 可能的基因數量。
+    :param check_valid_individual: (function) 函數，接收一個染色體並返回一個布林值，表示該染色體是否構成一個有效的個體。
+    :param rng: (random.Random) 隨機數生成器。默認為 random 模組。
+    :return:
+        * :new_chromosome: (list of int) 突變後的新染色體。
+    """
+    # 決定是添加還是刪除基因
+    if len(chromosome) == min_length_chromosome:  # 如果達到最小長度，則添加基因
+        add = 1
+    elif len(chromosome) == max_length_chromosome:  # 如果達到最大長度，則刪除基因
+        add = 0
+    else:
+        add = int(rng.random() > 0.5)  # 隨機決定添加或刪除
+    if add:
+        num_genes_to_mutate = list(range(1, min(max_num_gen_changed_mutation, max_length_chromosome - len(chromosome)) + 1))  # 添加基因的數目範圍
+    else:
+        num_genes_to_mutate = list(range(1, min(max_num_gen_changed_mutation, len(chromosome) - min_length_chromosome) + 1))  # 刪除基因的數目範圍
+    if not num_genes_to_mutate:
+        return chromosome
+    counts = to_counts(chromosome, number_of_possible_genes)
+    rng.shuffle(num_genes_to_mutate)  # 對數目列表進行隨機排序
+    for count_mutations_tried in range(1000):  # 最多嘗試1000次突變
+        num_gen = num_genes_to_mutate[count_mutations_tried % len(num_genes_to_mutate)]
+        if add:
+            new_chromosome = from_counts(counts + to_counts([rng.randrange(number_of_possible_genes) for _ in range(num_gen)], number_of_possible_genes))  # 向量加法：添加新基因
+        else:
+            new_chromosome = from_counts(counts - sample_counts(counts, num_gen, rng))  # 向量減法：移除基因
+        if check_valid_individual(new_chromosome):  # 檢查新的染色體是否有效
+            return new_chromosome
+    return chromosome  # 如果找不到有效的突變，返回原染色體
@@ -7,19 +7,20 @@ Functions:
 import random
 
 
-def pairing(list_selected_ind):
+def pairing(list_selected_ind, rng=random):
     """
     這個函數執行隨機配對。注意，這個函數接受重複，且元素可能與自己配對。
     這種情況雖然很少發生，但可以作為精英過程使用。
 
     :param list_selected_ind: 包含被選中個體ID的列表。這是函數 roulette_selection 的輸出。
+    :param rng: (random.Random) 隨機數生成器。默認為 random 模組。
     :return:
         * :paired_ind: 包含配對個體ID的元組列表。
     """
     list_sel = list_selected_ind.copy()  # 複製輸入列表以避免修改原始數據
     if len(list_sel) % 2 == 1:  # 檢查列表長度是否為奇數
         list_sel.pop()  # 如果是奇數，移除列表中的最後一個元素
-    random.shuffle(list_sel)  # 對列表進行隨機排序
+    rng.shuffle(list_sel)  # 對列表進行隨機排序
     paired_ind = []  # 初始化配對列表
     while len(list_sel) > 0:  # 當列表中還有元素時，繼續配對過程
         # 從列表中移除最後兩個元素並將它們作為一對添加到配對列表中
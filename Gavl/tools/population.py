@@ -14,21 +14,28 @@ class Population(ABC):
     def __init__(self):
         """ 建構子。 """
         self.population = []  # 算法開始時將填充此列表，包含所有個體。
+        self._individuals_by_id = {}  # 個體ID -> 個體在人口列表中的位置，使 get_individual_by_id 的查找為 O(1)
+        self._sorted = False  # 人口是否已按適應度排序（人口的任何改變都會使其失效）
+        self._best_individual = None  # 快取的最佳個體（None 表示需要重新計算）
 
     def __set_population(self, population):
         """ 設置整個傳入的人口。警告：此方法會刪除人口中的所有先前個體。如果想保留舊個體，請使用 add_individual 方法。
         :param population: 個體或人口類的物件列表。
         :return: 無
         """
+        self.__invalidate_order()
         try:
             if isinstance(population, list) and all(isinstance(ind, list) for ind in population):  # 如果傳入的對象是染色體列表
                 self.population = []  # 重設人口
+                self._individuals_by_id = {}
                 for individual in population:
                     self.add_individual(individual)
             elif isinstance(population, list) and all(isinstance(ind, Individual) for ind in population):  # 如果傳入的對象是個體列表
                 self.population = population
+                self.__rebuild_index()
             elif isinstance(population, Population) and all(isinstance(ind, Individual) for ind in population.population):  # 如果傳入的是人口類的對象
                 self.population = population.population
+                self.__rebuild_index()
             else:
                 raise ValueError()
         except ValueError:
@@ -38,8 +45,9 @@ class Population(ABC):
 
     def __kill_and_reset_whole_population(self, new_population):
         """ 這是一個稍微複雜的方法。如果要創建一個新一代的人口，直接使用現有個體的對象重設其值會更快。
+        注意這個方法會追蹤哪些位置真正收到了新的染色體：如果新的染色體就是當前人口中某個已評估個體的染色體對象（例如精英，或交叉和突變失敗時返回的原始染色體），並且其內容與計算適應度時相同（自定義的算子可能就地修改染色體並返回同一個列表對象），則保留其適應度值，不需要重新計算。
         :param new_population: 個體或人口類的物件列表。
-        :return: 無
+        :return: (int) 保留了適應度值的個體數量（即跳過的適應度計算次數）。
         """
         if not hasattr(new_population, '__len__'):
             raise ValueError('傳入的參數必須是染色體列表、個體（Individual類）或完整的人口。')
@@ -48,16 +56,24 @@ class Population(ABC):
         else:
             try:
                 if isinstance(new_population, list) and all(isinstance(ind, list) for ind in new_population):  # 如果傳入的是染色體列表
-                    for i in range(len(self.population)):
-                        self.population[i].kill_and_reset(new_population[i])
+                    new_chromosomes = new_population
                 elif isinstance(new_population, list) and all(isinstance(ind, Individual) for ind in new_population):  # 如果傳入的是個體列表
-                    for i in range(len(self.population)):
-                        self.population[i].kill_and_reset(new_population[i].chromosome)
+                    new_chromosomes = [ind.chromosome for ind in new_population]
                 elif isinstance(new_population, Population) and all(isinstance(ind, Individual) for ind in new_population.population):  # 如果傳入的是人口類對象
-                    for i in range(len(self.population)):
-                        self.population[i].kill_and_reset(new_population[i].chromosome)
+                    new_chromosomes = [ind.chromosome for ind in new_population.population]
                 else:
                     raise ValueError()
+                self.__invalidate_order()
+                known_fitness = {id(ind.chromosome): (ind.chromosome, ind.fitness_value, ind._evaluated_chromosome) for ind in self.population if ind.fitness_value is not None and ind.evaluated_chromosome_unchanged(ind.chromosome)}  # 染色體對象 -> 已知的適應度（被就地修改的染色體除外）
+                num_kept = 0  # 保留了適應度值的個體數量
+                for i in range(len(self.population)):
+                    known = known_fitness.get(id(new_chromosomes[i]))
+                    if known is not None and known[0] is new_chromosomes[i]:  # 染色體沒有改變 ---> 保留適應度
+                        self.population[i].kill_and_reset(new_chromosomes[i], known[1], known[2])
+                        num_kept += 1
+                    else:
+                        self.population[i].kill_and_reset(new_chromosomes[i])
+                return num_kept
             except ValueError:
                 raise ValueError('人口必須是個體類的個體列表或染色體列表。')
             except Exception as e:
@@ -68,26 +84,42 @@ class Population(ABC):
         :param individual: 個體類的個體或表示染色體的列表。
         :return: 無
         """
+        self.__invalidate_order()
         if isinstance(individual, list):
             new_ind = Individual(individual)  # 創建新個體
             self.population.append(new_ind)  # 添加到人口
+            self._individuals_by_id[new_ind._id] = len(self.population) - 1  # 更新ID索引
         elif isinstance(individual, Individual):
             self.population.append(individual)  # 直接添加到人口
+            self._individuals_by_id[individual._id] = len(self.population) - 1  # 更新ID索引
         else:
             raise ValueError('參數必須是個體類的個體或代表染色體的列表。')
 
     def get_individual_by_id(self, id_individual):
-        """ 通過ID返回個體。如果沒有這個ID的個體，返回None。
+        """ 通過ID返回個體。如果沒有這個ID的個體，返回None。注意查找使用ID索引（字典），所以是 O(1) 而不是掃描整個人口。
+        索引保存每個個體的位置，並且在返回之前檢查該位置的個體仍然是這個ID的個體，所以在外部修改人口列表（替換、刪除、添加或排序個體）後索引會被重建，而不會返回已不在人口中的個體。
         :param id_individual: 個體的ID。
         :return: 找到的個體或None
         """
         if not isinstance(id_individual, str):
             raise ValueError('此方法必須接收個體的ID，該ID是字符串。')
         else:
-            for individual in self.population:
-                if individual._id == id_individual:
-                    return individual
-            return None  # 沒有找到該ID的個體
+            position = self._individuals_by_id.get(id_individual)
+            if position is None or position >= len(self.population) or self.population[position]._id != id_individual:  # 人口列表可能在外部被修改或已排序 ---> 重建索引
+                self.__rebuild_index()
+                position = self._individuals_by_id.get(id_individual)
+                if position is None:
+                    return None  # 沒有找到該ID的個體
+            return self.population[position]
+
+    def __invalidate_order(self):
+        """ 使排序的標記和快取的最佳個體失效（在人口或其適應度改變時調用）。 """
+        self._sorted = False
+        self._best_individual = None
+
+    def __rebuild_index(self):
+        """ 根據當前人口重建ID索引。 """
+        self._individuals_by_id = {individual._id: position for position, individual in enumerate(self.population)}
 
     def __calculate_normalized_fitness(self):
         """ 計算整個人口的標準化適應度（並將參數添加到每個個體的屬性normalized_fitness）。同樣的操作也適用於反向標準化適應度。
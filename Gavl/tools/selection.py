@@ -1,38 +1,205 @@
 """
-In this file it is defined the function to perform a roulette wheel selection.
-    
-Functions: 
+In this file it is defined the functions to perform the selection of the individuals for the crossover.
+
+Functions:
     roulette_selection: Given a list with the tuples (id_individual, normalized_fitness), this function calculates the a roulette wheel selection based in the normalized fitness.
+    stochastic_universal_sampling: Roulette wheel selection in which all the individuals are selected with a single spin.
+    tournament_selection: Selects the winners of random tournaments of a given size.
+    linear_rank_selection: Selection with probabilities that depend linearly on the rank of the individuals.
+    exponential_rank_selection: Selection with probabilities that depend exponentially on the rank of the individuals.
 """
 import random
+import numpy as np
+from itertools import accumulate
+from .aux_functions.rng import numpy_rng
 
 
-def roulette_selection(population, minimize, num_selected_ind):
+def cumulative_fitness(population, minimize):
     """
-    此函數返回由輪盤賭選擇法選出的個體的ID列表。注意，在調用此函數之前必須計算人口的標準化適應度（調用方法 Gavl._Population__calculate_normalized_fitness）。
+    此函數返回個體的ID列表和（反向）標準化適應度的累積分佈。注意，在調用此函數之前必須計算人口的標準化適應度（調用方法 Gavl._Population__calculate_normalized_fitness）。
 
     :param population: (list of Individuals) 這是個體列表（見個體類）。
     :param minimize: (int) 整數，表示目標是最小化適應度（minimize = 1）還是最大化適應度（minimize = 0）。
-    :param num_selected_ind: (int) 要選擇的個體數量。
     :return:
-        * :list_selected_individuals: (list of str) 包含選中個體ID的列表。注意，可能會有重複的個體。
+        * :list_ids: (list of str) 個體的ID列表。
+        * :list_cumulative_fitness: (list of float) 累積的（反向）標準化適應度，與 list_ids 對應。最後一個元素是所有個體的適應度之和。
     """
+    list_ids = [ind._id for ind in population]
     if minimize:
         # 如果是最小化適應度，使用個體的反向標準化適應度
-        list_ids_normalizedfitness = [(ind._id, ind.inverse_normalized_fitness_value) for ind in population]
+        list_cumulative_fitness = list(accumulate(ind.inverse_normalized_fitness_value for ind in population))
     else:
         # 如果是最大化適應度，使用個體的標準化適應度
-        list_ids_normalizedfitness = [(ind._id, ind.normalized_fitness_value) for ind in population]
+        list_cumulative_fitness = list(accumulate(ind.normalized_fitness_value for ind in population))
+    return list_ids, list_cumulative_fitness
 
-    list_selected_individuals = []  # 將包含選中個體ID的列表。
-    sum_fit = sum(map(lambda x: x[1], list_ids_normalizedfitness))  # 所有個體的（反向）標準化適應度之和
 
+def roulette_selection(population, minimize, num_selected_ind, rng=random, np_rng=None):
+    """
+    此函數返回由輪盤賭選擇法選出的個體的ID列表。注意，在調用此函數之前必須計算人口的標準化適應度（調用方法 Gavl._Population__calculate_normalized_fitness）。
+    累積分佈只計算一次，所有的閾值在一次 NumPy 抽樣中生成，並以向量化的二分搜尋（numpy.searchsorted）找到對應的個體，所以成本是 O(N + k·log N) 而不是 O(N·k)，並且不需要 k 次 random.random() 調用。
+
+    :param population: (list of Individuals) 這是個體列表（見個體類）。
+    :param minimize: (int) 整數，表示目標是最小化適應度（minimize = 1）還是最大化適應度（minimize = 0）。
+    :param num_selected_ind: (int) 要選擇的個體數量。
+    :param rng: (random.Random) 隨機數生成器。默認為 random 模組。
+    :param np_rng: (numpy.random.Generator or None) NumPy 隨機數生成器。None 表示從 rng 獲取種子（見 numpy_rng）。默認為 None。
+    :return:
+        * :list_selected_individuals: (list of str) 包含選中個體ID的列表。注意，可能會有重複的個體。
+    """
+    if np_rng is None:
+        np_rng = numpy_rng(rng)
+    list_ids, list_cumulative_fitness = cumulative_fitness(population, minimize)
+    thresholds = np_rng.random(num_selected_ind) * list_cumulative_fitness[-1]  # 隨機選擇的個體的累積適應度閾值（一次抽取所有的隨機數）
+    indices = np.searchsorted(list_cumulative_fitness, thresholds, side='left')  # 第一個累積適應度大於或等於閾值的個體
+    last_index = len(list_ids) - 1
+    return [list_ids[min(index, last_index)] for index in indices.tolist()]  # 返回選中的個體ID列表
+
+
+def stochastic_universal_sampling(population, minimize, num_selected_ind, rng=random):
+    """
+    此函數返回由隨機通用抽樣（stochastic universal sampling）選出的個體的ID列表。與輪盤賭選擇法使用相同的機率，但所有個體都在一次旋轉中選出：
+    輪盤上有 num_selected_ind 個等距的指針，只抽取一個隨機數，所以選擇的方差更小（每個個體被選中的次數接近其期望值）。成本是 O(N + k)。
+    注意，在調用此函數之前必須計算人口的標準化適應度（調用方法 Gavl._Population__calculate_normalized_fitness）。
+
+    :param population: (list of Individuals) 這是個體列表（見個體類）。
+    :param minimize: (int) 整數，表示目標是最小化適應度（minimize = 1）還是最大化適應度（minimize = 0）。
+    :param num_selected_ind: (int) 要選擇的個體數量。
+    :param rng: (random.Random) 隨機數生成器。默認為 random 模組。
+    :return:
+        * :list_selected_individuals: (list of str) 包含選中個體ID的列表（隨機順序）。注意，可能會有重複的個體。
+    """
+    if num_selected_ind <= 0:
+        return []
+    list_ids, list_cumulative_fitness = cumulative_fitness(population, minimize)
+    step = list_cumulative_fitness[-1] / num_selected_ind  # 指針之間的距離
+    pointer = rng.random() * step  # 第一個指針的位置（唯一的隨機數）
+    last_index = len(list_ids) - 1
+    index = 0
+    list_selected_individuals = []  # 將包含選中個體ID的列表。
     for _ in range(num_selected_ind):
-        population_cumulative_fitness = 0  # 人口累積適應度
-        selected_cumulative_fitness = random.random() * sum_fit  # 隨機選擇的個體的累積適應度閾值
-        for ind in list_ids_normalizedfitness:
-            population_cumulative_fitness += ind[1]  # 累加適應度
-            if selected_cumulative_fitness <= population_cumulative_fitness:
-                list_selected_individuals.append(ind[0])  # 添加個體的ID到列表中
-                break
+        while index < last_index and list_cumulative_fitness[index] < pointer:  # 指針是遞增的，所以只需遍歷累積分佈一次
+            index += 1
+        list_selected_individuals.append(list_ids[index])
+        pointer += step
+    rng.shuffle(list_selected_individuals)  # 避免選擇的順序與族群的順序相關
     return list_selected_individuals  # 返回選中的個體ID列表
+
+
+def fitness_array(population):
+    """
+    此函數返回個體的適應度值數組。
+
+    :param population: (list of Individuals) 這是個體列表（見個體類）。
+    :return:
+        * (numpy.ndarray of float) 適應度值數組，與 population 的順序對應。
+    """
+    return np.fromiter((ind.fitness_value for ind in population), dtype=float, count=len(population))
+
+
+def rank_order(population, minimize):
+    """
+    此函數返回個體從最差到最好的索引順序（基於原始適應度值，而不是標準化適應度，所以對離群值不敏感）。如果族群已按適應度排序，排序的成本很低。
+
+    :param population: (list of Individuals) 這是個體列表（見個體類）。
+    :param minimize: (int) 整數，表示目標是最小化適應度（minimize = 1）還是最大化適應度（minimize = 0）。
+    :return:
+        * (numpy.ndarray of int) 個體在 population 中的索引，從最差到最好排序。
+    """
+    fitness = fitness_array(population)
+    if minimize:
+        fitness = -fitness  # 最小化 ---> 適應度越低越好
+    return np.argsort(fitness, kind='stable')
+
+
+def tournament_selection(population, minimize, num_selected_ind, tournament_size=3, rng=random, np_rng=None):
+    """
+    此函數返回由錦標賽選擇法選出的個體的ID列表。每次選擇隨機抽取 tournament_size 個個體（可重複），適應度最好的個體獲勝。
+    所有錦標賽在一次 NumPy 抽樣中完成。不需要標準化適應度，所以當所有適應度值相同時或有離群值時也能正常工作。
+    要改變錦標賽的大小，可以使用 functools.partial(tournament_selection, tournament_size=k)。
+
+    :param population: (list of Individuals) 這是個體列表（見個體類）。
+    :param minimize: (int) 整數，表示目標是最小化適應度（minimize = 1）還是最大化適應度（minimize = 0）。
+    :param num_selected_ind: (int) 要選擇的個體數量。
+    :param tournament_size: (int) 每個錦標賽的個體數量（選擇壓力）。默認為 3。
+    :param rng: (random.Random) 隨機數生成器。默認為 random 模組。
+    :param np_rng: (numpy.random.Generator or None) NumPy 隨機數生成器。None 表示從 rng 獲取種子（見 numpy_rng）。默認為 None。
+    :return:
+        * :list_selected_individuals: (list of str) 包含選中個體ID的列表。注意，可能會有重複的個體。
+    """
+    if type(tournament_size) != int or tournament_size < 1:
+        raise ValueError('錦標賽的大小必須是大於或等於 1 的整數。')
+    fitness = fitness_array(population)
+    if np_rng is None:
+        np_rng = numpy_rng(rng)
+    contestants = np_rng.integers(0, len(population), size=(num_selected_ind, tournament_size))  # 每一行是一個錦標賽
+    contestants_fitness = fitness[contestants]
+    best_position = contestants_fitness.argmin(axis=1) if minimize else contestants_fitness.argmax(axis=1)
+    winners = contestants[np.arange(num_selected_ind), best_position]
+    return [population[i]._id for i in winners.tolist()]
+
+
+def rank_selection(population, minimize, num_selected_ind, rank_weights, rng=random, np_rng=None):
+    """
+    此函數返回根據排名的權重選出的個體的ID列表（有放回抽樣）。
+
+    :param population: (list of Individuals) 這是個體列表（見個體類）。
+    :param minimize: (int) 整數，表示目標是最小化適應度（minimize = 1）還是最大化適應度（minimize = 0）。
+    :param num_selected_ind: (int) 要選擇的個體數量。
+    :param rank_weights: (numpy.ndarray of float) 每個排名的權重，從最差（位置 0）到最好。
+    :param rng: (random.Random) 隨機數生成器。默認為 random 模組。
+    :param np_rng: (numpy.random.Generator or None) NumPy 隨機數生成器。None 表示從 rng 獲取種子（見 numpy_rng）。默認為 None。
+    :return:
+        * :list_selected_individuals: (list of str) 包含選中個體ID的列表。注意，可能會有重複的個體。
+    """
+    order = rank_order(population, minimize)
+    if np_rng is None:
+        np_rng = numpy_rng(rng)
+    selected_ranks = np_rng.choice(len(population), size=num_selected_ind, p=rank_weights / rank_weights.sum())
+    return [population[i]._id for i in order[selected_ranks].tolist()]
+
+
+def linear_rank_selection(population, minimize, num_selected_ind, selection_pressure=1.5, rng=random, np_rng=None):
+    """
+    此函數返回由線性排名選擇法選出的個體的ID列表。個體按適應度排名，被選中的機率與排名成線性關係：
+    最好的個體的期望選擇次數是 selection_pressure，最差的是 2 - selection_pressure。
+    要改變選擇壓力，可以使用 functools.partial(linear_rank_selection, selection_pressure=s)。
+
+    :param population: (list of Individuals) 這是個體列表（見個體類）。
+    :param minimize: (int) 整數，表示目標是最小化適應度（minimize = 1）還是最大化適應度（minimize = 0）。
+    :param num_selected_ind: (int) 要選擇的個體數量。
+    :param selection_pressure: (float) 選擇壓力，介於 1（均勻選擇）和 2 之間。默認為 1.5。
+    :param rng: (random.Random) 隨機數生成器。默認為 random 模組。
+    :param np_rng: (numpy.random.Generator or None) NumPy 隨機數生成器。None 表示從 rng 獲取種子（見 numpy_rng）。默認為 None。
+    :return:
+        * :list_selected_individuals: (list of str) 包含選中個體ID的列表。注意，可能會有重複的個體。
+    """
+    if not 1 <= selection_pressure <= 2:
+        raise ValueError('線性排名選擇的選擇壓力必須介於 1 和 2 之間。')
+    size_population = len(population)
+    if size_population == 1:
+        return [population[0]._id] * num_selected_ind
+    ranks = np.arange(size_population)  # 0 ---> 最差，size_population - 1 ---> 最好
+    rank_weights = (2 - selection_pressure) + 2 * (selection_pressure - 1) * ranks / (size_population - 1)
+    return rank_selection(population, minimize, num_selected_ind, rank_weights, rng, np_rng)
+
+
+def exponential_rank_selection(population, minimize, num_selected_ind, base=0.95, rng=random, np_rng=None):
+    """
+    此函數返回由指數排名選擇法選出的個體的ID列表。個體按適應度排名，第 i 好的個體（i = 0 為最好）的權重是 base ** i。
+    要改變底數，可以使用 functools.partial(exponential_rank_selection, base=c)。
+
+    :param population: (list of Individuals) 這是個體列表（見個體類）。
+    :param minimize: (int) 整數，表示目標是最小化適應度（minimize = 1）還是最大化適應度（minimize = 0）。
+    :param num_selected_ind: (int) 要選擇的個體數量。
+    :param base: (float) 指數的底數，介於 0 和 1 之間（越小選擇壓力越大）。默認為 0.95。
+    :param rng: (random.Random) 隨機數生成器。默認為 random 模組。
+    :param np_rng: (numpy.random.Generator or None) NumPy 隨機數生成器。None 表示從 rng 獲取種子（見 numpy_rng）。默認為 None。
+    :return:
+        * :list_selected_individuals: (list of str) 包含選中個體ID的列表。注意，可能會有重複的個體。
+    """
+    if not 0 < base <= 1:
+        raise ValueError('指數排名選擇的底數必須介於 0（不包括）和 1 之間。')
+    size_population = len(population)
+    rank_weights = base ** np.arange(size_population - 1, -1, -1, dtype=float)  # 位置 0 ---> 最差
+    return rank_selection(population, minimize, num_selected_ind, rank_weights, rng, np_rng)
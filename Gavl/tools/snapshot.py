@@ -0,0 +1,65 @@
+"""
+In this file it is defined the snapshot of a generation, which is yielded by Gavl.optimize_iter and passed to the callbacks 'on_generation' and 'on_improvement'. The snapshot is computed once per generation from the fitness values that are already known (no extra fitness evaluations and no sorting of the population), and it does not keep references to the population, so it can be stored, logged or sent to other processes.
+
+Classes:
+    :GenerationSnapshot: Lightweight summary of a generation (generation number, best individual and fitness statistics).
+
+Functions:
+    fitness_statistics: Returns the mean, the standard deviation and the worst fitness value of a population.
+"""
+import numpy as np
+from .individual import Individual
+
+
+def fitness_statistics(population, minimize):
+    """
+    此函數以一次 NumPy 運算返回族群的適應度統計。注意在調用此函數之前，必須計算族群的適應度。
+
+    :param population: (list of Individuals) 族群。
+    :param minimize: (int) 整數，表示目標是最小化適應度（minimize = 1）還是最大化適應度（minimize = 0）。
+    :return:
+        * :mean_fitness: (float) 平均適應度。
+        * :std_fitness: (float) 適應度的標準差。
+        * :worst_fitness: (float) 最差的適應度。
+    """
+    fitness = np.fromiter((ind.fitness_value for ind in population), dtype=float, count=len(population))
+    worst_fitness = fitness.max() if minimize else fitness.min()
+    return float(fitness.mean()), float(fitness.std()), float(worst_fitness)
+
+
+class GenerationSnapshot:
+    """ 一代的快照：代數、最佳個體（副本）和適應度統計。 """
+
+    def __init__(self, generation, best_chromosome, best_fitness, mean_fitness, std_fitness, worst_fitness, improved, elapsed_time):
+        """ 構造函數。
+
+        :param generation: (int) 代數。
+        :param best_chromosome: (list of genes) 最佳個體的染色體（基因列表，即使使用整數編碼）。
+        :param best_fitness: (float) 最佳適應度。
+        :param mean_fitness: (float) 平均適應度。
+        :param std_fitness: (float) 適應度的標準差。
+        :param worst_fitness: (float) 最差的適應度。
+        :param improved: (bool) 這一代的最佳適應度是否優於之前所有代的最佳適應度。
+        :param elapsed_time: (float) 從優化開始（或恢復）到這一代結束的時間（秒）。
+        """
+        self.generation = generation
+        self.best_individual = Individual(list(best_chromosome))
+        self.best_individual.set_fitness_value(best_fitness)
+        self.best_fitness = best_fitness
+        self.mean_fitness = mean_fitness
+        self.std_fitness = std_fitness
+        self.worst_fitness = worst_fitness
+        self.improved = improved
+        self.elapsed_time = elapsed_time
+
+    def as_dict(self):
+        """ 返回快照的字典（例如用於記錄或序列化為 JSON）。
+
+        :return:
+            * (dict) 快照的字典，最佳個體以其染色體表示。
+        """
+        return {'generation': self.generation, 'best_chromosome': self.best_individual.chromosome, 'best_fitness': self.best_fitness, 'mean_fitness': self.mean_fitness,
+                'std_fitness': self.std_fitness, 'worst_fitness': self.worst_fitness, 'improved': self.improved, 'elapsed_time': self.elapsed_time}
+
+    def __repr__(self):
+        return '{self.__class__.__name__}(generation={self.generation}, best_fitness={self.best_fitness}, mean_fitness={self.mean_fitness}, improved={self.improved})'.format(self=self)
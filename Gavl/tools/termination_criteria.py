@@ -4,8 +4,17 @@ In this file it is defined the functions to check the termination criteria.
 Functions:
     max_num_generation_reached: Function that checks if the max number of generations is reached.
     goal_fitness_reached: Function that checks if the goal fitness is reached.
-    check_termination_criteria: This function selects the termination criteria
+    no_improvement_reached: Function that checks if the best fitness has not improved in a given number of generations.
+    max_time_reached: Function that checks if the wall-clock time budget is exhausted.
+    max_evaluations_reached: Function that checks if the budget of fitness evaluations is exhausted.
+    check_termination_criteria: This function checks the termination criteria (combined with 'any' or 'all').
+    check_termination_criterion: This function checks one termination criterion.
+    valid_termination_criteria: Returns whether a dictionary of termination criteria is valid.
+    termination_criteria_args: Returns the arguments of check_termination_criteria for a dictionary of termination criteria.
+    update_termination_criteria_args: Updates the progress of the termination criteria after a generation.
+    reset_termination_criteria_args: Resets the progress of the termination criteria.
 """
+TERMINATION_CRITERIA = ['max_num_generation_reached', 'goal_fitness_reached', 'no_improvement_generations', 'max_time', 'max_evaluations']  # 支持的終止條件
 
 
 def max_num_generation_reached(generation_count, max_generations):
@@ -36,25 +45,181 @@ def goal_fitness_reached(generation_best_fitness, goal_fitness, minimize):
         return generation_best_fitness >= goal_fitness  # 檢查是否達到或超過目標適應度
 
 
+def no_improvement_reached(stagnant_generations, max_stagnant_generations):
+    """
+    這個函數判斷最佳適應度是否已經連續 max_stagnant_generations 代沒有改進。
+
+    :param stagnant_generations: (int) 最佳適應度沒有改進的連續代數。
+    :param max_stagnant_generations: (int) 允許的沒有改進的最大連續代數。
+    :return:
+        (bool) 如果達到沒有改進的最大代數，則返回 True。
+    """
+    return stagnant_generations >= max_stagnant_generations
+
+
+def max_time_reached(elapsed_time, max_time):
+    """
+    這個函數判斷是否用完了時間預算。
+
+    :param elapsed_time: (float) 優化已使用的時間（秒）。
+    :param max_time: (float) 時間預算（秒）。
+    :return:
+        (bool) 如果用完了時間預算，則返回 True。
+    """
+    return elapsed_time >= max_time
+
+
+def max_evaluations_reached(evaluations, max_evaluations):
+    """
+    這個函數判斷是否用完了適應度計算次數的預算。
+
+    :param evaluations: (int) 已進行的適應度計算次數。
+    :param max_evaluations: (int) 適應度計算次數的預算。
+    :return:
+        (bool) 如果用完了預算，則返回 True。
+    """
+    return evaluations >= max_evaluations
+
+
 def check_termination_criteria(termination_criteria_args):
     """
-    這個函數檢查終止條件。
-    
-    :param termination_criteria_args: (dictionary) 這是一個包含檢查終止條件所需參數的字典。它可以包含以下值：
-        * {'termination_criteria': 'goal_fitness_reached', 'goal_fitness': _ , 'generation_fitness': _ , 'minimize': _ }
-        * {'termination_criteria': 'max_num_generation_reached', 'generation_goal': _ , 'generation_count': _ }
+    這個函數檢查終止條件。每個條件只是比較已更新的進度（見 update_termination_criteria_args）和它的目標，所以每一代的成本是常數。
+    如果 'mode' 是 'any'，則當任何一個條件滿足時終止；如果是 'all'，則當所有條件都滿足時終止。
+
+    :param termination_criteria_args: (dictionary) 這是一個包含檢查終止條件所需參數的字典（見 termination_criteria_args）。它包含 'termination_criteria'（條件名稱的列表，或為了兼容性的單個名稱）、'mode'，以及每個條件的目標和進度：
+        * 'max_num_generation_reached': 'generation_goal' 和 'generation_count'
+        * 'goal_fitness_reached': 'goal_fitness'、'generation_fitness' 和 'minimize'
+        * 'no_improvement_generations': 'max_stagnant_generations' 和 'stagnant_generations'
+        * 'max_time': 'max_time' 和 'elapsed_time'
+        * 'max_evaluations': 'max_evaluations' 和 'evaluations'
     :return:
         (bool) 如果滿足終止條件，則返回 True。否則返回 False。
     """
     termination_criteria = termination_criteria_args['termination_criteria']  # 獲取終止條件類型
-    if termination_criteria == 'max_num_generation_reached':  # 如果終止條件為達到最大世代數
+    if type(termination_criteria) == str:
+        termination_criteria = [termination_criteria]
+    results = (check_termination_criterion(criterion, termination_criteria_args) for criterion in termination_criteria)
+    if termination_criteria_args.get('mode', 'any') == 'all':
+        return all(results)
+    return any(results)
+
+
+def check_termination_criterion(criterion, termination_criteria_args):
+    """
+    這個函數檢查一個終止條件。
+
+    :param criterion: (str) 終止條件的名稱。
+    :param termination_criteria_args: (dictionary) 終止條件的參數（見 check_termination_criteria）。
+    :return:
+        (bool) 如果滿足終止條件，則返回 True。否則返回 False。
+    """
+    if criterion == 'max_num_generation_reached':  # 如果終止條件為達到最大世代數
         generation_count = termination_criteria_args['generation_count']  # 獲取當前世代數
         max_generations = termination_criteria_args['generation_goal']  # 獲取最大世代數
         return max_num_generation_reached(generation_count, max_generations)  # 調用函數檢查是否達到最大世代數
-    elif termination_criteria == 'goal_fitness_reached':  # 如果終止條件為達到目標適應度
+    elif criterion == 'goal_fitness_reached':  # 如果終止條件為達到目標適應度
         generation_best_fitness = termination_criteria_args['generation_fitness']  # 獲取當前世代最佳適應度
+        if generation_best_fitness is None:  # 族群尚未計算
+            return False
         goal_fitness = termination_criteria_args['goal_fitness']  # 獲取目標適應度
         minimize = termination_criteria_args['minimize']  # 獲取是否最小化
         return goal_fitness_reached(generation_best_fitness, goal_fitness, minimize)  # 調用函數檢查是否達到目標適應度
+    elif criterion == 'no_improvement_generations':
+        return no_improvement_reached(termination_criteria_args['stagnant_generations'], termination_criteria_args['max_stagnant_generations'])
+    elif criterion == 'max_time':
+        return max_time_reached(termination_criteria_args['elapsed_time'], termination_criteria_args['max_time'])
+    elif criterion == 'max_evaluations':
+        return max_evaluations_reached(termination_criteria_args['evaluations'], termination_criteria_args['max_evaluations'])
     else:
-        raise ValueError("終止條件必須是 'max_num_generation_reached' 或 'goal_fitness_reached'。")  # 如果終止條件不合法，拋出異常
+        raise ValueError("終止條件必須是 {} 中的一個。".format(', '.join("'{}'".format(name) for name in TERMINATION_CRITERIA)))  # 如果終止條件不合法，拋出異常
+
+
+def valid_termination_criteria(termination_criteria):
+    """
+    這個函數檢查終止條件的字典是否有效：至少包含一個支持的條件，沒有未知的鍵，每個目標的類型正確，並且 'mode'（可選）是 'any' 或 'all'。
+
+    :param termination_criteria: (dict) 終止條件的字典，例如 {'max_num_generation_reached': 500, 'no_improvement_generations': 50, 'mode': 'any'}。
+    :return:
+        (bool) 如果字典有效，則返回 True。
+    """
+    if type(termination_criteria) != dict:
+        return False
+    criteria = [key for key in termination_criteria if key != 'mode']
+    if not criteria or any(key not in TERMINATION_CRITERIA for key in criteria):
+        return False
+    if termination_criteria.get('mode', 'any') not in ['any', 'all']:
+        return False
+    for key in criteria:
+        value = termination_criteria[key]
+        if type(value) not in [int, float]:
+            return False
+        if key in ['max_num_generation_reached', 'no_improvement_generations', 'max_evaluations'] and (type(value) != int or value < 1):
+            return False
+        if key == 'max_time' and value <= 0:
+            return False
+    return True
+
+
+def termination_criteria_args(termination_criteria, minimize):
+    """
+    這個函數返回 check_termination_criteria 的參數（目標和初始的進度）。
+
+    :param termination_criteria: (dict) 終止條件的字典（見 valid_termination_criteria）。
+    :param minimize: (int) 整數，表示目標是最小化適應度（minimize = 1）還是最大化適應度（minimize = 0）。
+    :return:
+        (dict) 終止條件的參數。
+    """
+    if not valid_termination_criteria(termination_criteria):
+        raise ValueError("終止條件必須是一個字典，包含 {} 中的一個或多個（以及可選的 'mode'：'any' 或 'all'）。".format(', '.join("'{}'".format(name) for name in TERMINATION_CRITERIA)))
+    criteria = [key for key in termination_criteria if key != 'mode']
+    args = {'termination_criteria': criteria, 'mode': termination_criteria.get('mode', 'any'), 'minimize': minimize}
+    if 'max_num_generation_reached' in termination_criteria:
+        args.update({'generation_goal': termination_criteria['max_num_generation_reached'], 'generation_count': 0})
+    if 'goal_fitness_reached' in termination_criteria:
+        args.update({'goal_fitness': termination_criteria['goal_fitness_reached'], 'generation_fitness': None})
+    if 'no_improvement_generations' in termination_criteria:
+        args.update({'max_stagnant_generations': termination_criteria['no_improvement_generations'], 'stagnant_generations': 0, 'best_fitness': None})
+    if 'max_time' in termination_criteria:
+        args.update({'max_time': termination_criteria['max_time'], 'elapsed_time': 0})
+    if 'max_evaluations' in termination_criteria:
+        args.update({'max_evaluations': termination_criteria['max_evaluations'], 'evaluations': 0})
+    return args
+
+
+def update_termination_criteria_args(termination_criteria_args, generation_count, best_fitness, evaluations, elapsed_time):
+    """
+    這個函數在每一代之後（以及初始族群之後）更新終止條件的進度。只更新使用的條件的進度，成本是常數。
+
+    :param termination_criteria_args: (dict) 終止條件的參數（會被修改）。
+    :param generation_count: (int) 當前的世代數。
+    :param best_fitness: (float) 當前的最佳適應度。
+    :param evaluations: (int) 已進行的適應度計算次數。
+    :param elapsed_time: (float) 優化已使用的時間（秒）。
+    """
+    if 'generation_count' in termination_criteria_args:
+        termination_criteria_args['generation_count'] = generation_count
+    if 'generation_fitness' in termination_criteria_args:
+        termination_criteria_args['generation_fitness'] = best_fitness
+    if 'stagnant_generations' in termination_criteria_args:
+        previous_best_fitness = termination_criteria_args['best_fitness']
+        if previous_best_fitness is None or (best_fitness < previous_best_fitness if termination_criteria_args['minimize'] else best_fitness > previous_best_fitness):
+            termination_criteria_args['best_fitness'] = best_fitness  # 改進 ---> 重新開始計數
+            termination_criteria_args['stagnant_generations'] = 0
+        else:
+            termination_criteria_args['stagnant_generations'] += 1
+    if 'elapsed_time' in termination_criteria_args:
+        termination_criteria_args['elapsed_time'] = elapsed_time
+    if 'evaluations' in termination_criteria_args:
+        termination_criteria_args['evaluations'] = evaluations
+
+
+def reset_termination_criteria_args(termination_criteria_args):
+    """
+    這個函數重設終止條件的進度（在每次優化開始時調用），目標不變。
+
+    :param termination_criteria_args: (dict) 終止條件的參數（會被修改）。
+    """
+    initial_progress = {'generation_count': 0, 'generation_fitness': None, 'stagnant_generations': 0, 'best_fitness': None, 'elapsed_time': 0, 'evaluations': 0}
+    for key, value in initial_progress.items():
+        if key in termination_criteria_args:
+            termination_criteria_args[key] = value
@@ -0,0 +1,10 @@
+"""
+Benchmark suite of Gavl: parametric standard problems (knapsack, set cover, feature-subset selection and a synthetic constant-cost fitness that isolates the overhead of the framework), a sweep over the population size, the chromosome length and the alphabet size that reports generations/sec, evaluations/sec and peak memory as JSON, and a comparison of two result files that flags regressions.
+
+Usage (from the root of the repository):
+    python -m benchmarks run --output results.json
+    python -m benchmarks compare baseline.json results.json
+"""
+from .problems import PROBLEMS, make_problem
+from .suite import run_case, run_sweep, save_results, load_results
+from .compare import compare_results
@@ -0,0 +1,52 @@
+"""
+Command line of the benchmark suite.
+
+    python -m benchmarks run [--output results.json] [--problems ...] [--populations ...] [--lengths ...] [--alphabets ...] [--generations N] [--repeats N] [--no-memory] [--full]
+    python -m benchmarks compare baseline.json results.json [--tolerance 0.1]
+
+The command 'compare' exits with status 1 if there is any regression, so it can be used in continuous integration.
+"""
+import argparse
+import sys
+from .problems import PROBLEMS
+from .suite import run_sweep, save_results, load_results
+from .compare import compare_results, format_comparison
+
+# 默認的掃描和完整的掃描（--full）：族群大小、染色體的最大長度和字母表大小
+DEFAULT_SWEEP = {'populations': [50, 200], 'lengths': [10, 50], 'alphabets': [10, 1000, 100000]}
+FULL_SWEEP = {'populations': [50, 200, 1000], 'lengths': [10, 50, 200], 'alphabets': [10, 100, 1000, 10000, 100000]}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description='Benchmark suite of Gavl.')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    run_parser = subparsers.add_parser('run', help='Run the sweep and save the results as JSON.')
+    run_parser.add_argument('--output', default='benchmark_results.json', help='Path of the JSON file with the results.')
+    run_parser.add_argument('--problems', nargs='+', choices=list(PROBLEMS), default=list(PROBLEMS))
+    run_parser.add_argument('--populations', nargs='+', type=int, help='Population sizes.')
+    run_parser.add_argument('--lengths', nargs='+', type=int, help='Maximum chromosome lengths.')
+    run_parser.add_argument('--alphabets', nargs='+', type=int, help='Alphabet sizes (number of possible genes).')
+    run_parser.add_argument('--generations', type=int, default=20, help='Generations of every case.')
+    run_parser.add_argument('--seed', type=int, default=0)
+    run_parser.add_argument('--repeats', type=int, default=1, help='Timed runs of every case (the fastest one is reported).')
+    run_parser.add_argument('--no-memory', action='store_true', help='Do not measure the peak memory (it needs an extra run with tracemalloc).')
+    run_parser.add_argument('--full', action='store_true', help='Use the full sweep instead of the default one.')
+    compare_parser = subparsers.add_parser('compare', help='Compare two result files and flag the regressions.')
+    compare_parser.add_argument('baseline', help='JSON file with the baseline results.')
+    compare_parser.add_argument('current', help='JSON file with the current results.')
+    compare_parser.add_argument('--tolerance', type=float, default=0.1, help='Allowed relative change (0.1 = 10%%).')
+    args = parser.parse_args(argv)
+    if args.command == 'run':
+        sweep = FULL_SWEEP if args.full else DEFAULT_SWEEP
+        results = run_sweep(args.problems, args.populations or sweep['populations'], args.lengths or sweep['lengths'], args.alphabets or sweep['alphabets'],
+                            generations=args.generations, seed=args.seed, repeats=args.repeats, trace_memory=int(not args.no_memory))
+        save_results(results, args.output)
+        print('Results saved in {}.'.format(args.output))
+        return 0
+    comparisons, missing = compare_results(load_results(args.baseline), load_results(args.current), tolerance=args.tolerance)
+    print(format_comparison(comparisons, missing))
+    return 1 if any(comparison['regression'] for comparison in comparisons) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
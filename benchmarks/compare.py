@@ -0,0 +1,60 @@
+"""
+In this file it is defined the comparison of two result files of the benchmark. The cases are matched by their key and a regression is flagged when a metric of the current results is worse than the baseline by more than the tolerance: lower generations/sec or evaluations/sec, or higher peak memory.
+
+Functions:
+    compare_results: Compares the cases of two results and returns the changes of every metric and the regressions.
+    format_comparison: Returns the comparison as text.
+"""
+
+# 比較的指標 -> 較高的值是否更好
+METRICS = {'generations_per_second': True, 'evaluations_per_second': True, 'peak_memory': False}
+
+
+def compare_results(baseline, current, tolerance=0.1):
+    """
+    此函數比較兩個結果（見 suite.run_sweep）中相同案例的指標。變化是相對變化（current / baseline - 1）；如果一個指標比基準差超過 tolerance，則標記為回歸。只在一個結果中存在的案例或沒有值的指標（例如沒有測量記憶體）被忽略。
+
+    :param baseline: (dict) 基準的結果。
+    :param current: (dict) 當前的結果。
+    :param tolerance: (float) 允許的相對變化（例如 0.1 = 10%）。默認為 0.1。
+    :return:
+        * :comparisons: (list of dicts) 每個案例和指標的比較：'key'、'metric'、'baseline'、'current'、'change' 和 'regression'。
+        * :missing: (list of str) 基準中存在但當前結果中不存在的案例。
+    """
+    if tolerance < 0:
+        raise ValueError('容差必須是大於或等於 0 的數字。')
+    current_results = {result['key']: result for result in current['results']}
+    comparisons = []
+    missing = []
+    for baseline_result in baseline['results']:
+        current_result = current_results.get(baseline_result['key'])
+        if current_result is None:
+            missing.append(baseline_result['key'])
+            continue
+        for metric, higher_is_better in METRICS.items():
+            baseline_value, current_value = baseline_result.get(metric), current_result.get(metric)
+            if not baseline_value or current_value is None:
+                continue
+            change = current_value / baseline_value - 1
+            regression = change < -tolerance if higher_is_better else change > tolerance
+            comparisons.append({'key': baseline_result['key'], 'metric': metric, 'baseline': baseline_value, 'current': current_value, 'change': change, 'regression': regression})
+    return comparisons, missing
+
+
+def format_comparison(comparisons, missing):
+    """
+    此函數返回比較的文字（每個案例和指標一行，回歸以 'REGRESSION' 標記）。
+
+    :param comparisons: (list of dicts) compare_results 返回的比較。
+    :param missing: (list of str) compare_results 返回的缺少的案例。
+    :return:
+        * (str) 文字。
+    """
+    lines = []
+    for comparison in comparisons:
+        lines.append('{:<48}{:<24}{:>14.1f}{:>14.1f}{:>+9.1%}  {}'.format(comparison['key'], comparison['metric'], comparison['baseline'], comparison['current'], comparison['change'], 'REGRESSION' if comparison['regression'] else ''))
+    for key in missing:
+        lines.append('{:<48}missing in the current results'.format(key))
+    num_regressions = sum(comparison['regression'] for comparison in comparisons)
+    lines.append('{} regression(s) in {} comparison(s).'.format(num_regressions, len(comparisons)))
+    return '\n'.join(lines)
@@ -0,0 +1,180 @@
+"""
+In this file it is defined the parametric problems of the benchmark suite. The genes are the integers 0 ... alphabet_size - 1 and the data of every problem is generated from a seed, so the same parameters always give the same problem. The fitness functions are classes (and not closures) so that they can be sent to other processes (evaluator 'process').
+
+Classes:
+    :KnapsackFitness: Value of the items minus a penalization for the excess of weight (maximize).
+    :SetCoverFitness: Uncovered elements (heavily penalized) plus the number of subsets used (minimize).
+    :FeatureSelectionFitness: Mean squared error of a least squares fit with the selected features plus a penalization per feature (minimize).
+    :ConstantCostFitness: O(1) fitness that only looks at the first and last genes, used to measure the overhead of the framework (maximize).
+
+Functions:
+    knapsack_problem: Returns the hyperparameters of a random knapsack problem.
+    set_cover_problem: Returns the hyperparameters of a random set cover problem.
+    feature_selection_problem: Returns the hyperparameters of a synthetic feature-subset selection problem.
+    constant_problem: Returns the hyperparameters of the constant-cost problem.
+    make_problem: Returns the hyperparameters of a problem of PROBLEMS by its name.
+"""
+import numpy as np
+
+
+class KnapsackFitness:
+    """ 背包問題的適應度：物品的總價值減去超重的懲罰。 """
+
+    def __init__(self, values, weights, capacity, penalization):
+        """ 構造函數。
+
+        :param values: (list of floats) 每個物品的價值。
+        :param weights: (list of floats) 每個物品的重量。
+        :param capacity: (float) 背包的最大重量。
+        :param penalization: (float) 每單位超重的懲罰。
+        """
+        self.values = values
+        self.weights = weights
+        self.capacity = capacity
+        self.penalization = penalization
+
+    def __call__(self, chromosome):
+        value = sum(self.values[gene] for gene in chromosome)
+        weight = sum(self.weights[gene] for gene in chromosome)
+        if weight > self.capacity:
+            value -= self.penalization * (weight - self.capacity)
+        return value
+
+
+class SetCoverFitness:
+    """ 集合覆蓋問題的適應度：沒有被覆蓋的元素數量乘以懲罰，加上使用的子集數量。 """
+
+    def __init__(self, subsets, n_elements):
+        """ 構造函數。
+
+        :param subsets: (list of frozensets) 每個子集覆蓋的元素。
+        :param n_elements: (int) 全集的元素數量。
+        """
+        self.subsets = subsets
+        self.n_elements = n_elements
+
+    def __call__(self, chromosome):
+        covered = set()
+        for gene in chromosome:
+            covered.update(self.subsets[gene])
+        return (self.n_elements - len(covered)) * len(self.subsets) + len(chromosome)
+
+
+class FeatureSelectionFitness:
+    """ 特徵子集選擇的適應度：以選擇的特徵進行最小二乘擬合的均方誤差，加上每個特徵的懲罰。 """
+
+    def __init__(self, X, y, penalization):
+        """ 構造函數。
+
+        :param X: (numpy.ndarray) 特徵矩陣（樣本 x 特徵）。
+        :param y: (numpy.ndarray) 目標向量。
+        :param penalization: (float) 每個選擇的特徵的懲罰。
+        """
+        self.X = X
+        self.y = y
+        self.penalization = penalization
+
+    def __call__(self, chromosome):
+        X = self.X[:, chromosome]
+        coefficients = np.linalg.lstsq(X, self.y, rcond=None)[0]
+        residuals = self.y - X @ coefficients
+        return float(residuals @ residuals) / len(self.y) + self.penalization * len(chromosome)
+
+
+class ConstantCostFitness:
+    """ 常數成本的適應度：只使用第一個和最後一個基因以及長度，所以計算的成本與染色體的長度和字母表的大小無關。 """
+
+    def __call__(self, chromosome):
+        return (chromosome[0] * 31 + chromosome[-1]) % 1009 + len(chromosome)
+
+
+def knapsack_problem(alphabet_size, max_length_chromosome, seed=0):
+    """
+    此函數返回一個隨機背包問題的超參數：alphabet_size 個物品（價值和重量在 1 到 100 之間），背包的容量是 max_length_chromosome 個物品的平均重量的一半，所以最好的解比最大長度短。
+
+    :param alphabet_size: (int) 物品的數量（可能的基因的數量）。
+    :param max_length_chromosome: (int) 染色體的最大長度。
+    :param seed: (int) 生成問題的種子。默認為 0。
+    :return:
+        * (dict) 超參數的名稱 -> 值。
+    """
+    rng = np.random.default_rng(seed)
+    values = rng.integers(1, 101, alphabet_size).tolist()
+    weights = rng.integers(1, 101, alphabet_size).tolist()
+    capacity = 50.5 * max_length_chromosome / 2
+    return {'possible_genes': list(range(alphabet_size)), 'fitness': KnapsackFitness(values, weights, capacity, 10), 'minimize': 0}
+
+
+def set_cover_problem(alphabet_size, max_length_chromosome, seed=0):
+    """
+    此函數返回一個隨機集合覆蓋問題的超參數：alphabet_size 個子集，每個子集覆蓋全集的 1 到 10 個元素。全集有 5 * max_length_chromosome 個元素，並且每個元素至少被一個子集覆蓋（前面的子集依次覆蓋全集），所以問題總是有解。
+
+    :param alphabet_size: (int) 子集的數量（可能的基因的數量）。
+    :param max_length_chromosome: (int) 染色體的最大長度。
+    :param seed: (int) 生成問題的種子。默認為 0。
+    :return:
+        * (dict) 超參數的名稱 -> 值。
+    """
+    rng = np.random.default_rng(seed)
+    n_elements = 5 * max_length_chromosome
+    subsets = [set(rng.choice(n_elements, int(rng.integers(1, 11)), replace=True).tolist()) for _ in range(alphabet_size)]
+    for element in range(n_elements):  # 保證每個元素至少被一個子集覆蓋
+        subsets[element % alphabet_size].add(element)
+    return {'possible_genes': list(range(alphabet_size)), 'fitness': SetCoverFitness([frozenset(subset) for subset in subsets], n_elements), 'minimize': 1}
+
+
+def feature_selection_problem(alphabet_size, max_length_chromosome, seed=0, n_samples=64):
+    """
+    此函數返回一個合成的特徵子集選擇問題的超參數：alphabet_size 個特徵（float32），目標是其中 max_length_chromosome // 2 個特徵（至少一個）的線性組合加上噪聲。
+
+    :param alphabet_size: (int) 特徵的數量（可能的基因的數量）。
+    :param max_length_chromosome: (int) 染色體的最大長度。
+    :param seed: (int) 生成問題的種子。默認為 0。
+    :param n_samples: (int) 樣本的數量。默認為 64。
+    :return:
+        * (dict) 超參數的名稱 -> 值。
+    """
+    rng = np.random.default_rng(seed)
+    X = rng.standard_normal((n_samples, alphabet_size), dtype=np.float32)
+    informative = rng.choice(alphabet_size, max(1, max_length_chromosome // 2), replace=False)
+    y = X[:, informative] @ rng.uniform(1, 2, len(informative)).astype(np.float32) + 0.1 * rng.standard_normal(n_samples, dtype=np.float32)
+    return {'possible_genes': list(range(alphabet_size)), 'fitness': FeatureSelectionFitness(X, y, 0.01), 'minimize': 1}
+
+
+def constant_problem(alphabet_size, max_length_chromosome, seed=0):
+    """
+    此函數返回常數成本問題的超參數（見 ConstantCostFitness）。
+
+    :param alphabet_size: (int) 可能的基因的數量。
+    :param max_length_chromosome: (int) 染色體的最大長度（不使用）。
+    :param seed: (int) 種子（不使用）。默認為 0。
+    :return:
+        * (dict) 超參數的名稱 -> 值。
+    """
+    return {'possible_genes': list(range(alphabet_size)), 'fitness': ConstantCostFitness(), 'minimize': 0}
+
+
+# 問題的名稱 -> (生成問題的函數, 最大的字母表大小（None = 沒有限制）)。特徵選擇的特徵矩陣隨字母表大小增長，所以限制其大小。
+PROBLEMS = {'knapsack': (knapsack_problem, None),
+            'set_cover': (set_cover_problem, None),
+            'feature_selection': (feature_selection_problem, 20000),
+            'constant': (constant_problem, None)}
+
+
+def make_problem(name, alphabet_size, max_length_chromosome, seed=0):
+    """
+    此函數返回 PROBLEMS 中名為 name 的問題的超參數。
+
+    :param name: (str) 問題的名稱（PROBLEMS 的鍵）。
+    :param alphabet_size: (int) 可能的基因的數量。
+    :param max_length_chromosome: (int) 染色體的最大長度。
+    :param seed: (int) 生成問題的種子。默認為 0。
+    :return:
+        * (dict) 超參數的名稱 -> 值。
+    """
+    if name not in PROBLEMS:
+        raise ValueError("問題必須是以下列表中的一個: {}。".format(list(PROBLEMS)))
+    problem_function, max_alphabet_size = PROBLEMS[name]
+    if max_alphabet_size is not None and alphabet_size > max_alphabet_size:
+        raise ValueError("問題 '{}' 的字母表大小不能大於 {}。".format(name, max_alphabet_size))
+    return problem_function(alphabet_size, max_length_chromosome, seed)
@@ -0,0 +1,165 @@
+"""
+In this file it is defined the execution of the benchmark: every case (problem, population size, chromosome length and alphabet size) runs a fixed number of generations with the instrumentation of Gavl enabled and reports generations/sec, evaluations/sec, the time of each phase and, in a second run with tracemalloc (which slows down the allocations, so it is not timed), the peak memory. The results are saved as JSON together with the versions of Python and NumPy and the platform.
+
+Functions:
+    case_key: Returns the identifier of a case (used to match the cases of two result files).
+    run_case: Runs one case of the benchmark.
+    run_sweep: Runs all the combinations of problems, population sizes, chromosome lengths and alphabet sizes.
+    format_result: Returns the result of a case as a line of text.
+    save_results: Saves the results of a sweep as JSON.
+    load_results: Loads the results saved by save_results.
+"""
+import json
+import platform
+import time
+import numpy as np
+from Gavl.Gavl import Gavl
+from .problems import PROBLEMS, make_problem
+
+LARGE_ALPHABET_SIZE = 1000  # 從這個字母表大小開始使用大字母表模式（'large_alphabet' = 1）
+
+
+def case_key(problem, size_population, max_length_chromosome, alphabet_size):
+    """
+    此函數返回一個案例的標識符（用於比較兩個結果文件中的案例）。
+
+    :param problem: (str) 問題的名稱。
+    :param size_population: (int) 族群大小。
+    :param max_length_chromosome: (int) 染色體的最大長度。
+    :param alphabet_size: (int) 可能的基因的數量。
+    :return:
+        * (str) 標識符，例如 'knapsack/pop=50/len=10/alphabet=100'。
+    """
+    return '{}/pop={}/len={}/alphabet={}'.format(problem, size_population, max_length_chromosome, alphabet_size)
+
+
+def _make_ga(problem, size_population, max_length_chromosome, alphabet_size, generations, seed):
+    """
+    此函數返回一個案例的 Gavl 實例（啟用儀表，不顯示進度）。
+
+    :return:
+        * (Gavl) 已設定超參數的實例。
+    """
+    ga = Gavl()
+    ga.set_hyperparameter('size_population', size_population)
+    ga.set_hyperparameter('min_length_chromosome', 1)
+    ga.set_hyperparameter('max_length_chromosome', max_length_chromosome)
+    for id_hyperparameter, value in make_problem(problem, alphabet_size, max_length_chromosome, seed).items():
+        ga.set_hyperparameter(id_hyperparameter, value)
+    ga.set_hyperparameter('termination_criteria', {'max_num_generation_reached': generations})
+    ga.set_hyperparameter('large_alphabet', int(alphabet_size >= LARGE_ALPHABET_SIZE))
+    ga.set_hyperparameter('seed', seed)
+    ga.set_hyperparameter('show_progress', 0)
+    ga.set_hyperparameter('instrumentation', 1)
+    return ga
+
+
+def run_case(problem, size_population, max_length_chromosome, alphabet_size, generations=20, seed=0, repeats=1, trace_memory=1):
+    """
+    此函數運行基準的一個案例。時間取 repeats 次運行中最快的一次（每次運行使用相同的種子，所以運行相同的工作）。
+
+    :param problem: (str) 問題的名稱（見 problems.PROBLEMS）。
+    :param size_population: (int) 族群大小。
+    :param max_length_chromosome: (int) 染色體的最大長度。
+    :param alphabet_size: (int) 可能的基因的數量。
+    :param generations: (int) 運行的代數。默認為 20。
+    :param seed: (int) 問題和遺傳演算法的種子。默認為 0。
+    :param repeats: (int) 計時的運行次數。默認為 1。
+    :param trace_memory: (int) 是否以 tracemalloc 再運行一次以測量峰值記憶體（1）或不（0）。默認為 1。
+    :return:
+        * (dict) 案例的結果：參數、'generations'、'time'、'initialization_time'、'generations_per_second'、'evaluations'、'evaluations_per_second'、'peak_memory'（字節或 None）、'best_fitness' 和 'phase_totals'。
+    """
+    best = None
+    for _ in range(repeats):
+        ga = _make_ga(problem, size_population, max_length_chromosome, alphabet_size, generations, seed)
+        start_time = time.perf_counter()
+        ga.optimize()
+        elapsed_time = time.perf_counter() - start_time
+        if best is None or elapsed_time < best[0]:
+            best = (elapsed_time, ga)
+    elapsed_time, ga = best
+    run_stats = ga.run_stats
+    generations_run = len(run_stats.generations)
+    generations_time = elapsed_time - run_stats.initialization_time
+    peak_memory = None
+    if trace_memory:
+        memory_ga = _make_ga(problem, size_population, max_length_chromosome, alphabet_size, generations, seed)
+        memory_ga.set_hyperparameter('trace_memory', 1)
+        memory_ga.optimize()
+        peak_memory = memory_ga.run_stats.peak_memory()
+    return {'key': case_key(problem, size_population, max_length_chromosome, alphabet_size),
+            'problem': problem, 'size_population': size_population, 'max_length_chromosome': max_length_chromosome, 'alphabet_size': alphabet_size,
+            'generations': generations_run, 'time': elapsed_time, 'initialization_time': run_stats.initialization_time,
+            'generations_per_second': generations_run / generations_time if generations_time > 0 else None,
+            'evaluations': ga.fitness_evaluations, 'evaluations_per_second': ga.fitness_evaluations / elapsed_time if elapsed_time > 0 else None,
+            'peak_memory': peak_memory, 'best_fitness': ga.best_individual().fitness_value, 'phase_totals': run_stats.phase_totals()}
+
+
+def run_sweep(problems, populations, lengths, alphabets, generations=20, seed=0, repeats=1, trace_memory=1, verbose=1):
+    """
+    此函數運行問題、族群大小、染色體長度和字母表大小的所有組合。無效的組合被跳過：染色體長度大於字母表大小（基因不能重複），或字母表大小大於問題的限制（見 problems.PROBLEMS）。
+
+    :param problems: (list of str) 問題的名稱。
+    :param populations: (list of ints) 族群大小。
+    :param lengths: (list of ints) 染色體的最大長度。
+    :param alphabets: (list of ints) 字母表大小。
+    :param generations: (int) 每個案例運行的代數。默認為 20。
+    :param seed: (int) 種子。默認為 0。
+    :param repeats: (int) 每個案例計時的運行次數。默認為 1。
+    :param trace_memory: (int) 是否測量峰值記憶體。默認為 1。
+    :param verbose: (int) 是否打印每個案例的結果。默認為 1。
+    :return:
+        * (dict) 'metadata'（參數、版本和平台）和 'results'（每個案例的結果列表）。
+    """
+    results = []
+    for problem in problems:
+        max_alphabet_size = PROBLEMS[problem][1] if problem in PROBLEMS else None
+        for alphabet_size in alphabets:
+            if max_alphabet_size is not None and alphabet_size > max_alphabet_size:
+                continue
+            for max_length_chromosome in lengths:
+                if max_length_chromosome > alphabet_size:
+                    continue
+                for size_population in populations:
+                    result = run_case(problem, size_population, max_length_chromosome, alphabet_size, generations=generations, seed=seed, repeats=repeats, trace_memory=trace_memory)
+                    results.append(result)
+                    if verbose:
+                        print(format_result(result))
+    metadata = {'generations': generations, 'seed': seed, 'repeats': repeats, 'python': platform.python_version(), 'numpy': np.__version__,
+                'platform': platform.platform(), 'processor': platform.processor(), 'date': time.strftime('%Y-%m-%d %H:%M:%S')}
+    return {'metadata': metadata, 'results': results}
+
+
+def format_result(result):
+    """
+    此函數返回一個案例的結果的一行文字。
+
+    :param result: (dict) 案例的結果（見 run_case）。
+    :return:
+        * (str) 文字。
+    """
+    peak_memory = '-' if result['peak_memory'] is None else '{:.1f} KiB'.format(result['peak_memory'] / 1024)
+    return '{:<48}{:>12.1f} gen/s{:>14.1f} eval/s{:>14}'.format(result['key'], result['generations_per_second'] or 0, result['evaluations_per_second'] or 0, peak_memory)
+
+
+def save_results(results, path):
+    """
+    此函數將結果保存為 JSON。
+
+    :param results: (dict) run_sweep 返回的結果。
+    :param path: (str) 文件的路徑。
+    """
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump(results, file, indent=2)
+
+
+def load_results(path):
+    """
+    此函數加載 save_results 保存的結果。
+
+    :param path: (str) 文件的路徑。
+    :return:
+        * (dict) 結果。
+    """
+    with open(path, encoding='utf-8') as file:
+        return json.load(file)
@@ -0,0 +1,69 @@
+# 批量適應度的測試：索引矩陣以 -1 填充較短的行、基因被映射為其在 possible_genes 中的索引，並且批量的運行與逐個計算適應度的運行相同。
+import os, sys
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if parent_dir not in sys.path:
+    sys.path.append(parent_dir)
+
+import numpy as np
+import pytest
+import Gavl.Gavl as Gavl
+from Gavl.tools.batch_fitness import build_gene_index, build_index_matrix, evaluate_batch, PADDING_INDEX
+
+POSSIBLE_GENES = ['a', 'b', 'c', 'd', 'e']
+VALUES = np.array([1.0, 2.0, 4.0, 8.0, 16.0])
+
+
+def fitness(chromosome):
+    """ 適應度函數：基因的值的總和。 """
+    return sum(VALUES[POSSIBLE_GENES.index(gene)] for gene in chromosome)
+
+
+def batch_fitness(index_matrix, lengths):
+    """ 向量化的適應度函數：以掩碼忽略填充的位置。 """
+    mask = index_matrix != PADDING_INDEX
+    return np.where(mask, VALUES[index_matrix], 0).sum(axis=1)
+
+
+def test_index_matrix_padding():
+    index_matrix, lengths = build_index_matrix([['c'], ['a', 'e', 'b'], [], ['d', 'a']], build_gene_index(POSSIBLE_GENES))
+    assert index_matrix.tolist() == [[2, -1, -1], [0, 4, 1], [-1, -1, -1], [3, 0, -1]]
+    assert lengths.tolist() == [1, 3, 0, 2]
+    index_matrix, lengths = build_index_matrix([[4, 1], [0]])  # 已經是索引的染色體
+    assert index_matrix.tolist() == [[4, 1], [0, -1]] and lengths.tolist() == [2, 1]
+
+
+def test_evaluate_batch_formats():
+    chromosomes = [['c'], ['a', 'e', 'b'], ['d', 'a']]
+    gene_index = build_gene_index(POSSIBLE_GENES)
+    expected = [fitness(chromosome) for chromosome in chromosomes]
+    assert evaluate_batch(batch_fitness, chromosomes, 'index_matrix', gene_index) == expected
+    assert evaluate_batch(lambda chromosomes: [fitness(chromosome) for chromosome in chromosomes], chromosomes, 'list') == expected
+    assert evaluate_batch(batch_fitness, [], 'index_matrix', gene_index) == []
+    with pytest.raises(ValueError):
+        evaluate_batch(lambda index_matrix, lengths: [0.0], chromosomes, 'index_matrix', gene_index)  # 一個值對應三個染色體
+
+
+def test_batch_run_matches_scalar_run():
+    def run_result(**hyperparameters):
+        ga = Gavl.Gavl()
+        ga.set_hyperparameter('size_population', 20)
+        ga.set_hyperparameter('min_length_chromosome', 1)
+        ga.set_hyperparameter('max_length_chromosome', 4)
+        ga.set_hyperparameter('possible_genes', POSSIBLE_GENES)
+        ga.set_hyperparameter('minimize', 0)
+        ga.set_hyperparameter('termination_criteria', {'max_num_generation_reached': 5})
+        ga.set_hyperparameter('show_progress', 0)
+        ga.set_hyperparameter('seed', 6)
+        for id_hyperparameter, value in hyperparameters.items():
+            ga.set_hyperparameter(id_hyperparameter, value)
+        ga.optimize()
+        return ga.historic_fitness(), [(ind.chromosome, ind.fitness_value) for ind in ga.population]
+    assert run_result(fitness=fitness) == run_result(batch_fitness=batch_fitness, batch_fitness_format='index_matrix')
+
+
+if __name__ == '__main__':
+    for name, test in list(globals().items()):
+        if name.startswith('test_'):
+            test()
+    print('ok')
@@ -0,0 +1,55 @@
+# 位集表示的測試：列表和位集之間的轉換（小的和大的索引）以及位集算子的輸出。
+import os, sys, random
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if parent_dir not in sys.path:
+    sys.path.append(parent_dir)
+
+from Gavl.tools.aux_functions.bitset import to_bitset, from_bitset, sample_complement
+from Gavl.tools.crossover import cross_individuals_bitset
+from Gavl.tools.mutation import mutate_genes_manner_bitset, mutate_length_manner_bitset
+
+
+def always_valid(chromosome):
+    return True
+
+
+def test_round_trip():
+    rng = random.Random(0)
+    for number_of_possible_genes in [10, 5000, 10 ** 6]:
+        indices = rng.sample(range(number_of_possible_genes), min(100, number_of_possible_genes))
+        bitset = to_bitset(indices)
+        assert bitset == sum(1 << index for index in indices)
+        assert from_bitset(bitset) == sorted(indices)
+    assert to_bitset([]) == 0 and from_bitset(0) == []
+
+
+def test_sample_complement():
+    rng = random.Random(0)
+    for number_of_possible_genes in [20, 10 ** 6]:
+        genes = set(rng.sample(range(number_of_possible_genes), 10))
+        for bitset in [to_bitset(list(genes)), None]:
+            new_genes = sample_complement(bitset, number_of_possible_genes, 5, rng, genes)
+            assert len(set(new_genes)) == 5 and not genes & set(new_genes)
+
+
+def test_operators_large_alphabet():
+    rng = random.Random(0)
+    number_of_possible_genes = 10 ** 6
+    for _ in range(20):
+        chromosome_a = rng.sample(range(number_of_possible_genes), 100)
+        chromosome_b = rng.sample(range(number_of_possible_genes), 100)
+        crossed_a, crossed_b = cross_individuals_bitset(chromosome_a, chromosome_b, 1, 150, always_valid, rng=rng)
+        assert sorted(crossed_a + crossed_b) == sorted(chromosome_a + chromosome_b)
+        assert crossed_a == sorted(set(crossed_a)) and crossed_b == sorted(set(crossed_b))
+        mutated = mutate_genes_manner_bitset(chromosome_a, 5, number_of_possible_genes, always_valid, rng)
+        assert len(mutated) == 100 and mutated == sorted(set(mutated)) and 1 <= len(set(mutated) - set(chromosome_a)) <= 5
+        mutated = mutate_length_manner_bitset(chromosome_a, 5, 1, 150, number_of_possible_genes, always_valid, rng)
+        assert mutated == sorted(set(mutated)) and 1 <= abs(len(mutated) - 100) <= 5
+
+
+if __name__ == '__main__':
+    for name, test in list(globals().items()):
+        if name.startswith('test_'):
+            test()
+    print('ok')
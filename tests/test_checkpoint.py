@@ -0,0 +1,75 @@
+# 檢查點的測試：從檢查點繼續的運行與沒有中斷的運行完全相同，並且檢查點文件的格式（開頭和版本）被檢查。
+import os, sys, tempfile
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if parent_dir not in sys.path:
+    sys.path.append(parent_dir)
+
+import pytest
+import Gavl.Gavl as Gavl
+from Gavl.tools.checkpoint import save_checkpoint, load_checkpoint, CHECKPOINT_HEADER, CHECKPOINT_VERSION
+
+
+def fitness(chromosome):
+    """ 適應度函數：基因的總和減去長度的懲罰。 """
+    return sum(chromosome) - 3 * len(chromosome) ** 2
+
+
+def make_ga(generations, **hyperparameters):
+    """ 返回一個小問題的 Gavl 實例。 """
+    ga = Gavl.Gavl()
+    ga.set_hyperparameter('size_population', 30)
+    ga.set_hyperparameter('min_length_chromosome', 1)
+    ga.set_hyperparameter('max_length_chromosome', 10)
+    ga.set_hyperparameter('fitness', fitness)
+    ga.set_hyperparameter('minimize', 0)
+    ga.set_hyperparameter('possible_genes', list(range(50)))
+    ga.set_hyperparameter('keep_diversity', 4)
+    ga.set_hyperparameter('fitness_cache_size', 100)
+    ga.set_hyperparameter('termination_criteria', {'max_num_generation_reached': generations})
+    ga.set_hyperparameter('show_progress', 0)
+    ga.set_hyperparameter('seed', 3)
+    for id_hyperparameter, value in hyperparameters.items():
+        ga.set_hyperparameter(id_hyperparameter, value)
+    return ga
+
+
+def test_resume_matches_straight_run():
+    straight = make_ga(12)
+    straight.optimize()
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'run.ckpt')
+        interrupted = make_ga(7, checkpoint_path=path, checkpoint_interval=5)
+        interrupted.optimize()  # 最後的檢查點在第 5 代，之後的兩代丟失（如同中斷的運行）
+        assert load_checkpoint(path)['generation_count'] == 5
+        resumed = make_ga(12)
+        resumed.optimize(resume_from=path)
+    assert resumed.historic_fitness() == straight.historic_fitness()
+    assert resumed.best_individual().chromosome == straight.best_individual().chromosome
+
+
+def test_checkpoint_file_round_trip():
+    state = {'population': [([1, 2, 3], 6.0), ([4], None)], 'generation_count': 2}
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'state.ckpt')
+        save_checkpoint(path, state)
+        with open(path, 'rb') as file:
+            data = file.read()
+        assert data.startswith(CHECKPOINT_HEADER) and data[len(CHECKPOINT_HEADER)] == CHECKPOINT_VERSION
+        assert load_checkpoint(path) == state
+        assert os.listdir(directory) == ['state.ckpt']  # 沒有留下臨時文件
+        with open(path, 'wb') as file:  # 不支持的版本
+            file.write(data[:len(CHECKPOINT_HEADER)] + bytes([CHECKPOINT_VERSION + 1]) + data[len(CHECKPOINT_HEADER) + 1:])
+        with pytest.raises(ValueError):
+            load_checkpoint(path)
+        with open(path, 'wb') as file:  # 不是檢查點的文件
+            file.write(b'NOTACKPT' + data[len(CHECKPOINT_HEADER):])
+        with pytest.raises(ValueError):
+            load_checkpoint(path)
+
+
+if __name__ == '__main__':
+    for name, test in list(globals().items()):
+        if name.startswith('test_'):
+            test()
+    print('ok')
@@ -0,0 +1,77 @@
+# 交叉的測試：可行的交換基因數量對與暴力枚舉相同，每個基因組合對恰好被抽樣一次，並且交叉的計數器（'attempts'、'invalid'、'no_op'）被填寫。
+import os, sys, random
+from itertools import combinations, product
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if parent_dir not in sys.path:
+    sys.path.append(parent_dir)
+
+import Gavl.Gavl as Gavl
+from Gavl.tools.crossover import feasible_size_pairs, sample_genes_to_swap, cross_individuals, mating
+
+
+def brute_force_size_pairs(length_a, length_b, num_genes_a, num_genes_b, min_length_chromosome, max_length_chromosome):
+    """ 測試每一對 (num_a, num_b) 的可行數量對。 """
+    return [(num_a, num_b) for num_a in range(1, num_genes_a + 1) for num_b in range(1, num_genes_b + 1)
+            if min_length_chromosome <= length_a - num_a + num_b <= max_length_chromosome and min_length_chromosome <= length_b - num_b + num_a <= max_length_chromosome]
+
+
+def test_feasible_size_pairs_match_brute_force():
+    for max_length_chromosome in range(1, 8):
+        for min_length_chromosome in range(0, max_length_chromosome + 1):
+            for length_a, length_b in product(range(min_length_chromosome, max_length_chromosome + 1), repeat=2):
+                for num_genes_a, num_genes_b in product(range(length_a + 1), range(length_b + 1)):
+                    expected = brute_force_size_pairs(length_a, length_b, num_genes_a, num_genes_b, min_length_chromosome, max_length_chromosome)
+                    assert feasible_size_pairs(length_a, length_b, num_genes_a, num_genes_b, min_length_chromosome, max_length_chromosome) == expected
+
+
+def test_sample_genes_to_swap_covers_every_pair_once():
+    genes_a, genes_b = [1, 2, 3], [7, 8]
+    size_pairs = feasible_size_pairs(4, 3, len(genes_a), len(genes_b), 2, 5)
+    drawn = [(tuple(change_a), tuple(change_b)) for change_a, change_b in sample_genes_to_swap(genes_a, genes_b, size_pairs, random.Random(0))]
+    expected = [(change_a, change_b) for num_a, num_b in size_pairs for change_a in combinations(genes_a, num_a) for change_b in combinations(genes_b, num_b)]
+    assert sorted(drawn) == sorted(expected)
+    assert list(sample_genes_to_swap(genes_a, genes_b, [], random.Random(0))) == []
+
+
+def test_crossover_stats_without_feasible_swap():
+    stats = {}
+    crossed = cross_individuals([1, 2, 3], [3, 2, 1], 1, 5, 0, lambda chromosome: True, crossover_stats=stats, rng=random.Random(0))  # 相同的基因 ---> 沒有可交換的基因
+    assert crossed == ([1, 2, 3], [3, 2, 1])
+    assert stats == {'attempts': 0, 'invalid': 0, 'no_op': 1}
+    stats = {}
+    cross_individuals([1, 2], [5, 6], 2, 2, 0, lambda chromosome: False, crossover_stats=stats, rng=random.Random(0))  # 所有交換都無效
+    assert stats == {'attempts': 5, 'invalid': 5, 'no_op': 1}  # 長度必須保持 2 ---> 1 對 1 的 4 種交換和 2 對 2 的 1 種交換
+    stats = {}
+    cross_individuals([1, 2, 3], [5, 6, 7], 1, 5, 0, lambda chromosome: False, max_attempts=10, crossover_stats=stats, rng=random.Random(0))
+    assert stats == {'attempts': 10, 'invalid': 10, 'no_op': 1}
+
+
+def test_crossover_stats_are_accumulated():
+    stats = {}
+    crossed = mating([([1, 2, 3], [4, 5, 6]), ([1], [1])], 1, 5, 0, lambda chromosome: len(chromosome) == 3, crossover_stats=stats, rng=random.Random(0))
+    assert len(crossed[0]) == len(crossed[1]) == 3 and crossed[:2] != [[1, 2, 3], [4, 5, 6]]
+    assert crossed[2:] == [[1], [1]]
+    assert stats['no_op'] == 1 and stats['attempts'] >= 1 and stats['invalid'] == stats['attempts'] - 1
+
+
+def test_crossover_stats_per_generation():
+    ga = Gavl.Gavl()
+    ga.set_hyperparameter('size_population', 20)
+    ga.set_hyperparameter('min_length_chromosome', 1)
+    ga.set_hyperparameter('max_length_chromosome', 4)
+    ga.set_hyperparameter('fitness', len)
+    ga.set_hyperparameter('possible_genes', list(range(10)))
+    ga.set_hyperparameter('termination_criteria', {'max_num_generation_reached': 3})
+    ga.set_hyperparameter('show_progress', 0)
+    ga.set_hyperparameter('seed', 0)
+    ga.optimize()
+    assert len(ga.crossover_stats_per_generation) == 3
+    assert all(set(stats) >= {'attempts', 'invalid', 'no_op'} for stats in ga.crossover_stats_per_generation)
+
+
+if __name__ == '__main__':
+    for name, test in list(globals().items()):
+        if name.startswith('test_'):
+            test()
+    print('ok')
@@ -0,0 +1,88 @@
+# 可重現性的測試：相同的種子給出相同的運行（每種染色體表示、保持多樣性、約束的修復、島嶼模型和多次獨立運行）。
+import os, sys
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if parent_dir not in sys.path:
+    sys.path.append(parent_dir)
+
+import Gavl.Gavl as Gavl
+from Gavl.tools.constraints import WeightedCapacity, ForbiddenPairs
+from Gavl.tools.islands import IslandModel
+
+
+def fitness(chromosome):
+    """ 適應度函數：基因的總和減去長度的懲罰。 """
+    return sum(chromosome) - 2 * len(chromosome) ** 2
+
+
+def make_ga(seed=7, **hyperparameters):
+    """ 返回一個小問題的 Gavl 實例。 """
+    ga = Gavl.Gavl()
+    ga.set_hyperparameter('size_population', 30)
+    ga.set_hyperparameter('min_length_chromosome', 1)
+    ga.set_hyperparameter('max_length_chromosome', 8)
+    ga.set_hyperparameter('fitness', fitness)
+    ga.set_hyperparameter('minimize', 0)
+    ga.set_hyperparameter('possible_genes', list(range(40)))
+    ga.set_hyperparameter('termination_criteria', {'max_num_generation_reached': 10})
+    ga.set_hyperparameter('show_progress', 0)
+    ga.set_hyperparameter('seed', seed)
+    for id_hyperparameter, value in hyperparameters.items():
+        ga.set_hyperparameter(id_hyperparameter, value)
+    return ga
+
+
+def run_result(ga):
+    """ 運行優化並返回可比較的結果：每一代的最佳適應度和最後的族群。 """
+    ga.optimize()
+    return list(ga.historic_fitness()), [(list(ind.chromosome), ind.fitness_value) for ind in ga.population]
+
+
+def assert_deterministic(**hyperparameters):
+    """ 以相同的種子運行兩次，結果必須相同。 """
+    assert run_result(make_ga(**hyperparameters)) == run_result(make_ga(**hyperparameters))
+
+
+def test_list_representation():
+    assert_deterministic()
+
+
+def test_bitset_representation():
+    assert_deterministic(chromosome_representation='bitset')
+
+
+def test_counts_representation():
+    assert_deterministic(repeated_genes_allowed=1, chromosome_representation='counts')
+
+
+def test_keep_diversity():
+    assert_deterministic(keep_diversity=2)
+    assert_deterministic(repeated_genes_allowed=1, chromosome_representation='counts', keep_diversity=2)
+
+
+def test_constraints_repair():
+    constraints = [WeightedCapacity({gene: gene % 7 + 1 for gene in range(40)}, 20), ForbiddenPairs([(38, 39), (36, 37)])]
+    assert_deterministic(constraints=constraints, keep_diversity=3)
+
+
+def test_island_model():
+    def island_result(use_processes):
+        model = IslandModel([make_ga(), make_ga(large_alphabet=1)], migration_interval=3, use_processes=use_processes, seed=11)
+        model.optimize()
+        return model.historic_fitness(), model.island_best_fitness_per_generation, model.best_individual().chromosome
+    assert island_result(0) == island_result(0) == island_result(1)  # 在進程中運行的島嶼給出相同的結果
+
+
+def test_optimize_many():
+    def many_result(workers):
+        ga = make_ga()
+        best_individual = ga.optimize_many(3, workers=workers, seed=5)
+        return best_individual.chromosome, best_individual.fitness_value, [(result['seed'], result['best_chromosome'], result['best_fitness_per_generation']) for result in ga.multistart_results]
+    assert many_result(1) == many_result(1) == many_result(2)  # 結果與進程的數量無關
+
+
+if __name__ == '__main__':
+    for name, test in list(globals().items()):
+        if name.startswith('test_'):
+            test()
+    print('ok')
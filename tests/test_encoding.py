@@ -0,0 +1,54 @@
+# 整數索引編碼的測試：編碼和解碼互為逆運算，不在列表中的基因和重複的可能基因引發 ValueError。
+import os, sys
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if parent_dir not in sys.path:
+    sys.path.append(parent_dir)
+
+import pytest
+import Gavl.Gavl as Gavl
+from Gavl.tools.encoding import GeneEncoder
+
+
+def fitness(chromosome):
+    """ 適應度函數：基因的長度總和。 """
+    return sum(len(gene) for gene in chromosome)
+
+
+def test_encode_decode_round_trip():
+    encoder = GeneEncoder(['x', ['a', 1], {'k': 2}, 'y'])
+    chromosome = [{'k': 2}, 'x', ['a', 1]]
+    assert encoder.encode(chromosome) == [2, 0, 1]
+    assert encoder.decode(encoder.encode(chromosome)) == chromosome
+    assert encoder.indices == [0, 1, 2, 3] and len(encoder) == 4
+    with pytest.raises(ValueError):
+        encoder.encode(['z'])
+
+
+def test_repeated_possible_genes_are_rejected():
+    with pytest.raises(ValueError, match='重複的基因'):
+        GeneEncoder(['a', 'b', 'a'])
+    with pytest.raises(ValueError):
+        GeneEncoder([['a', 1], ['a', 1]])  # 不可雜湊的基因以其凍結的版本比較
+
+
+def test_optimize_rejects_repeated_genes_with_index_encoding():
+    ga = Gavl.Gavl()
+    ga.set_hyperparameter('size_population', 20)
+    ga.set_hyperparameter('min_length_chromosome', 1)
+    ga.set_hyperparameter('max_length_chromosome', 2)
+    ga.set_hyperparameter('fitness', fitness)
+    ga.set_hyperparameter('possible_genes', ['aa', 'b', 'aa', 'cc'])
+    ga.set_hyperparameter('repeated_genes_allowed', 1)
+    ga.set_hyperparameter('gene_encoding', 'index')
+    ga.set_hyperparameter('termination_criteria', {'max_num_generation_reached': 2})
+    ga.set_hyperparameter('show_progress', 0)
+    with pytest.raises(ValueError, match='重複的基因'):
+        ga.optimize()
+
+
+if __name__ == '__main__':
+    for name, test in list(globals().items()):
+        if name.startswith('test_'):
+            test()
+    print('ok')
@@ -0,0 +1,59 @@
+# 評估器的測試：串行、線程池和進程池評估器給出相同的適應度值（順序相同），並且使用不同的評估器的運行相同。
+import os, sys
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if parent_dir not in sys.path:
+    sys.path.append(parent_dir)
+
+import pytest
+import Gavl.Gavl as Gavl
+from Gavl.tools.evaluator import get_evaluator
+
+
+def fitness(chromosome):
+    """ 適應度函數：基因的加權總和（定義在模組層級，以便能夠被傳送到其他進程）。 """
+    return sum((i + 1) * gene for i, gene in enumerate(chromosome)) / (len(chromosome) + 1)
+
+
+def test_evaluators_give_identical_values():
+    chromosomes = [[(i * 7 + j * 3) % 50 for j in range(i % 9 + 1)] for i in range(203)]
+    expected = [fitness(chromosome) for chromosome in chromosomes]
+    for name in ['serial', 'thread', 'process']:
+        for chunk_size in [None, 1, 17]:
+            evaluator = get_evaluator(name, workers=2, chunk_size=chunk_size)
+            try:
+                assert evaluator.map(fitness, chromosomes) == expected
+                assert evaluator.map(fitness, chromosomes[:5]) == expected[:5]  # 池在各次調用之間重複使用
+                assert evaluator.map(fitness, []) == []
+            finally:
+                evaluator.close()
+
+
+def test_unknown_evaluator():
+    with pytest.raises(ValueError):
+        get_evaluator('gpu')
+
+
+def test_runs_are_identical_with_every_evaluator():
+    def run_result(evaluator):
+        ga = Gavl.Gavl()
+        ga.set_hyperparameter('size_population', 24)
+        ga.set_hyperparameter('min_length_chromosome', 1)
+        ga.set_hyperparameter('max_length_chromosome', 6)
+        ga.set_hyperparameter('fitness', fitness)
+        ga.set_hyperparameter('possible_genes', list(range(30)))
+        ga.set_hyperparameter('evaluator', evaluator)
+        ga.set_hyperparameter('evaluator_workers', 2)
+        ga.set_hyperparameter('termination_criteria', {'max_num_generation_reached': 5})
+        ga.set_hyperparameter('show_progress', 0)
+        ga.set_hyperparameter('seed', 4)
+        ga.optimize()
+        return ga.historic_fitness(), [(ind.chromosome, ind.fitness_value) for ind in ga.population]
+    assert run_result('serial') == run_result('thread') == run_result('process')
+
+
+if __name__ == '__main__':
+    for name, test in list(globals().items()):
+        if name.startswith('test_'):
+            test()
+    print('ok')
@@ -0,0 +1,75 @@
+# 適應度快取的測試：命中和未命中的計數器、以規範形式為鍵（基因的順序無關）和最近最少使用（LRU）的淘汰。
+import os, sys
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if parent_dir not in sys.path:
+    sys.path.append(parent_dir)
+
+import Gavl.Gavl as Gavl
+from Gavl.tools.fitness_cache import FitnessCache
+
+
+class CountingFitness:
+    """ 計算調用次數的適應度函數（基因的總和）。 """
+
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, chromosome):
+        self.calls += 1
+        return sum(chromosome)
+
+
+def test_hits_and_misses():
+    cache = FitnessCache(10, 0)
+    key = cache.key([3, 1, 2])
+    assert cache.get(key) == (False, None)
+    cache.put(key, 6)
+    assert cache.get(cache.key([1, 2, 3])) == (True, 6)  # 基因的順序無關
+    assert cache.get(cache.key([1, 2])) == (False, None)
+    assert cache.stats() == {'hits': 1, 'misses': 2, 'evictions': 0, 'size': 1, 'max_size': 10}
+
+
+def test_multiset_keys():
+    cache = FitnessCache(10, 1)
+    cache.put(cache.key([1, 1, 2]), 4)
+    assert cache.get(cache.key([1, 2, 1])) == (True, 4)
+    assert cache.get(cache.key([1, 2, 2])) == (False, None)  # 允許重複基因時，副本的數量是鍵的一部分
+
+
+def test_lru_eviction():
+    cache = FitnessCache(2, 0)
+    cache.put(cache.key([1]), 1)
+    cache.put(cache.key([2]), 2)
+    cache.get(cache.key([1]))  # [1] 成為最近使用的
+    cache.put(cache.key([3]), 3)  # 淘汰最近最少使用的 [2]
+    assert cache.key([1]) in cache and cache.key([3]) in cache and cache.key([2]) not in cache
+    assert len(cache) == 2 and cache.evictions == 1
+    cache.clear()
+    assert cache.stats() == {'hits': 0, 'misses': 0, 'evictions': 0, 'size': 0, 'max_size': 2}
+
+
+def test_cache_saves_evaluations():
+    fitness = CountingFitness()
+    ga = Gavl.Gavl()
+    ga.set_hyperparameter('size_population', 20)
+    ga.set_hyperparameter('min_length_chromosome', 1)
+    ga.set_hyperparameter('max_length_chromosome', 3)
+    ga.set_hyperparameter('fitness', fitness)
+    ga.set_hyperparameter('possible_genes', list(range(6)))
+    ga.set_hyperparameter('fitness_cache_size', 100)
+    ga.set_hyperparameter('termination_criteria', {'max_num_generation_reached': 10})
+    ga.set_hyperparameter('show_progress', 0)
+    ga.set_hyperparameter('seed', 2)
+    ga.optimize()
+    stats = ga.fitness_cache_stats()
+    assert stats['hits'] > 0
+    assert fitness.calls == stats['misses']  # 只有未命中時才調用適應度函數
+    assert stats['size'] <= 41  # 最多 C(6,1) + C(6,2) + C(6,3) 個不同的染色體
+
+
+if __name__ == '__main__':
+    for name, test in list(globals().items()):
+        if name.startswith('test_'):
+            test()
+    print('ok')
@@ -0,0 +1,59 @@
+# 初始族群生成的測試：並行檢查有效性（評估器的進程）和批量生成的索引染色體。
+import os, sys
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if parent_dir not in sys.path:
+    sys.path.append(parent_dir)
+
+import tracemalloc
+import numpy as np
+import Gavl.Gavl as Gavl
+from Gavl.tools.initialization import generate_index_chromosomes
+
+
+def fitness(chromosome):
+    """ 適應度函數：基因的總和（模組級的函數，可以被發送到其他進程）。 """
+    return sum(chromosome)
+
+
+def test_parallel_validation_with_default_check():
+    for gene_encoding in ['object', 'index']:
+        ga = Gavl.Gavl()
+        ga.set_hyperparameter('size_population', 20)
+        ga.set_hyperparameter('min_length_chromosome', 1)
+        ga.set_hyperparameter('max_length_chromosome', 5)
+        ga.set_hyperparameter('fitness', fitness)
+        ga.set_hyperparameter('possible_genes', list(range(50)))
+        ga.set_hyperparameter('termination_criteria', {'max_num_generation_reached': 2})
+        ga.set_hyperparameter('show_progress', 0)
+        ga.set_hyperparameter('evaluator', 'process')
+        ga.set_hyperparameter('evaluator_workers', 2)
+        ga.set_hyperparameter('initialization_parallel_validation', 1)
+        ga.set_hyperparameter('gene_encoding', gene_encoding)
+        ga.optimize()  # 默認的 check_valid_individual 必須可以被序列化
+        assert len(ga.population) == 20 and ga.initialization_stats['accepted'] >= 20
+
+
+def test_index_chromosomes_without_repetition():
+    for number_of_possible_genes, max_length_chromosome in [(9, 9), (50, 10), (1000, 400), (100000, 400), (100000, 10)]:
+        chromosomes = generate_index_chromosomes(200, 1, max_length_chromosome, number_of_possible_genes, 0, np.random.default_rng(0))
+        assert len(chromosomes) == 200
+        for chromosome in chromosomes:
+            assert 1 <= len(chromosome) <= max_length_chromosome
+            assert len(set(chromosome)) == len(chromosome)
+            assert all(0 <= gene < number_of_possible_genes for gene in chromosome)
+
+
+def test_index_chromosomes_memory_does_not_scale_with_alphabet():
+    tracemalloc.start()
+    generate_index_chromosomes(1000, 1, 400, 100000, 0, np.random.default_rng(0))
+    peak_memory = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    assert peak_memory < 1000 * 100000 * 8 / 10  # 一個 (染色體 x 可能的基因) 的浮點矩陣需要 800 MB
+
+
+if __name__ == '__main__':
+    for name, test in list(globals().items()):
+        if name.startswith('test_'):
+            test()
+    print('ok')
@@ -0,0 +1,41 @@
+# 島嶼模型的測試：島嶼（包括在其他進程中運行的島嶼）不打印自己的進度，進度由協調者每次遷移報告一次。
+import os, sys
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if parent_dir not in sys.path:
+    sys.path.append(parent_dir)
+
+import Gavl.Gavl as Gavl
+from Gavl.tools.islands import IslandModel
+
+
+def fitness(chromosome):
+    """ 適應度函數：基因的總和。 """
+    return sum(chromosome)
+
+
+def make_ga():
+    """ 返回一個顯示進度的小問題的 Gavl 實例。 """
+    ga = Gavl.Gavl()
+    ga.set_hyperparameter('size_population', 20)
+    ga.set_hyperparameter('min_length_chromosome', 1)
+    ga.set_hyperparameter('max_length_chromosome', 4)
+    ga.set_hyperparameter('fitness', fitness)
+    ga.set_hyperparameter('possible_genes', list(range(20)))
+    ga.set_hyperparameter('termination_criteria', {'max_num_generation_reached': 9})
+    ga.set_hyperparameter('show_progress', 1)
+    return ga
+
+
+def test_progress_is_reported_once_per_migration(capfd):
+    for use_processes in [0, 1]:
+        model = IslandModel([make_ga(), make_ga(), make_ga()], migration_interval=3, use_processes=use_processes, seed=0)
+        model.optimize()
+        lines = [line for line in capfd.readouterr().out.splitlines() if line.startswith('Generation:')]
+        assert lines == ['Generation: 3', 'Generation: 6', 'Generation: 9']  # 而不是每個島嶼每一代一行
+        assert all(ga.show_progress == 1 for ga in model.islands)  # 島嶼的配置沒有被改變
+
+
+if __name__ == '__main__':
+    import pytest
+    sys.exit(pytest.main([__file__]))
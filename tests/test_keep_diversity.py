@@ -0,0 +1,77 @@
+# 保持多樣性的測試：重複的個體和最差的 25% 被替換，並且生成新個體有預算（超過時保留舊染色體而不是無限循環）。
+import os, sys, random
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if parent_dir not in sys.path:
+    sys.path.append(parent_dir)
+
+import Gavl.Gavl as Gavl
+from Gavl.tools.individual import Individual
+from Gavl.tools.keep_diversity import keep_diversity
+from Gavl.tools.generate_chromosome import generate_chromosome
+
+
+def make_population():
+    """ 返回一個有重複個體的族群（按適應度排序）。 """
+    chromosomes = [[1, 2], [3, 4], [2, 1], [5, 6], [7, 8], [4, 3], [9, 10], [11, 12]]
+    return [Individual(chromosome) for chromosome in chromosomes]
+
+
+def test_duplicates_and_worst_are_replaced():
+    population = make_population()
+    stats = {}
+    new_chromosomes = keep_diversity(population, generate_chromosome, 1, 3, list(range(100, 200)), 0, lambda chromosome: True, stats, rng=random.Random(0))
+    assert new_chromosomes[:2] == [[1, 2], [3, 4]] and new_chromosomes[3:5] == [[5, 6], [7, 8]]
+    assert all(min(chromosome) >= 100 for chromosome in [new_chromosomes[2], new_chromosomes[5]] + new_chromosomes[6:])
+    assert stats == {'duplicates': 2, 'new_individuals': 4, 'not_replaced': 0}
+
+
+def test_exhausted_budget_keeps_old_chromosomes():
+    population = make_population()
+    stats = {}
+    new_chromosomes = keep_diversity(population, generate_chromosome, 1, 3, list(range(100, 200)), 0, lambda chromosome: False, stats, rng=random.Random(0), max_attempts=50)
+    assert new_chromosomes == [ind.chromosome for ind in population]
+    assert stats == {'duplicates': 2, 'new_individuals': 0, 'not_replaced': 4}
+
+
+def fitness(chromosome):
+    """ 適應度函數：基因的總和。 """
+    return sum(chromosome)
+
+
+class AcceptFirst:
+    """ 只接受前 limit 個被檢查的染色體的有效性函數（之後的新個體都無效）。 """
+
+    def __init__(self, limit):
+        self.limit = limit
+        self.checked = 0
+
+    def __call__(self, chromosome):
+        self.checked += 1
+        return self.checked <= self.limit
+
+
+def test_strict_check_does_not_hang():
+    ga = Gavl.Gavl()
+    ga.set_hyperparameter('size_population', 20)
+    ga.set_hyperparameter('min_length_chromosome', 1)
+    ga.set_hyperparameter('max_length_chromosome', 5)
+    ga.set_hyperparameter('fitness', fitness)
+    ga.set_hyperparameter('possible_genes', list(range(30)))
+    ga.set_hyperparameter('check_valid_individual', AcceptFirst(20))
+    ga.set_hyperparameter('mutation_rate', 0)
+    ga.set_hyperparameter('keep_diversity', 1)
+    ga.set_hyperparameter('initialization_max_attempts', 200)
+    ga.set_hyperparameter('termination_criteria', {'max_num_generation_reached': 3})
+    ga.set_hyperparameter('show_progress', 0)
+    ga.set_hyperparameter('seed', 1)
+    ga.optimize()
+    assert len(ga.population) == 20
+    assert all(stats['new_individuals'] == 0 for stats in ga.diversity_stats_per_generation)
+
+
+if __name__ == '__main__':
+    for name, test in list(globals().items()):
+        if name.startswith('test_'):
+            test()
+    print('ok')
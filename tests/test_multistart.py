@@ -0,0 +1,44 @@
+# 多次獨立運行的測試：每次運行（包括在進程池中的運行）不打印每一代的進度，每次運行結束時打印一行。
+import os, sys
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if parent_dir not in sys.path:
+    sys.path.append(parent_dir)
+
+import Gavl.Gavl as Gavl
+
+
+def fitness(chromosome):
+    """ 適應度函數：基因的總和。 """
+    return sum(chromosome)
+
+
+def make_ga(show_progress):
+    """ 返回一個小問題的 Gavl 實例。 """
+    ga = Gavl.Gavl()
+    ga.set_hyperparameter('size_population', 20)
+    ga.set_hyperparameter('min_length_chromosome', 1)
+    ga.set_hyperparameter('max_length_chromosome', 4)
+    ga.set_hyperparameter('fitness', fitness)
+    ga.set_hyperparameter('possible_genes', list(range(20)))
+    ga.set_hyperparameter('termination_criteria', {'max_num_generation_reached': 5})
+    ga.set_hyperparameter('show_progress', show_progress)
+    return ga
+
+
+def test_runs_do_not_print_generations(capfd):
+    for workers in [1, 2]:
+        ga = make_ga(1)
+        ga.optimize_many(3, workers=workers, seed=0)
+        lines = capfd.readouterr().out.splitlines()
+        assert not any(line.startswith('Generation:') for line in lines)
+        assert sorted(line.split(' (')[0] for line in lines) == ['Run: 1/3', 'Run: 2/3', 'Run: 3/3']
+        assert ga.show_progress == 1  # 這個實例的配置沒有被改變
+        ga = make_ga(0)
+        ga.optimize_many(2, workers=workers, seed=0)
+        assert capfd.readouterr().out == ''
+
+
+if __name__ == '__main__':
+    import pytest
+    sys.exit(pytest.main([__file__]))
@@ -0,0 +1,64 @@
+# optimize_iter 的測試：在兩代之間運行被暫停，所以停止迭代（即使生成器仍然被引用）後族群被解碼並且評估器被關閉，而完整的迭代與 optimize 的運行相同。
+import os, sys
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if parent_dir not in sys.path:
+    sys.path.append(parent_dir)
+
+import Gavl.Gavl as Gavl
+
+POSSIBLE_GENES = ['g{}'.format(i) for i in range(30)]
+
+
+def fitness(chromosome):
+    """ 適應度函數：基因編號的總和減去長度的懲罰。 """
+    return sum(int(gene[1:]) for gene in chromosome) - 3 * len(chromosome) ** 2
+
+
+def make_ga(**hyperparameters):
+    """ 返回一個使用整數索引編碼的小問題的 Gavl 實例。 """
+    ga = Gavl.Gavl()
+    ga.set_hyperparameter('size_population', 20)
+    ga.set_hyperparameter('min_length_chromosome', 1)
+    ga.set_hyperparameter('max_length_chromosome', 6)
+    ga.set_hyperparameter('fitness', fitness)
+    ga.set_hyperparameter('minimize', 0)
+    ga.set_hyperparameter('possible_genes', POSSIBLE_GENES)
+    ga.set_hyperparameter('gene_encoding', 'index')
+    ga.set_hyperparameter('termination_criteria', {'max_num_generation_reached': 8})
+    ga.set_hyperparameter('show_progress', 0)
+    ga.set_hyperparameter('seed', 9)
+    for id_hyperparameter, value in hyperparameters.items():
+        ga.set_hyperparameter(id_hyperparameter, value)
+    return ga
+
+
+def test_break_keeps_a_finished_run():
+    ga = make_ga(evaluator='thread', evaluator_workers=2)
+    iterator = ga.optimize_iter()
+    for snapshot in iterator:
+        if snapshot.generation == 3:
+            break
+    assert all(gene in POSSIBLE_GENES for ind in ga.population for gene in ind.chromosome)  # 染色體被解碼
+    assert all(gene in POSSIBLE_GENES for gene in ga.best_individual().chromosome)
+    assert ga._evaluator is None and ga._rng is None  # 池被關閉，隨機數生成器被取出
+    assert len(ga.historic_fitness()) == 3
+    del iterator  # 暫停的運行已經結束，關閉生成器不會再次解碼
+    assert all(gene in POSSIBLE_GENES for ind in ga.population for gene in ind.chromosome)
+
+
+def test_iteration_matches_optimize():
+    iterated = make_ga(keep_diversity=3)
+    snapshots = list(iterated.optimize_iter())
+    straight = make_ga(keep_diversity=3)
+    straight.optimize()
+    assert [snapshot.best_fitness for snapshot in snapshots] == straight.historic_fitness() == iterated.historic_fitness()
+    assert [(ind.chromosome, ind.fitness_value) for ind in iterated.population] == [(ind.chromosome, ind.fitness_value) for ind in straight.population]
+    assert iterated.fitness_evaluations == straight.fitness_evaluations  # 暫停和繼續不會重新計算適應度
+
+
+if __name__ == '__main__':
+    for name, test in list(globals().items()):
+        if name.startswith('test_'):
+            test()
+    print('ok')
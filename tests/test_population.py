@@ -0,0 +1,85 @@
+# 族群的測試：保留適應度值的個體必須與其染色體的內容一致（即使自定義的算子就地修改染色體），並且通過ID查找個體在外部修改族群列表後仍然正確。
+import os, sys
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if parent_dir not in sys.path:
+    sys.path.append(parent_dir)
+
+import Gavl.Gavl as Gavl
+from Gavl.tools.individual import Individual
+
+
+def fitness(chromosome):
+    """ 適應度函數：基因的總和。 """
+    return sum(chromosome)
+
+
+def in_place_mutation(chromosomes, mutation_type, max_num_gen_changed_mutation, min_length_chromosome, max_length_chromosome, repeated_genes_allowed, check_valid_individual, possible_genes):
+    """ 就地修改染色體並返回相同的列表對象的突變函數。 """
+    for chromosome in chromosomes:
+        if len(chromosome) > min_length_chromosome:
+            chromosome.pop()
+    return chromosomes
+
+
+def make_ga(**hyperparameters):
+    """ 返回一個小問題的 Gavl 實例。 """
+    ga = Gavl.Gavl()
+    ga.set_hyperparameter('size_population', 20)
+    ga.set_hyperparameter('min_length_chromosome', 1)
+    ga.set_hyperparameter('max_length_chromosome', 8)
+    ga.set_hyperparameter('fitness', fitness)
+    ga.set_hyperparameter('possible_genes', list(range(30)))
+    ga.set_hyperparameter('termination_criteria', {'max_num_generation_reached': 5})
+    ga.set_hyperparameter('show_progress', 0)
+    ga.set_hyperparameter('seed', 1)
+    for id_hyperparameter, value in hyperparameters.items():
+        ga.set_hyperparameter(id_hyperparameter, value)
+    return ga
+
+
+def test_in_place_mutation_is_reevaluated():
+    ga = make_ga(mutation=in_place_mutation, mutation_rate=0.5)
+    ga.optimize()
+    assert all(ind.fitness_value == fitness(ind.chromosome) for ind in ga.population)
+
+
+def test_unchanged_chromosomes_keep_fitness():
+    ga = make_ga()
+    ga.optimize()
+    assert sum(ga.skipped_evaluations_per_generation) > 0  # 精英沒有被重新計算
+    assert all(ind.fitness_value == fitness(ind.chromosome) for ind in ga.population)
+
+
+def test_lookup_by_id_after_external_edits():
+    ga = make_ga()
+    ga.optimize()
+    replaced = ga.population[0]
+    ga.population[0] = Individual([9])  # 替換一個個體（長度不變）
+    assert ga.get_individual_by_id(replaced._id) is None
+    assert ga.get_individual_by_id(ga.population[0]._id) is ga.population[0]
+    ga.population.reverse()  # 改變位置
+    assert all(ga.get_individual_by_id(ind._id) is ind for ind in ga.population)
+    removed = ga.population.pop()
+    assert ga.get_individual_by_id(removed._id) is None
+    ga.population.append(removed)  # 不經過 add_individual 添加
+    assert ga.get_individual_by_id(removed._id) is removed
+
+
+def selection_by_lookup(population, minimize, number_of_individuals):
+    """ 選擇最好的個體並檢查每個ID都能被查找到的自定義選擇函數。 """
+    ranked = sorted(population, key=lambda ind: ind.fitness_value, reverse=not minimize)
+    return [ind._id for ind in ranked[:number_of_individuals]]
+
+
+def test_custom_selection_uses_lookup():
+    ga = make_ga(selection=selection_by_lookup)
+    ga.optimize()
+    assert all(ga.get_individual_by_id(ind._id) is ind for ind in ga.population)
+
+
+if __name__ == '__main__':
+    for name, test in list(globals().items()):
+        if name.startswith('test_'):
+            test()
+    print('ok')
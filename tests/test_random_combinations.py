@@ -0,0 +1,57 @@
+# 隨機組合的測試：Floyd 演算法的索引組合是均勻的，並且 unique=True 時每個組合（或組合對）恰好返回一次。
+import os, sys, random
+from collections import Counter
+from itertools import combinations, product
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if parent_dir not in sys.path:
+    sys.path.append(parent_dir)
+
+import pytest
+from Gavl.tools.aux_functions.random_combinations import sample_indices, random_combinations, random_combination_pairs, sample_excluding
+
+
+def test_sample_indices_is_uniform():
+    rng = random.Random(0)
+    draws = 30000
+    counts = Counter(sample_indices(6, 2, rng) for _ in range(draws))
+    assert set(counts) == set(combinations(range(6), 2))  # 組合是排序的、不重複的索引
+    expected = draws / 15
+    assert all(abs(count - expected) < 0.1 * expected for count in counts.values())
+    position_counts = Counter(index for _ in range(draws) for index in sample_indices(10, 3, rng))
+    assert all(abs(count - draws * 3 / 10) < 0.05 * draws * 3 / 10 for count in position_counts.values())  # 每個索引被選中的概率是 k / n
+    assert sample_indices(4, 0, rng) == () and sample_indices(4, 4, rng) == (0, 1, 2, 3)
+
+
+def test_unique_combinations_cover_every_combination_once():
+    elements = ['a', 'b', 'c', 'd', 'e', 'f', 'g']
+    for length_combination in range(len(elements) + 1):
+        drawn = [tuple(combination) for combination in random_combinations(elements, length_combination, unique=True, rng=random.Random(length_combination))]
+        assert sorted(drawn) == sorted(combinations(elements, length_combination))  # 每個組合恰好一次，然後生成器結束
+    drawn = [tuple(combination) for combination in random_combinations(['x', 'x', 'y'], 2, unique=True, rng=random.Random(1))]
+    assert sorted(drawn) == sorted(combinations(['x', 'x', 'y'], 2))  # 重複的元素按位置被視為不同的元素
+
+
+def test_unique_combination_pairs_cover_every_pair_once():
+    list_a, list_b = [1, 2, 3, 4], ['p', 'q', 'r']
+    drawn = [(tuple(a), tuple(b)) for a, b in random_combination_pairs(list_a, 2, list_b, 1, unique=True, rng=random.Random(2))]
+    assert sorted(drawn) == sorted(product(combinations(list_a, 2), combinations(list_b, 1)))
+
+
+def test_invalid_lengths_and_sample_excluding():
+    with pytest.raises(ValueError):
+        next(random_combinations([1, 2], 3))
+    with pytest.raises(TypeError):
+        next(random_combinations((1, 2), 1))
+    rng = random.Random(3)
+    for list_elements in [list(range(1000)), list(range(12))]:  # 拒絕抽樣和構造剩餘元素的列表
+        selected = sample_excluding(list_elements, {0, 1, 2, 3}, 5, rng)
+        assert len(selected) == len(set(selected)) == 5 and not set(selected) & {0, 1, 2, 3}
+    assert sorted(sample_excluding(list(range(6)), {0, 1, 2, 3}, 5, rng)) == [4, 5]  # 剩餘的元素不足
+
+
+if __name__ == '__main__':
+    for name, test in list(globals().items()):
+        if name.startswith('test_'):
+            test()
+    print('ok')
@@ -0,0 +1,113 @@
+# 終止條件的測試：停滯的計數、時間和適應度計算次數的預算、'all' 模式、無效的字典，以及從檢查點恢復的進度。
+import os, sys, tempfile
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if parent_dir not in sys.path:
+    sys.path.append(parent_dir)
+
+import pytest
+import Gavl.Gavl as Gavl
+from Gavl.tools.termination_criteria import valid_termination_criteria, termination_criteria_args, update_termination_criteria_args, reset_termination_criteria_args, check_termination_criteria
+
+
+def make_args(termination_criteria, minimize=1):
+    """ 返回終止條件的參數。 """
+    return termination_criteria_args(termination_criteria, minimize)
+
+
+def test_stagnation_resets_on_improvement():
+    args = make_args({'no_improvement_generations': 3}, minimize=1)
+    for generation, best_fitness in enumerate([10, 10, 10, 9, 9, 9], start=1):
+        update_termination_criteria_args(args, generation, best_fitness, 0, 0)
+        if generation == 3:
+            assert args['stagnant_generations'] == 2 and not check_termination_criteria(args)
+    assert args['best_fitness'] == 9 and args['stagnant_generations'] == 2  # 第 4 代改進，重新開始計數
+    update_termination_criteria_args(args, 7, 9.5, 0, 0)  # 最小化時更大的值不是改進
+    assert args['stagnant_generations'] == 3 and check_termination_criteria(args)
+    args = make_args({'no_improvement_generations': 1}, minimize=0)
+    update_termination_criteria_args(args, 0, 5, 0, 0)
+    update_termination_criteria_args(args, 1, 6, 0, 0)  # 最大化時更大的值是改進
+    assert args['stagnant_generations'] == 0 and not check_termination_criteria(args)
+
+
+def test_budgets_stop_at_the_limit():
+    args = make_args({'max_evaluations': 100})
+    update_termination_criteria_args(args, 1, 0, 99, 0)
+    assert not check_termination_criteria(args)
+    update_termination_criteria_args(args, 2, 0, 100, 0)
+    assert check_termination_criteria(args)
+    args = make_args({'max_time': 2.5})
+    update_termination_criteria_args(args, 1, 0, 0, 2.4)
+    assert not check_termination_criteria(args)
+    update_termination_criteria_args(args, 2, 0, 0, 2.5)
+    assert check_termination_criteria(args)
+    reset_termination_criteria_args(args)
+    assert args['elapsed_time'] == 0 and args['max_time'] == 2.5 and not check_termination_criteria(args)
+
+
+def test_all_mode_waits_for_every_criterion():
+    args = make_args({'max_num_generation_reached': 5, 'goal_fitness_reached': 1, 'mode': 'all'}, minimize=1)
+    assert not check_termination_criteria(args)  # 族群尚未計算
+    update_termination_criteria_args(args, 5, 3, 0, 0)
+    assert not check_termination_criteria(args)  # 只有最大代數滿足
+    update_termination_criteria_args(args, 2, 1, 0, 0)
+    assert not check_termination_criteria(args)  # 只有目標適應度滿足
+    update_termination_criteria_args(args, 6, 0.5, 0, 0)
+    assert check_termination_criteria(args)
+    args['mode'] = 'any'
+    update_termination_criteria_args(args, 2, 1, 0, 0)
+    assert check_termination_criteria(args)
+
+
+def test_invalid_dicts_are_rejected():
+    assert valid_termination_criteria({'max_num_generation_reached': 10, 'no_improvement_generations': 5, 'max_time': 0.5, 'max_evaluations': 10, 'goal_fitness_reached': -1.5, 'mode': 'all'})
+    invalid = [[('max_num_generation_reached', 10)], {}, {'mode': 'any'}, {'max_generations': 10}, {'max_num_generation_reached': 10, 'mode': 'some'},
+               {'max_num_generation_reached': 0}, {'max_num_generation_reached': 2.0}, {'no_improvement_generations': -1}, {'max_evaluations': 0},
+               {'max_time': 0}, {'max_time': '10'}, {'goal_fitness_reached': None}]
+    for termination_criteria in invalid:
+        assert not valid_termination_criteria(termination_criteria), termination_criteria
+        with pytest.raises(ValueError):
+            termination_criteria_args(termination_criteria, 1)
+
+
+def fitness(chromosome):
+    """ 適應度函數：基因的總和（最大化，很快停滯）。 """
+    return sum(chromosome)
+
+
+def make_ga(**hyperparameters):
+    """ 返回一個小問題的 Gavl 實例。 """
+    ga = Gavl.Gavl()
+    ga.set_hyperparameter('size_population', 20)
+    ga.set_hyperparameter('min_length_chromosome', 1)
+    ga.set_hyperparameter('max_length_chromosome', 3)
+    ga.set_hyperparameter('fitness', fitness)
+    ga.set_hyperparameter('minimize', 0)
+    ga.set_hyperparameter('possible_genes', list(range(10)))
+    ga.set_hyperparameter('show_progress', 0)
+    ga.set_hyperparameter('seed', 5)
+    for id_hyperparameter, value in hyperparameters.items():
+        ga.set_hyperparameter(id_hyperparameter, value)
+    return ga
+
+
+def test_progress_is_restored_from_checkpoint():
+    termination_criteria = {'no_improvement_generations': 6, 'max_evaluations': 100000}
+    straight = make_ga(termination_criteria=termination_criteria)
+    straight.optimize()
+    assert straight._termination_criteria_args['stagnant_generations'] == 6
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'run.ckpt')
+        interrupted = make_ga(termination_criteria={'max_num_generation_reached': 3}, checkpoint_path=path, checkpoint_interval=3)
+        interrupted.optimize()
+        resumed = make_ga(termination_criteria=termination_criteria)
+        resumed.optimize(resume_from=path)  # 停滯的代數和適應度計算次數從檢查點繼續
+    assert resumed.historic_fitness() == straight.historic_fitness()
+    assert resumed._termination_criteria_args['evaluations'] == straight._termination_criteria_args['evaluations'] == straight.fitness_evaluations
+
+
+if __name__ == '__main__':
+    for name, test in list(globals().items()):
+        if name.startswith('test_'):
+            test()
+    print('ok')